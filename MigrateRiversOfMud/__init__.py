@@ -1,10 +1,24 @@
+import importlib
 import os
 import re
 
 from MigrateRiversOfMud.entity import Area
-from MigrateRiversOfMud.presentation import RomDeck
-from MigrateRiversOfMud.presentation.RomLayoutEngine import RomLayoutEngine
-from MigrateRiversOfMud.presentation.RomMapEntity import RomMapEntity
+
+# The presentation classes pull in matplotlib and numpy, which migration never needs,
+# so they are only imported when first accessed.
+_lazy_attributes = {
+    'RomDeck': 'MigrateRiversOfMud.presentation',
+    'RomLayoutEngine': 'MigrateRiversOfMud.presentation.RomLayoutEngine',
+    'RomMapEntity': 'MigrateRiversOfMud.presentation.RomMapEntity',
+}
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        value = getattr(importlib.import_module(_lazy_attributes[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def snake_case_to_camel(snake_str):
@@ -30,13 +44,145 @@ def add_space_around_operators(code):
     return re.sub('({})'.format(pattern), r' \1 ', code)
 
 
-def migrate_rom(area_dir):
+def migrate_rom(area_dir, resume=False, delta=False, upsert=False, shard=None, work_dir=None, stream=False,
+                export_dir=None, pipeline=False, compression=None, compression_threshold=1024, max_pending=64):
     from MigrateRiversOfMud.entity import Orchestrator
-    orchestrator = Orchestrator(area_dir)
+    orchestrator = Orchestrator(area_dir, resume=resume, delta=delta, upsert=upsert, shard=shard, work_dir=work_dir,
+                                stream=stream, export_dir=export_dir, pipeline=pipeline, compression=compression,
+                                compression_threshold=compression_threshold, max_pending=max_pending)
     orchestrator.run()
 
 
+def watch_rom(area_dir):
+    from MigrateRiversOfMud.migration import AreaWatcher
+    watcher = AreaWatcher(area_dir)
+    watcher.run()
+
+
+def serve_daemon(port=None):
+    from MigrateRiversOfMud.migration import MigrationDaemon
+    daemon = MigrationDaemon(port=port) if port else MigrationDaemon()
+    daemon.serve()
+
+
+def submit_job(command, path, port=None, **options):
+    from MigrateRiversOfMud.migration import MigrationClient
+    client = MigrationClient(port=port) if port else MigrationClient()
+    for event in client.submit(command, path=path, **options):
+        if event['event'] == 'progress':
+            print(event['result'] + (" (cached)" if event['cached'] else ""))
+        elif event['event'] == 'error':
+            print(f"Error: {event.get('file', '')} {event['message']}")
+        else:
+            print(f"Job finished in {event['seconds']:.2f} seconds.")
+
+
+def check_vnums(area_dir):
+    from MigrateRiversOfMud.analysis import VnumIndex
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    index = VnumIndex.from_area_files(AreaSource.scan(area_dir))
+    print(index.report())
+
+
+def check_references(area_dir):
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    from MigrateRiversOfMud.entity.ReferenceJoin import ReferenceJoin
+    join = ReferenceJoin()
+    join.resolve(Area(area_file, insert=False) for area_file in AreaSource.scan(area_dir))
+    print(join.report())
+
+
+def search_world(area_dir, query, limit=20):
+    from MigrateRiversOfMud.analysis import TextIndex
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    index = TextIndex.for_area_files(AreaSource.scan(area_dir))
+    for score, (entity_type, area_key, key, name) in index.search(query)[:limit]:
+        print(f"{score:8.3f}  {area_key} {entity_type} {key}: {name}")
+
+
+def simulate_resets(area_dir):
+    from MigrateRiversOfMud.analysis import ResetSimulator
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    simulator = ResetSimulator(Area(area_file, insert=False) for area_file in AreaSource.scan(area_dir))
+    print(simulator.run().summary())
+
+
+def check_exits(area_dir, start_vnum=None):
+    from MigrateRiversOfMud.analysis import ExitIntegrity, RoomGraph
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    graph = RoomGraph(Area(area_file, insert=False) for area_file in AreaSource.scan(area_dir))
+    print(ExitIntegrity(graph).report(start_vnum))
+
+
+def report_balance(area_dir):
+    from MigrateRiversOfMud.analysis import BalanceAnalytics
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    print(BalanceAnalytics(Area(area_file, insert=False) for area_file in AreaSource.scan(area_dir)).report())
+
+
+def benchmark_memory(area_dir):
+    """
+    Measures the memory held by the parsed entities of every area, with and without shared texts.
+    A discarded first pass pays the one-time allocations of imports and caches, so neither measured pass does.
+    """
+    import gc
+    import tracemalloc
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    from MigrateRiversOfMud.entity.TextTable import shared_texts
+    area_files = list(AreaSource.scan(area_dir))
+
+    def measure(sharing):
+        shared_texts.enabled = sharing
+        shared_texts.clear()
+        areas = [Area(area_file, insert=False) for area_file in area_files]
+        gc.collect()
+        tracemalloc.start()
+        for area in areas:
+            for section in ('rooms', 'mobiles', 'objects', 'shops', 'resets', 'specials'):
+                getattr(area, section)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size
+
+    measure(True)
+    sizes = {sharing: measure(sharing) for sharing in (False, True)}
+    print(f"Entities without shared texts: {sizes[False] / 1024 / 1024:.1f} MB.")
+    print(f"Entities with shared texts: {sizes[True] / 1024 / 1024:.1f} MB "
+          f"({100 * (1 - sizes[True] / sizes[False]) if sizes[False] else 0:.1f}% less).")
+    print(shared_texts.report())
+
+
+def route_rooms(area_dir, from_vnum, to_vnum):
+    from MigrateRiversOfMud.analysis import Router
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    router = Router.from_areas(Area(area_file, insert=False) for area_file in AreaSource.scan(area_dir))
+    path = router.shortest_path(from_vnum, to_vnum)
+    if path is None:
+        print(f"No route from room {from_vnum} to room {to_vnum}.")
+    else:
+        print(f"{len(path) - 1} steps: {' '.join(router.directions(from_vnum, to_vnum))}")
+        print(' -> '.join(str(vnum) for vnum in path))
+
+
+def verify_rom(area_dir, sample=None, work_dir=None):
+    """
+    Verifies the areas of a directory against the snapshots of the run that migrated them, kept in the
+    work directory of leased runs.
+    """
+    from MigrateRiversOfMud.entity.AreaSource import AreaSource
+    from MigrateRiversOfMud.migration import Verifier
+    if work_dir:
+        verifier = Verifier(os.path.join(work_dir, 'snapshots'), sample=sample,
+                            cache_dir=os.path.join(work_dir, 'cache'))
+    else:
+        verifier = Verifier(sample=sample)
+    verifier.run(AreaSource.scan(area_dir))
+    print(verifier.report())
+
+
 def build_presentation(area_files):
+    from MigrateRiversOfMud.presentation.RomLayoutEngine import RomLayoutEngine
+    from MigrateRiversOfMud.presentation.RomMapEntity import RomMapEntity
     for area_file in area_files:
         area = Area(area_file, insert=False)
         map_entity_list = RomMapEntity.generate_entities(area)
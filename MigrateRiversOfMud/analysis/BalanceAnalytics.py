@@ -0,0 +1,188 @@
+import re
+
+import numpy as np
+
+from MigrateRiversOfMud.entity.Item import ItemType
+
+
+class BalanceAnalytics:
+    """
+    Balance summaries over the mobiles, items and shops of parsed areas.
+
+    Every field is converted once into a typed NumPy column, so each summary is a handful of vectorized
+    operations over the whole world. Damage dice like 2d8+20 are decomposed into count, sides and bonus,
+    with the expected and maximum damage precomputed. Item types are stored as their ItemType values,
+    and fields that are not numbers are stored as -1.
+    """
+
+    DICE_PATTERN = re.compile(r'\s*(\d+)\s*d\s*(\d+)\s*([+-]\s*\d+)?\s*$', re.IGNORECASE)
+    TRADE_SLOTS = 5
+    # ROM names its drink containers "drink" in area files
+    ITEM_TYPE_NAMES = {'DRINK': ItemType.DRINK_CONTAINER}
+
+    def __init__(self, areas):
+        areas = list(areas)
+        self.area_keys = [area.key for area in areas]
+        mobiles = [(index, mobile) for index, area in enumerate(areas) for mobile in area.mobiles]
+        items = [(index, item) for index, area in enumerate(areas) for item in area.objects]
+        shops = [(index, shop) for index, area in enumerate(areas) for shop in area.shops if shop.vnum is not None]
+
+        self.mobiles = {
+            'area': np.array([index for index, _ in mobiles], dtype=np.int32),
+            'vnum': self._numbers([mobile.vnum for _, mobile in mobiles]),
+            'level': self._numbers([mobile.level for _, mobile in mobiles]),
+            'hitroll': self._numbers([mobile.hitroll for _, mobile in mobiles]),
+            'alignment': self._numbers([mobile.alignment for _, mobile in mobiles]),
+            'gold': self._numbers([mobile.gold for _, mobile in mobiles]),
+        }
+        dice = self._dice([mobile.damage for _, mobile in mobiles])
+        self.mobiles.update(dice_count=dice[:, 0], dice_sides=dice[:, 1], dice_bonus=dice[:, 2])
+        self.mobiles['expected_damage'] = dice[:, 0] * (dice[:, 1] + 1) / 2 + dice[:, 2]
+        self.mobiles['max_damage'] = dice[:, 0] * dice[:, 1] + dice[:, 2]
+
+        self.items = {
+            'area': np.array([index for index, _ in items], dtype=np.int32),
+            'vnum': self._numbers([item.vnum for _, item in items]),
+            'item_type': np.array([self._item_type(item.item_type) for _, item in items], dtype=np.int32),
+            'level': self._numbers([item.level for _, item in items]),
+            'weight': self._numbers([item.weight for _, item in items]),
+            'cost': self._numbers([item.cost for _, item in items]),
+        }
+
+        trades = np.zeros((len(shops), self.TRADE_SLOTS), dtype=np.int32)
+        for row, (_, shop) in enumerate(shops):
+            trades[row, :len(shop.trade_items)] = shop.trade_items[:self.TRADE_SLOTS]
+        self.shops = {
+            'area': np.array([index for index, _ in shops], dtype=np.int32),
+            'keeper': np.array([shop.vnum for _, shop in shops], dtype=np.int64),
+            'profit_buy': self._numbers([shop.profit_buy for _, shop in shops]),
+            'profit_sell': self._numbers([shop.profit_sell for _, shop in shops]),
+            'trades': trades,
+        }
+
+    @staticmethod
+    def _numbers(values):
+        """
+        Converts a column of ints or number strings into an int64 array, with -1 for anything else.
+        """
+        column = np.array(['' if value is None else str(value).strip() for value in values], dtype=str)
+        if not column.size:
+            return np.zeros(0, dtype=np.int64)
+        valid = np.char.isdigit(np.char.lstrip(column, '-')) & (np.char.count(column, '-') <= 1)
+        column[~valid] = '-1'
+        return column.astype(np.int64)
+
+    @classmethod
+    def _dice(cls, damages):
+        """
+        Decomposes dice strings into rows of (count, sides, bonus), parsing each distinct string once.
+        """
+        distinct, inverse = np.unique(np.array([damage or '' for damage in damages], dtype=str), return_inverse=True)
+        decomposed = np.zeros((len(distinct), 3), dtype=np.int64)
+        for row, damage in enumerate(distinct):
+            match = cls.DICE_PATTERN.match(damage)
+            if match:
+                decomposed[row] = (int(match[1]), int(match[2]), int((match[3] or '0').replace(' ', '')))
+        return decomposed[inverse.reshape(-1)] if len(damages) else decomposed
+
+    @classmethod
+    def _item_type(cls, item_type):
+        if isinstance(item_type, str) and item_type.upper() in cls.ITEM_TYPE_NAMES:
+            return cls.ITEM_TYPE_NAMES[item_type.upper()].value
+        if isinstance(item_type, str) and item_type.upper() in ItemType.__members__:
+            return ItemType[item_type.upper()].value
+        if isinstance(item_type, str) and item_type.isdigit():
+            return int(item_type)
+        return -1
+
+    def level_histogram(self, entity_type='mobile', width=10):
+        """
+        Returns (first levels of the bins, counts) for the levels of mobiles or items in bins of width levels.
+        """
+        levels = (self.mobiles if entity_type == 'mobile' else self.items)['level']
+        counts = np.bincount(levels[levels >= 0] // width)
+        return np.arange(len(counts)) * width, counts
+
+    def gold_by_area(self):
+        """
+        Maps each area to (mobiles, total gold, mean gold) over the mobiles it defines.
+        """
+        gold = np.maximum(self.mobiles['gold'], 0)
+        counts = np.bincount(self.mobiles['area'], minlength=len(self.area_keys))
+        totals = np.bincount(self.mobiles['area'], weights=gold, minlength=len(self.area_keys))
+        means = np.divide(totals, counts, out=np.zeros(len(counts)), where=counts > 0)
+        return {area_key: (int(count), int(total), float(mean))
+                for area_key, count, total, mean in zip(self.area_keys, counts, totals, means)}
+
+    def damage_curve(self):
+        """
+        Returns (levels, mobiles, mean expected damage, maximum damage) for every level some mobile has.
+        """
+        valid = self.mobiles['level'] >= 0
+        levels, expected, maximum = (self.mobiles['level'][valid], self.mobiles['expected_damage'][valid],
+                                     self.mobiles['max_damage'][valid])
+        counts = np.bincount(levels)
+        present = np.flatnonzero(counts)
+        means = np.bincount(levels, weights=expected)[present] / counts[present]
+        maxima = np.full(len(counts), np.iinfo(np.int64).min)
+        np.maximum.at(maxima, levels, maximum)
+        return present, counts[present], means, maxima[present]
+
+    def shop_prices(self):
+        """
+        Returns, for every shop, the number of items of its area it trades in and the minimum, mean and
+        maximum price it sells them at, along with its mean margin over what it pays for them.
+        """
+        trades = self.shops['trades']
+        stocked = ((self.items['item_type'][None, :, None] == trades[:, None, :]) & (trades[:, None, :] > 0)).any(-1)
+        stocked &= self.items['area'][None, :] == self.shops['area'][:, None]
+        stocked &= self.items['cost'][None, :] >= 0
+        cost = np.maximum(self.items['cost'], 0)[None, :]
+        sell = cost * self.shops['profit_buy'][:, None] // 100
+        buy = cost * self.shops['profit_sell'][:, None] // 100
+        counts = stocked.sum(1)
+        safe, unpriced = np.maximum(counts, 1), np.iinfo(np.int64).max
+        return {
+            'keeper': self.shops['keeper'],
+            'items': counts,
+            'min_price': np.where(counts > 0, np.where(stocked, sell, unpriced).min(1, initial=unpriced), 0),
+            'mean_price': np.where(stocked, sell, 0).sum(1) / safe,
+            'max_price': np.where(stocked, sell, 0).max(1, initial=0),
+            'mean_margin': np.where(stocked, sell - buy, 0).sum(1) / safe,
+        }
+
+    def summary(self):
+        """
+        Computes every summary over the whole world in one call.
+        """
+        return {
+            'mobile_levels': self.level_histogram('mobile'),
+            'item_levels': self.level_histogram('item'),
+            'gold_by_area': self.gold_by_area(),
+            'damage_curve': self.damage_curve(),
+            'shop_prices': self.shop_prices(),
+        }
+
+    def report(self):
+        """
+        Returns a readable rendering of the summaries.
+        """
+        summary = self.summary()
+        lines = []
+        for entity_type in ('mobile', 'item'):
+            starts, counts = summary[f'{entity_type}_levels']
+            histogram = ', '.join(f"{start}-{start + 9}: {count}" for start, count in zip(starts, counts) if count)
+            lines.append(f"{entity_type} levels: {histogram or 'none'}.")
+        for area_key, (count, total, mean) in summary['gold_by_area'].items():
+            if count:
+                lines.append(f"{area_key}: {count} mobiles carrying {total} gold, {mean:.1f} on average.")
+        for level, count, mean, maximum in zip(*summary['damage_curve']):
+            lines.append(f"Level {level}: {count} mobiles, {mean:.1f} expected damage, {maximum} at most.")
+        prices = summary['shop_prices']
+        for row, keeper in enumerate(prices['keeper']):
+            lines.append(f"Shop of mobile {keeper}: {prices['items'][row]} items priced {prices['min_price'][row]}-"
+                         f"{prices['max_price'][row]}, {prices['mean_price'][row]:.1f} on average with a "
+                         f"{prices['mean_margin'][row]:.1f} margin.")
+        lines.append(f"{len(self.mobiles['vnum'])} mobiles, {len(self.items['vnum'])} items, "
+                     f"{len(self.shops['keeper'])} shops.")
+        return '\n'.join(lines)
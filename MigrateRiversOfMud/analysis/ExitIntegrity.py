@@ -0,0 +1,119 @@
+import numpy as np
+
+from MigrateRiversOfMud.entity.Room import DirectionMapping
+
+
+class ExitIntegrity:
+    """
+    Integrity checks over the exits of a RoomGraph, run as NumPy operations on its arrays.
+
+    Finds the connected components of the world, the rooms no exit leads into or that cannot be
+    reached from a starting room, exits whose destination has no exit back in the opposite direction
+    or whose way back leads elsewhere, exits to VNUMs no parsed room has and exits in unknown directions.
+    """
+
+    OPPOSITE = np.zeros(len(DirectionMapping), dtype=np.int64)
+    for direction, reverse in (('NORTH', 'SOUTH'), ('EAST', 'WEST'), ('UP', 'DOWN')):
+        OPPOSITE[DirectionMapping['EXIT_' + direction].value] = DirectionMapping['EXIT_' + reverse].value
+        OPPOSITE[DirectionMapping['EXIT_' + reverse].value] = DirectionMapping['EXIT_' + direction].value
+    del direction, reverse
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.size = len(graph)
+        self.offsets = np.frombuffer(graph.offsets, dtype=np.intc).astype(np.int64)
+        self.targets = np.frombuffer(graph.targets, dtype=np.intc).astype(np.int64)
+        self.directions = np.frombuffer(graph.directions, dtype=np.int8).astype(np.int64)
+        self.sources = np.repeat(np.arange(self.size), np.diff(self.offsets))
+        self.vnums = np.frombuffer(graph.vnums, dtype=np.intc)
+
+    def components(self):
+        """
+        Labels every row with the smallest row of its component, treating exits as two-way.
+        Roots are hooked onto the smallest root they share an exit with and then compressed by
+        pointer jumping, until no exit joins two components.
+        """
+        parent = np.arange(self.size)
+        while True:
+            source_roots, target_roots = parent[self.sources], parent[self.targets]
+            joined = source_roots != target_roots
+            if not joined.any():
+                return parent
+            source_roots, target_roots = source_roots[joined], target_roots[joined]
+            np.minimum.at(parent, np.maximum(source_roots, target_roots), np.minimum(source_roots, target_roots))
+            while True:
+                jumped = parent[parent]
+                if np.array_equal(jumped, parent):
+                    break
+                parent = jumped
+
+    def reachable(self, start_vnum):
+        """
+        Returns a mask of the rows reachable from a room by following exits, expanding one frontier at a time.
+        """
+        reached = np.zeros(self.size, dtype=bool)
+        frontier = np.array([self.graph.rows[start_vnum]])
+        reached[frontier] = True
+        while frontier.size:
+            starts, counts = self.offsets[frontier], self.offsets[frontier + 1] - self.offsets[frontier]
+            total = counts.sum()
+            positions = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts) + np.arange(total)
+            frontier = np.unique(self.targets[positions])
+            frontier = frontier[~reached[frontier]]
+            reached[frontier] = True
+        return reached
+
+    def entrances(self):
+        return np.bincount(self.targets, minlength=self.size)
+
+    def reverse_exits(self):
+        """
+        Returns the positions of exits with no way back in the opposite direction, and of exits whose
+        way back leads to another room, together with the rows those lead to.
+        """
+        exits = np.full(self.size * len(self.OPPOSITE), -1)
+        exits[self.sources * len(self.OPPOSITE) + self.directions] = self.targets
+        back = exits[self.targets * len(self.OPPOSITE) + self.OPPOSITE[self.directions]]
+        one_way = np.flatnonzero(back < 0)
+        mismatched = np.flatnonzero((back >= 0) & (back != self.sources))
+        return one_way, mismatched, back[mismatched]
+
+    def _room(self, row):
+        return f"{self.graph.area_keys[self.graph.area_of[row]]} room {self.vnums[row]}"
+
+    def _exit(self, position):
+        return f"{self._room(self.sources[position])} {self.graph.DIRECTION_NAMES[self.directions[position]]}"
+
+    def report(self, start_vnum=None):
+        """
+        Returns a readable summary of the components, unreachable rooms, unmatched, dangling and invalid exits.
+        """
+        lines = []
+        roots, labels, sizes = np.unique(self.components(), return_inverse=True, return_counts=True)
+        members = np.split(np.argsort(labels, kind='stable'), np.cumsum(sizes)[:-1])
+        for component in np.argsort(-sizes, kind='stable')[1:]:
+            rows = members[component]
+            sample = ', '.join(str(vnum) for vnum in self.vnums[rows[:5]]) + (', ...' if rows.size > 5 else '')
+            lines.append(f"Component of {rows.size} rooms apart from the rest, "
+                         f"starting at {self._room(rows[0])}: {sample}.")
+        for row in np.flatnonzero(self.entrances() == 0):
+            lines.append(f"{self._room(row)} has no exit leading into it.")
+        if start_vnum is not None:
+            for row in np.flatnonzero(~self.reachable(start_vnum)):
+                lines.append(f"{self._room(row)} cannot be reached from room {start_vnum}.")
+        one_way, mismatched, back = self.reverse_exits()
+        for position in one_way:
+            lines.append(f"{self._exit(position)} leads to {self.vnums[self.targets[position]]} with no way back.")
+        for position, row in zip(mismatched, back):
+            lines.append(f"{self._exit(position)} leads to {self.vnums[self.targets[position]]}, "
+                         f"whose way back leads to {self.vnums[row]}.")
+        for from_vnum, direction, to_vnum in self.graph.dangling:
+            lines.append(f"{self._room(self.graph.rows[from_vnum])} {self.graph.DIRECTION_NAMES[direction]} "
+                         f"leads to unknown room {to_vnum}.")
+        for from_vnum, direction, to_vnum in self.graph.invalid:
+            lines.append(f"{self._room(self.graph.rows[from_vnum])} has an exit in unknown direction {direction} "
+                         f"to room {to_vnum}, which was left out of the graph.")
+        lines.append(f"{self.size} rooms, {self.targets.size} exits, {roots.size} components, "
+                     f"{one_way.size} one-way exits, {mismatched.size} mismatched exits, "
+                     f"{len(self.graph.dangling)} dangling exits, {len(self.graph.invalid)} invalid exits.")
+        return '\n'.join(lines)
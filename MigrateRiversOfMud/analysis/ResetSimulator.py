@@ -0,0 +1,189 @@
+from array import array
+
+
+class ResetSimulator:
+    """
+    Plays the reset lists of parsed areas against their rooms, mobiles and items to materialize the
+    world as it stands after a repop, following ROM's reset_room semantics:
+
+    M loads a mobile into a room while fewer than its limit exist, G and E give or equip an item on the
+    last mobile loaded, O places an item in a room holding none of it yet, P puts items into the most
+    recently loaded container of a type, D sets a door's state and R marks a room's exits as randomized.
+    G and E only follow an M of the same area.
+
+    Resets are compiled once into tuples of row numbers of the rooms and prototypes they name, and
+    the world state lives in flat arrays: per-prototype and per-room counts, one entry per mobile and
+    object instance, and six door states per room.
+    """
+
+    DIRECTIONS = 6
+    CARRIED, EQUIPPED, IN_ROOM, CONTAINED = range(4)
+    LOCATIONS = ('carried', 'equipped', 'in room', 'in container')
+
+    def __init__(self, areas):
+        areas = list(areas)
+        self.room_vnums = [room.vnum for area in areas for room in area.rooms if room is not None]
+        self.mob_vnums = [int(mobile.vnum) for area in areas for mobile in area.mobiles if str(mobile.vnum).isdigit()]
+        self.obj_vnums = [int(item.vnum) for area in areas for item in area.objects if str(item.vnum).isdigit()]
+        self.room_rows = {vnum: row for row, vnum in enumerate(self.room_vnums)}
+        self.mob_rows = {vnum: row for row, vnum in enumerate(self.mob_vnums)}
+        self.obj_rows = {vnum: row for row, vnum in enumerate(self.obj_vnums)}
+        self.skipped = 0
+        self.programs = [[instruction for reset in area.resets if (instruction := self._compile(reset)) is not None]
+                         for area in areas]
+        self.clear()
+
+    @staticmethod
+    def _arg(reset, position, default=0):
+        if position < len(reset.args) and isinstance(reset.args[position], int):
+            return reset.args[position]
+        return default
+
+    def _compile(self, reset):
+        """
+        Resolves a reset's VNUMs to row numbers. Resets that refer to unknown VNUMs are counted and dropped.
+        """
+        reset_type, arg = reset.reset_type, lambda position, default=0: self._arg(reset, position, default)
+        if reset_type == 'M':
+            rows = (self.mob_rows.get(arg(1)), self.room_rows.get(arg(3)))
+            instruction = ('M', rows[0], arg(2), rows[1], arg(4, 0) or -1)
+        elif reset_type == 'O':
+            rows = (self.obj_rows.get(arg(1)), self.room_rows.get(arg(3)))
+            instruction = ('O', rows[0], rows[1])
+        elif reset_type == 'P':
+            rows = (self.obj_rows.get(arg(1)), self.obj_rows.get(arg(3)))
+            instruction = ('P', rows[0], arg(2, -1), rows[1], arg(4, 1))
+        elif reset_type in ('G', 'E'):
+            rows = (self.obj_rows.get(arg(1)),)
+            instruction = (reset_type, rows[0], arg(3, -1))
+        elif reset_type in ('D', 'R'):
+            rows = (self.room_rows.get(arg(1)),)
+            instruction = (reset_type, rows[0], arg(2), arg(3))
+        else:
+            return None
+        if None in rows:
+            self.skipped += 1
+            return None
+        return instruction
+
+    def clear(self):
+        """
+        Empties the world: no mobile or object instances and every door untouched (-1).
+        """
+        self.mob_world = array('i', bytes(4 * len(self.mob_vnums)))
+        self.obj_world = array('i', bytes(4 * len(self.obj_vnums)))
+        self.room_mobs = array('i', bytes(4 * len(self.room_vnums)))
+        self.room_objs = array('i', bytes(4 * len(self.room_vnums)))
+        self.mob_proto = array('i')
+        self.mob_room = array('i')
+        self.obj_proto = array('i')
+        self.obj_location = array('b')
+        self.obj_holder = array('i')
+        self.obj_wear = array('b')
+        self.doors = array('b', [-1]) * (self.DIRECTIONS * len(self.room_vnums))
+        self.randomized = array('b', bytes(len(self.room_vnums)))
+        self._room_obj_protos = set()
+        self._room_mob_protos = {}
+        self._last_container = {}
+        return self
+
+    def _load_object(self, proto, location, holder, wear=-1):
+        self.obj_world[proto] += 1
+        self.obj_proto.append(proto)
+        self.obj_location.append(location)
+        self.obj_holder.append(holder)
+        self.obj_wear.append(wear)
+        self._last_container[proto] = len(self.obj_proto) - 1
+        if location == self.IN_ROOM:
+            self.room_objs[holder] += 1
+            self._room_obj_protos.add((holder, proto))
+
+    def run(self):
+        """
+        Plays every compiled reset once against the current world state and returns the simulator.
+        """
+        for program in self.programs:
+            self._run_area(program)
+        return self
+
+    def _run_area(self, program):
+        last_mob, last = -1, False
+        for instruction in program:
+            code = instruction[0]
+            if code == 'M':
+                _, proto, limit, room, room_limit = instruction
+                in_room = self._room_mob_protos.get((room, proto), 0)
+                if self.mob_world[proto] >= limit or (room_limit > 0 and in_room >= room_limit):
+                    last = False
+                    continue
+                self._room_mob_protos[(room, proto)] = in_room + 1
+                self.mob_world[proto] += 1
+                self.room_mobs[room] += 1
+                self.mob_proto.append(proto)
+                self.mob_room.append(room)
+                last_mob, last = len(self.mob_proto) - 1, True
+            elif code == 'O':
+                _, proto, room = instruction
+                if (room, proto) in self._room_obj_protos:
+                    last = False
+                    continue
+                self._load_object(proto, self.IN_ROOM, room)
+                last = True
+            elif code == 'P':
+                _, proto, limit, container_proto, count = instruction
+                limit = 999 if limit == -1 else 6 if limit > 50 else limit
+                container = self._last_container.get(container_proto)
+                if container is None or self.obj_world[proto] >= limit:
+                    last = False
+                    continue
+                for _ in range(max(count, 1)):
+                    if self.obj_world[proto] >= limit:
+                        break
+                    self._load_object(proto, self.CONTAINED, container)
+                last = True
+            elif code in ('G', 'E'):
+                if not last:
+                    continue
+                _, proto, wear = instruction
+                if code == 'G':
+                    self._load_object(proto, self.CARRIED, last_mob)
+                else:
+                    self._load_object(proto, self.EQUIPPED, last_mob, wear)
+            elif code == 'D':
+                _, room, direction, state = instruction
+                if 0 <= direction < self.DIRECTIONS:
+                    self.doors[room * self.DIRECTIONS + direction] = state
+            else:
+                self.randomized[instruction[1]] = 1
+
+    def mob_counts(self):
+        """
+        Maps the VNUM of every room holding mobiles to how many it holds.
+        """
+        return {self.room_vnums[room]: count for room, count in enumerate(self.room_mobs) if count}
+
+    def mobs_in(self, room_vnum):
+        room = self.room_rows[room_vnum]
+        return [self.mob_vnums[self.mob_proto[instance]] for instance, instance_room in enumerate(self.mob_room)
+                if instance_room == room]
+
+    def objects_of(self, mob_instance):
+        """
+        Returns (item VNUM, 'carried' or 'equipped', wear location) for the items a mobile instance holds.
+        """
+        return [(self.obj_vnums[self.obj_proto[instance]], self.LOCATIONS[location], self.obj_wear[instance])
+                for instance, location in enumerate(self.obj_location)
+                if location in (self.CARRIED, self.EQUIPPED) and self.obj_holder[instance] == mob_instance]
+
+    def door_state(self, room_vnum, direction):
+        return self.doors[self.room_rows[room_vnum] * self.DIRECTIONS + direction]
+
+    def summary(self):
+        locations = [0] * len(self.LOCATIONS)
+        for location in self.obj_location:
+            locations[location] += 1
+        objects = ', '.join(f"{count} {name}" for name, count in zip(self.LOCATIONS, locations))
+        return (f"{len(self.mob_proto)} mobiles in {sum(1 for count in self.room_mobs if count)} rooms, "
+                f"{len(self.obj_proto)} objects ({objects}), "
+                f"{sum(1 for state in self.doors if state >= 0)} doors set, {sum(self.randomized)} rooms randomized, "
+                f"{self.skipped} resets skipped.")
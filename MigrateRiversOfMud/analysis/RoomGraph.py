@@ -0,0 +1,79 @@
+from array import array
+
+from MigrateRiversOfMud.entity.Room import DirectionMapping
+
+
+class RoomGraph:
+    """
+    The exits of every parsed room as a directed graph in compressed sparse row form.
+
+    Rooms are numbered by row across all areas, so exits into other areas are ordinary edges.
+    The exits of row r are targets[offsets[r]:offsets[r + 1]], taken in the directions held at the
+    same positions of directions. Exits to VNUMs no parsed room has are kept aside as dangling, and
+    exits in directions outside DIRECTION_NAMES (a D6 to D9 the parser accepts) as invalid.
+    The area of row r is area_keys[area_of[r]].
+    """
+
+    DIRECTION_NAMES = [mapping.name[len('EXIT_'):].lower() for mapping in DirectionMapping]
+
+    def __init__(self, areas):
+        areas = list(areas)
+        rooms = [room for area in areas for room in area.rooms if room is not None]
+        self.area_keys = [area.key for area in areas]
+        self.area_of = array('i', [index for index, area in enumerate(areas)
+                                   for room in area.rooms if room is not None])
+        self.vnums = array('i', [room.vnum for room in rooms])
+        self.rows = {vnum: row for row, vnum in enumerate(self.vnums)}
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.directions = array('b')
+        self.dangling = []
+        self.invalid = []
+        for room in rooms:
+            for direction, exit_data in sorted(room.exits.items()):
+                to_room_vnum = exit_data.get('to_room_vnum', -1)
+                if not 0 <= direction < len(self.DIRECTION_NAMES):
+                    self.invalid.append((room.vnum, direction, to_room_vnum))
+                    continue
+                target = self.rows.get(to_room_vnum)
+                if target is not None:
+                    self.targets.append(target)
+                    self.directions.append(direction)
+                elif to_room_vnum > 0:
+                    self.dangling.append((room.vnum, direction, to_room_vnum))
+            self.offsets.append(len(self.targets))
+        self._reverse = None
+
+    def __len__(self):
+        return len(self.vnums)
+
+    def neighbours(self, row):
+        return self.targets[self.offsets[row]:self.offsets[row + 1]]
+
+    def reverse(self):
+        """
+        Returns (offsets, sources) of the reversed graph, listing for every row the rows with an exit into it.
+        """
+        if self._reverse is None:
+            counts = array('i', bytes(4 * (len(self) + 1)))
+            for target in self.targets:
+                counts[target + 1] += 1
+            for row in range(len(self)):
+                counts[row + 1] += counts[row]
+            sources, fill = array('i', bytes(4 * len(self.targets))), array('i', counts)
+            for row in range(len(self)):
+                for position in range(self.offsets[row], self.offsets[row + 1]):
+                    target = self.targets[position]
+                    sources[fill[target]] = row
+                    fill[target] += 1
+            self._reverse = (counts, sources)
+        return self._reverse
+
+    def direction_between(self, row, target):
+        """
+        Returns the name of the direction leading from one row to another, or None if no exit does.
+        """
+        for position in range(self.offsets[row], self.offsets[row + 1]):
+            if self.targets[position] == target:
+                return self.DIRECTION_NAMES[self.directions[position]]
+        return None
@@ -0,0 +1,207 @@
+import heapq
+from array import array
+from collections import deque
+from functools import lru_cache
+
+from MigrateRiversOfMud.analysis.RoomGraph import RoomGraph
+
+
+class Router:
+    """
+    Answers routing questions over a RoomGraph: the shortest walk between two rooms and the k rooms
+    nearest to one. Shortest paths are found by bidirectional BFS or, once landmarks are precomputed,
+    by A* with the landmark (ALT) lower bound, which steers the search towards the goal. The most recent routes
+    are kept in an LRU cache of cache_size entries.
+    """
+
+    ACTIVE_LANDMARKS = 4
+
+    def __init__(self, graph, cache_size=4096, landmarks=0):
+        self.graph = graph
+        self.landmarks = []
+        self._from_landmark = []
+        self._to_landmark = []
+        self._route = lru_cache(maxsize=cache_size)(self._search)
+        if landmarks:
+            self.precompute_landmarks(landmarks)
+
+    @classmethod
+    def from_areas(cls, areas, **options):
+        return cls(RoomGraph(areas), **options)
+
+    @staticmethod
+    def _distances(offsets, targets, start, size):
+        distances = array('i', [-1]) * size
+        distances[start] = 0
+        queue = deque([start])
+        while queue:
+            row = queue.popleft()
+            for position in range(offsets[row], offsets[row + 1]):
+                target = targets[position]
+                if distances[target] < 0:
+                    distances[target] = distances[row] + 1
+                    queue.append(target)
+        return distances
+
+    def precompute_landmarks(self, count):
+        """
+        Picks landmarks by farthest-point selection and stores the distances from and to each of them.
+        Rooms no landmark reaches count as farthest, so every part of a disconnected world gets one.
+        """
+        reverse_offsets, sources = self.graph.reverse()
+        size = len(self.graph)
+        nearest = [size] * size
+        landmark = 0
+        while size and len(self.landmarks) < count and nearest[landmark]:
+            self.landmarks.append(landmark)
+            from_landmark = self._distances(self.graph.offsets, self.graph.targets, landmark, size)
+            self._from_landmark.append(from_landmark)
+            self._to_landmark.append(self._distances(reverse_offsets, sources, landmark, size))
+            nearest = [distance if 0 <= distance < current else current
+                       for distance, current in zip(from_landmark, nearest)]
+            landmark = max(range(size), key=nearest.__getitem__)
+        self._route.cache_clear()
+
+    def _bounds(self, start, goal):
+        """
+        Returns (distances from, distances to, from at goal, to at goal) for the landmarks giving the
+        best lower bounds between start and goal.
+        """
+        bounds = []
+        for from_landmark, to_landmark in zip(self._from_landmark, self._to_landmark):
+            bound = 0
+            if from_landmark[goal] >= 0 and from_landmark[start] >= 0:
+                bound = from_landmark[goal] - from_landmark[start]
+            if to_landmark[start] >= 0 and to_landmark[goal] >= 0:
+                bound = max(bound, to_landmark[start] - to_landmark[goal])
+            bounds.append((bound, (from_landmark, to_landmark, from_landmark[goal], to_landmark[goal])))
+        bounds.sort(key=lambda pair: -pair[0])
+        return [landmark for _, landmark in bounds[:self.ACTIVE_LANDMARKS]]
+
+    @staticmethod
+    def _lower_bound(landmarks, row):
+        bound = 0
+        for from_landmark, to_landmark, from_goal, to_goal in landmarks:
+            if from_goal >= 0 and from_landmark[row] >= 0 and from_goal - from_landmark[row] > bound:
+                bound = from_goal - from_landmark[row]
+            if to_goal >= 0 and to_landmark[row] - to_goal > bound:
+                bound = to_landmark[row] - to_goal
+        return bound
+
+    def _a_star(self, start, goal):
+        offsets, targets = self.graph.offsets, self.graph.targets
+        landmarks = self._bounds(start, goal)
+        previous, distance = {start: None}, {start: 0}
+        frontier = [(self._lower_bound(landmarks, start), start)]
+        while frontier:
+            _, row = heapq.heappop(frontier)
+            if row == goal:
+                return previous
+            step = distance[row] + 1
+            for position in range(offsets[row], offsets[row + 1]):
+                target = targets[position]
+                if step < distance.get(target, step + 1):
+                    distance[target] = step
+                    previous[target] = row
+                    heapq.heappush(frontier, (step + self._lower_bound(landmarks, target), target))
+        return None
+
+    def _bidirectional(self, start, goal):
+        """
+        Searches breadth first from both ends at once, growing the smaller frontier, and returns the
+        predecessors of every row on a shortest path from start to goal.
+        """
+        offsets, targets = self.graph.offsets, self.graph.targets
+        reverse_offsets, sources = self.graph.reverse()
+        previous, following = {start: None}, {goal: None}
+        forward, backward = [start], [goal]
+        meeting = start if start == goal else None
+        while meeting is None and forward and backward:
+            if len(forward) <= len(backward):
+                frontier, forward = forward, []
+                for row in frontier:
+                    for position in range(offsets[row], offsets[row + 1]):
+                        target = targets[position]
+                        if target not in previous:
+                            previous[target] = row
+                            forward.append(target)
+                            if target in following:
+                                meeting = target
+                                break
+                    if meeting is not None:
+                        break
+            else:
+                frontier, backward = backward, []
+                for row in frontier:
+                    for position in range(reverse_offsets[row], reverse_offsets[row + 1]):
+                        source = sources[position]
+                        if source not in following:
+                            following[source] = row
+                            backward.append(source)
+                            if source in previous:
+                                meeting = source
+                                break
+                    if meeting is not None:
+                        break
+        if meeting is None:
+            return None
+        row = meeting
+        while following[row] is not None:
+            previous[following[row]] = row
+            row = following[row]
+        return previous
+
+    def _search(self, start, goal):
+        """
+        Returns the rows of a shortest path from start to goal, or None if goal is unreachable.
+        """
+        previous = self._a_star(start, goal) if self.landmarks else self._bidirectional(start, goal)
+        if previous is None:
+            return None
+        path = [goal]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        return tuple(reversed(path))
+
+    def _row(self, vnum):
+        if vnum not in self.graph.rows:
+            raise ValueError(f"No room has VNUM {vnum}.")
+        return self.graph.rows[vnum]
+
+    def shortest_path(self, from_vnum, to_vnum):
+        """
+        Returns the room VNUMs along a shortest walk between two rooms, both included, or None if there is none.
+        """
+        path = self._route(self._row(from_vnum), self._row(to_vnum))
+        return None if path is None else [self.graph.vnums[row] for row in path]
+
+    def directions(self, from_vnum, to_vnum):
+        """
+        Returns the directions to walk along a shortest path, e.g. ['north', 'north', 'up'].
+        """
+        path = self._route(self._row(from_vnum), self._row(to_vnum))
+        if path is None:
+            return None
+        return [self.graph.direction_between(row, target) for row, target in zip(path, path[1:])]
+
+    def nearest(self, from_vnum, k, predicate=None):
+        """
+        Returns (VNUM, distance) for the k rooms nearest to a room, optionally only those whose VNUM passes predicate.
+        """
+        offsets, targets = self.graph.offsets, self.graph.targets
+        start = self._row(from_vnum)
+        distances = {start: 0}
+        queue, found = deque([start]), []
+        while queue and len(found) < k:
+            row = queue.popleft()
+            if row != start and (predicate is None or predicate(self.graph.vnums[row])):
+                found.append((self.graph.vnums[row], distances[row]))
+            for position in range(offsets[row], offsets[row + 1]):
+                target = targets[position]
+                if target not in distances:
+                    distances[target] = distances[row] + 1
+                    queue.append(target)
+        return found
+
+    def cache_info(self):
+        return self._route.cache_info()
@@ -0,0 +1,205 @@
+import bisect
+import json
+import math
+import os
+import re
+import zlib
+
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.AreaSource import AreaSource
+
+
+class TextIndex:
+    """
+    Inverted index over the names and descriptions of rooms, mobiles and items.
+
+    Each document is one entity, tokenized into lower-case words across its text fields. Every term
+    has a postings list mapping the documents holding it to the word positions it appears at, so
+    keyword and prefix lookups only touch the matching terms and phrases are checked on positions.
+    Matches are ranked by BM25. Positions of consecutive fields are kept apart, so a phrase never
+    spans two fields.
+    """
+
+    TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+    FIELDS = {
+        'room': ('name', 'description'),
+        'mobile': ('name', 'short_descr', 'long_descr', 'description'),
+        'item': ('name', 'short_descr', 'long_descr', 'description'),
+    }
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.documents = []
+        self.lengths = []
+        self.postings = {}
+        self.built_from = None
+        self._terms = None
+
+    @classmethod
+    def tokenize(cls, text):
+        return cls.TOKEN_PATTERN.findall(text.lower()) if text else []
+
+    @classmethod
+    def _texts(cls, entity_type, entity):
+        texts = [getattr(entity, field) for field in cls.FIELDS[entity_type]]
+        texts.extend(extra['description'] for extra in getattr(entity, 'extra_descr', []))
+        return texts
+
+    def add(self, entity_type, area_key, key, entity):
+        """
+        Indexes one entity as a document.
+        """
+        document = len(self.documents)
+        self.documents.append((entity_type, area_key, key, getattr(entity, 'name', '') or ''))
+        position = 0
+        for text in self._texts(entity_type, entity):
+            for token in self.tokenize(text):
+                self.postings.setdefault(token, {}).setdefault(document, []).append(position)
+                position += 1
+            position += 1
+        self.lengths.append(position)
+        self._terms = None
+
+    def add_area(self, area):
+        for entity_type in self.FIELDS:
+            for _, key, entity in area.keyed_entities(entity_type):
+                self.add(entity_type, area.key, key, entity)
+
+    @staticmethod
+    def signature(area_files):
+        """
+        Identifies a set of area files by name, size and modification time, or checksum for files read into memory.
+        """
+        signature = []
+        for area_file in area_files:
+            if isinstance(area_file, AreaSource):
+                signature.append([area_file.name, len(area_file.data), zlib.crc32(area_file.data)])
+            else:
+                stat = os.stat(area_file)
+                signature.append([AreaSource.area_name(area_file), stat.st_size, stat.st_mtime_ns])
+        return sorted(signature)
+
+    @classmethod
+    def for_area_files(cls, area_files, cache_dir='cache'):
+        """
+        Loads the index persisted in the cache directory if it was built from the same area files,
+        and otherwise parses them, builds the index and persists it.
+        """
+        area_files = list(area_files)
+        signature = cls.signature(area_files)
+        path = os.path.join(cache_dir, 'text_index.json')
+        if os.path.exists(path):
+            index = cls.load(path)
+            if index.built_from == signature:
+                return index
+        index = cls()
+        for area_file in area_files:
+            index.add_area(Area(area_file, insert=False, cache_dir=cache_dir))
+        index.built_from = signature
+        index.save(path)
+        return index
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({
+                'signature': self.built_from,
+                'documents': self.documents,
+                'lengths': self.lengths,
+                'postings': {term: list(postings.items()) for term, postings in self.postings.items()},
+            }, f)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        index = cls()
+        index.built_from = data['signature']
+        index.documents = [tuple(document) for document in data['documents']]
+        index.lengths = data['lengths']
+        index.postings = {term: dict(postings) for term, postings in data['postings'].items()}
+        return index
+
+    def _rank(self, matches):
+        """
+        Scores documents by BM25 given {document: {term: term frequency}}, best first.
+        """
+        average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0
+        scores = []
+        for document, frequencies in matches.items():
+            norm = self.K1 * (1 - self.B + self.B * self.lengths[document] / average_length)
+            score = 0.0
+            for term, frequency in frequencies.items():
+                df = len(self.postings[term])
+                idf = math.log(1 + (len(self.documents) - df + 0.5) / (df + 0.5))
+                score += idf * frequency * (self.K1 + 1) / (frequency + norm)
+            scores.append((round(score, 4), self.documents[document]))
+        scores.sort(key=lambda result: -result[0])
+        return scores
+
+    def _collect(self, terms, matches=None):
+        matches = {} if matches is None else matches
+        for term in terms:
+            for document, positions in self.postings.get(term, {}).items():
+                matches.setdefault(document, {})[term] = len(positions)
+        return matches
+
+    def _prefix_terms(self, prefix):
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + '\uffff')
+        return self._terms[start:end]
+
+    def keyword(self, *words):
+        """
+        Returns (score, document) for the documents holding any of the words, best first.
+        """
+        return self._rank(self._collect(token for word in words for token in self.tokenize(word)))
+
+    def prefix(self, prefix):
+        """
+        Returns (score, document) for the documents holding a word starting with the prefix, best first.
+        """
+        return self._rank(self._collect(self._prefix_terms(prefix.lower())))
+
+    def _phrase_documents(self, tokens):
+        postings = [self.postings.get(token, {}) for token in tokens]
+        if not tokens or not all(postings):
+            return {}
+        matches = {}
+        for document in set.intersection(*(set(posting) for posting in postings)):
+            starts = set(postings[0][document])
+            for offset, posting in enumerate(postings[1:], 1):
+                starts &= {position - offset for position in posting[document]}
+            if starts:
+                matches[document] = {token: len(starts) for token in tokens}
+        return matches
+
+    def phrase(self, phrase):
+        """
+        Returns (score, document) for the documents holding the words of the phrase in order, best first.
+        """
+        return self._rank(self._phrase_documents(self.tokenize(phrase)))
+
+    def search(self, query):
+        """
+        Answers a query mixing "quoted phrases", prefix* terms and keywords; documents must match every part.
+        """
+        parts = re.findall(r'"([^"]*)"|(\S+)', query)
+        matches = None
+        for phrase, word in parts:
+            if phrase:
+                part = self._phrase_documents(self.tokenize(phrase))
+            elif word.endswith('*'):
+                part = self._collect(self._prefix_terms(word[:-1].lower()))
+            else:
+                part = self._collect(self.tokenize(word))
+            if matches is None:
+                matches = part
+            else:
+                matches = {document: {**matches[document], **part[document]}
+                           for document in matches if document in part}
+        return self._rank(matches or {})
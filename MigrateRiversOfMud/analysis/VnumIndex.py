@@ -0,0 +1,157 @@
+import bisect
+
+from MigrateRiversOfMud.entity.Area import Area
+
+
+class VnumIndex:
+    """
+    Interval index over the room, mobile and object VNUMs of every area in the world.
+
+    Each entity type keeps the (lowest, highest) VNUM hull of every area sorted by lower bound, together
+    with the running maximum of their upper bounds, so the areas whose hull holds a VNUM are found by
+    bisection and overlapping or unclaimed hulls come out of one sweep over the sorted intervals. Areas
+    may number their entities sparsely and interleave with each other, so lookups and overlaps are then
+    checked against the sorted VNUMs of each area: only VNUMs two areas both use are reported as overlaps.
+    Gaps are the VNUM ranges outside every area's hull.
+    """
+
+    ENTITY_TYPES = ('room', 'mobile', 'item')
+
+    def __init__(self):
+        self.intervals = {entity_type: [] for entity_type in self.ENTITY_TYPES}
+        self._lows = {entity_type: [] for entity_type in self.ENTITY_TYPES}
+        self.vnums = {entity_type: {} for entity_type in self.ENTITY_TYPES}
+        self._reach = {}
+
+    @classmethod
+    def from_areas(cls, areas):
+        index = cls()
+        for area in areas:
+            index.add_area(area)
+        return index
+
+    @classmethod
+    def from_area_files(cls, area_files, cache_dir=None):
+        """
+        Builds the index from area files or sources. Only the section index of each file is read.
+        """
+        return cls.from_areas(Area(area_file, insert=False, cache_dir=cache_dir) for area_file in area_files)
+
+    def add_area(self, area):
+        for entity_type, vnums in area.vnums.items():
+            self.add(area.key, entity_type, vnums)
+
+    def add(self, area_key, entity_type, vnums):
+        """
+        Adds the VNUMs an area uses for one entity type.
+        """
+        vnums = sorted(vnums)
+        if not vnums:
+            return
+        low, high = vnums[0], vnums[-1]
+        self.vnums[entity_type][area_key] = vnums
+        position = bisect.bisect_right(self._lows[entity_type], low)
+        self._lows[entity_type].insert(position, low)
+        self.intervals[entity_type].insert(position, (low, high, area_key))
+        self._reach.pop(entity_type, None)
+
+    def _reaches(self, entity_type):
+        """
+        Returns, for each sorted interval, the highest upper bound among it and every interval before it.
+        """
+        if entity_type not in self._reach:
+            reach, highest = [], None
+            for _, high, _ in self.intervals[entity_type]:
+                highest = high if highest is None else max(highest, high)
+                reach.append(highest)
+            self._reach[entity_type] = reach
+        return self._reach[entity_type]
+
+    def _holds(self, entity_type, area_key, vnum):
+        vnums = self.vnums[entity_type][area_key]
+        position = bisect.bisect_left(vnums, vnum)
+        return position < len(vnums) and vnums[position] == vnum
+
+    def _shared(self, entity_type, area_key, other_key, low, high):
+        """
+        Returns the VNUMs between low and high that both areas use.
+        """
+        vnums, other_vnums = self.vnums[entity_type][area_key], self.vnums[entity_type][other_key]
+        in_range = vnums[bisect.bisect_left(vnums, low):bisect.bisect_right(vnums, high)]
+        return sorted(set(in_range).intersection(
+            other_vnums[bisect.bisect_left(other_vnums, low):bisect.bisect_right(other_vnums, high)]))
+
+    @staticmethod
+    def _runs(vnums):
+        """
+        Groups sorted VNUMs into (low, high) runs of consecutive numbers.
+        """
+        runs = []
+        for vnum in vnums:
+            if runs and runs[-1][1] == vnum - 1:
+                runs[-1] = (runs[-1][0], vnum)
+            else:
+                runs.append((vnum, vnum))
+        return runs
+
+    def lookup(self, entity_type, vnum):
+        """
+        Returns the keys of the areas using the VNUM for the given entity type.
+        More than one key means the areas collide there. Only the areas whose hull holds the VNUM are checked.
+        """
+        intervals = self.intervals[entity_type]
+        reach = self._reaches(entity_type)
+        position = bisect.bisect_right(self._lows[entity_type], vnum) - 1
+        owners = []
+        while position >= 0 and reach[position] >= vnum:
+            low, high, area_key = intervals[position]
+            if high >= vnum and self._holds(entity_type, area_key, vnum):
+                owners.append(area_key)
+            position -= 1
+        return owners[::-1]
+
+    def overlaps(self, entity_type=None):
+        """
+        Returns (entity type, area, other area, low, high) for every run of consecutive VNUMs two areas both use.
+        Areas whose hulls overlap without sharing a VNUM are not reported.
+        """
+        overlaps = []
+        for current_type in self.ENTITY_TYPES if entity_type is None else (entity_type,):
+            active = []
+            for low, high, area_key in self.intervals[current_type]:
+                active = [interval for interval in active if interval[1] >= low]
+                for _, other_high, other_key in active:
+                    shared = self._shared(current_type, other_key, area_key, low, min(high, other_high))
+                    overlaps.extend((current_type, other_key, area_key, run_low, run_high)
+                                    for run_low, run_high in self._runs(shared))
+                active.append((low, high, area_key))
+        return overlaps
+
+    def gaps(self, entity_type):
+        """
+        Returns the (low, high) VNUM ranges between the lowest and highest claimed VNUM that fall outside
+        every area's hull, so the VNUMs an area skips within its own range are not counted.
+        """
+        gaps, reached = [], None
+        for low, high, _ in self.intervals[entity_type]:
+            if reached is not None and low > reached + 1:
+                gaps.append((reached + 1, low - 1))
+            reached = high if reached is None else max(reached, high)
+        return gaps
+
+    def report(self):
+        """
+        Returns a readable summary of the overlapping and unclaimed VNUM ranges.
+        """
+        lines = []
+        overlaps = self.overlaps()
+        for entity_type, area_key, other_key, low, high in overlaps:
+            lines.append(f"{entity_type} VNUMs {low}-{high} claimed by both {area_key} and {other_key}.")
+        for entity_type in self.ENTITY_TYPES:
+            gaps = self.gaps(entity_type)
+            if gaps:
+                ranges = ', '.join(f"{low}-{high}" if low != high else str(low) for low, high in gaps)
+                lines.append(f"{entity_type} VNUM gaps: {ranges}.")
+        areas = len({area_key for intervals in self.intervals.values() for _, _, area_key in intervals})
+        lines.append(f"{areas} areas indexed, {len(overlaps)} overlapping ranges.")
+        return '\n'.join(lines)
@@ -0,0 +1,145 @@
+import bisect
+import itertools
+
+from MigrateRiversOfMud.entity.Room import SectorType
+
+
+class WorldIndex:
+    """
+    Query indexes over the mobiles, items, rooms and shops of parsed areas.
+
+    Every entity gets a row number within its type. VNUMs are looked up in hash maps, numeric fields
+    such as level and gold are kept as sorted arrays for range queries by bisection, and low-cardinality
+    fields (room flags, sector types, item types, the item types shops buy) are bitmap indexes: one
+    integer per value with a bit set for every row holding it, so conditions combine with & and |.
+    """
+
+    RANGE_FIELDS = {
+        'mobile': ('level', 'gold', 'alignment'),
+        'item': ('level', 'weight'),
+    }
+
+    _BITS = bytes.maketrans(b'01', b'\x00\x01')
+
+    def __init__(self, areas=()):
+        self.rows = {'mobile': [], 'item': [], 'room': [], 'shop': []}
+        self.by_vnum = {'mobile': {}, 'item': {}, 'room': {}, 'shop': {}}
+        self.room_flags = {}
+        self.sectors = {}
+        self.item_types = {}
+        self.shop_trades = {}
+        self._ranges = {}
+        for area in areas:
+            self.add_area(area)
+
+    @staticmethod
+    def _int(value):
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str) and value.lstrip('-').isdigit():
+            return int(value)
+        return None
+
+    def _add(self, entity_type, entity):
+        row = len(self.rows[entity_type])
+        self.rows[entity_type].append(entity)
+        vnum = self._int(entity.vnum)
+        if vnum is not None:
+            self.by_vnum[entity_type][vnum] = entity
+        return row
+
+    @staticmethod
+    def _set_bit(bitmaps, value, row):
+        bitmaps[value] = bitmaps.get(value, 0) | (1 << row)
+
+    def add_area(self, area):
+        """
+        Indexes every mobile, item, room and shop of an area.
+        """
+        for mobile in area.mobiles:
+            self._add('mobile', mobile)
+        for item in area.objects:
+            row = self._add('item', item)
+            if item.item_type is not None:
+                self._set_bit(self.item_types, str(item.item_type).lower(), row)
+        for room in area.rooms:
+            if room is None:
+                continue
+            row = self._add('room', room)
+            self._set_bit(self.sectors, room.sector_type, row)
+            flags = room.room_flags or 0
+            while flags:
+                bit = flags & -flags
+                self._set_bit(self.room_flags, bit, row)
+                flags ^= bit
+        for shop in area.shops:
+            if shop.vnum is None:
+                continue
+            row = self._add('shop', shop)
+            for trade in shop.trade_items:
+                self._set_bit(self.shop_trades, trade, row)
+        self._ranges.clear()
+
+    def _range_index(self, entity_type, field):
+        """
+        Returns the sorted values of a numeric field and the rows holding them, built on first use.
+        """
+        key = (entity_type, field)
+        if key not in self._ranges:
+            pairs = sorted((value, row) for row, entity in enumerate(self.rows[entity_type])
+                           if (value := self._int(getattr(entity, field))) is not None)
+            self._ranges[key] = ([value for value, _ in pairs], [row for _, row in pairs])
+        return self._ranges[key]
+
+    def _entities(self, entity_type, bitmap):
+        """
+        Returns the entities of the rows set in a bitmap, in row order.
+        """
+        selectors = bin(bitmap)[:1:-1].encode('ascii').translate(self._BITS)
+        return list(itertools.compress(self.rows[entity_type], selectors))
+
+    def get(self, entity_type, vnum):
+        return self.by_vnum[entity_type].get(self._int(vnum))
+
+    def range(self, entity_type, field, low, high):
+        """
+        Returns the entities whose numeric field lies between low and high inclusive, in ascending order.
+        """
+        if field not in self.RANGE_FIELDS.get(entity_type, ()):
+            raise ValueError(f"No range index on {entity_type} {field}.")
+        values, rows = self._range_index(entity_type, field)
+        start, end = bisect.bisect_left(values, low), bisect.bisect_right(values, high)
+        return [self.rows[entity_type][row] for row in rows[start:end]]
+
+    def rooms(self, sector=None, flags=0):
+        """
+        Returns the rooms of a sector, given as a SectorType, its name or its value, that have every bit of flags set.
+        """
+        bitmap = (1 << len(self.rows['room'])) - 1
+        if sector is not None:
+            if isinstance(sector, str):
+                sector = SectorType[sector.upper()]
+            bitmap &= self.sectors.get(getattr(sector, 'value', sector), 0)
+        while flags:
+            bit = flags & -flags
+            bitmap &= self.room_flags.get(bit, 0)
+            flags ^= bit
+        return self._entities('room', bitmap)
+
+    def items(self, *item_types):
+        """
+        Returns the items of any of the given types.
+        """
+        bitmap = 0
+        for item_type in item_types:
+            bitmap |= self.item_types.get(str(item_type).lower(), 0)
+        return self._entities('item', bitmap)
+
+    def shops_buying(self, *item_types):
+        """
+        Returns the shops that buy any of the given item types.
+        """
+        bitmap = 0
+        for item_type in item_types:
+            bitmap |= self.shop_trades.get(item_type, 0)
+        return self._entities('shop', bitmap)
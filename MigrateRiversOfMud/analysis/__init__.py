@@ -0,0 +1,8 @@
+from MigrateRiversOfMud.analysis.VnumIndex import VnumIndex
+from MigrateRiversOfMud.analysis.WorldIndex import WorldIndex
+from MigrateRiversOfMud.analysis.TextIndex import TextIndex
+from MigrateRiversOfMud.analysis.ResetSimulator import ResetSimulator
+from MigrateRiversOfMud.analysis.RoomGraph import RoomGraph
+from MigrateRiversOfMud.analysis.Router import Router
+from MigrateRiversOfMud.analysis.ExitIntegrity import ExitIntegrity
+from MigrateRiversOfMud.analysis.BalanceAnalytics import BalanceAnalytics
@@ -1,113 +1,253 @@
 import json
 import re
+from functools import cached_property
+from types import SimpleNamespace
 
+from MigrateRiversOfMud.entity.AreaSource import AreaSource
+from MigrateRiversOfMud.entity.EntityKeys import EntityKeys
 from MigrateRiversOfMud.entity.Mobile import Mobile
+from MigrateRiversOfMud.entity.ReferenceJoin import ReferenceJoin
 from MigrateRiversOfMud.entity.Resets import Reset
 from MigrateRiversOfMud.entity.Room import Room
+from MigrateRiversOfMud.entity.SectionIndex import SectionIndex
 from MigrateRiversOfMud.entity.Item import Item
 from MigrateRiversOfMud.entity.Shop import Shop
 from MigrateRiversOfMud.entity.Special import Special
-from MigrateRiversOfMud.http import generate_mongo_id, post, api_endpoints
+from MigrateRiversOfMud.entity.TextTable import shared_texts
+from MigrateRiversOfMud.http import generate_mongo_id, post, put, entity_url
 from MigrateRiversOfMud.logging import setup_logger
 
 
+def parse_section_chunk(area_file, section, start, end, area_id, room_id_mapping, skip_header, cache_dir=None):
+    """
+    Pool task that parses the records of a section between two byte offsets of an area file.
+    Rooms are parsed against a stand-in area holding only its id and the room id mapping,
+    and detached from it before being returned; the caller attaches them to the real area.
+    Texts are shared within the chunk only, as its entities are pickled back to the caller.
+    """
+    with shared_texts.scope():
+        lines = SectionIndex.for_file(area_file, cache_dir).lines_between(start, end)
+        if section == 'ROOMS':
+            area = SimpleNamespace(id=area_id, room_id_mapping=room_id_mapping)
+            rooms = []
+            for room_data in Area._split_rooms(lines):
+                vnum = Area._extract_vnum(room_data)
+                rooms.append(Room(area, room_data, room_id_mapping[vnum]) if vnum in room_id_mapping else None)
+            for room in rooms:
+                if room is not None:
+                    room.area = None
+            return rooms
+        if section == 'RESETS':
+            return [Reset(area_id, line) for line in lines[skip_header:]]
+        if section == 'SPECIALS':
+            return [Special(area_id, line) for line in lines[skip_header:]]
+        entity_class = {'MOBILES': Mobile, 'OBJECTS': Item, 'SHOPS': Shop}[section]
+        return [entity_class(area_id, entity_data) for entity_data in Area._split_entities(lines, section)]
+
+
 class Area:
-    def __init__(self, area_file, insert=True, log_dir='logs'):
+    ENTITY_COLLECTIONS = [
+        ('room', 'rooms'),
+        ('item', 'objects'),
+        ('mobile', 'mobiles'),
+        ('shop', 'shops'),
+        ('special', 'specials'),
+        ('reset', 'resets'),
+    ]
+    VNUM_SECTIONS = {
+        'room': 'ROOMS',
+        'mobile': 'MOBILES',
+        'item': 'OBJECTS',
+    }
+
+    def __init__(self, area_file, insert=True, log_dir='logs', journal=None, known_ids=None, existing_ids=None,
+                 cache_dir=None, pool=None, chunk_size=64 * 1024, lease=None):
         self.author = None
         self.name = None
         self.insert = insert
-        self.id = generate_mongo_id()
+        area_file = AreaSource.open(area_file)
+        self.key = AreaSource.area_name(area_file)
+        self.journal = journal
+        self.known_ids = known_ids or {}
+        self.existing_ids = existing_ids
+        self.lease = lease
+        self.failed_inserts = 0
+        self.id = None
         self.suggested_level_range = None
-        self.lines = []
-        self.rooms = []
-        self.mobiles = []
-        self.objects = []
-        self.shops = []
-        self.resets = []
-        self.specials = []
-        self.room_id_mapping = {}
         self.logger = setup_logger("Area", log_dir)
-        self._initialize_file(area_file)
-        self._initialize_sections()
+        self.index = SectionIndex.for_file(area_file, cache_dir)
         self._populate_self()
+        if self.existing_ids is not None:
+            existing = self.existing_ids.prefetch(self.key, self.name)
+            self.known_ids = {entity_type: {**self.known_ids.get(entity_type, {}), **existing.get(entity_type, {})}
+                              for entity_type in {*self.known_ids, *existing}}
+        self.id = self._assign_id('area', self.key)
+        if pool is not None:
+            self.parse_parallel(pool, chunk_size)
+        if self.journal:
+            self.parse_sections()
+            self.journal.flush()
         if self.insert:
-            self.insert_area()
-            self.insert_rooms()
-            self.insert_objects()
-            self.insert_mobiles()
-            self.insert_shops()
-            self.insert_specials()
-            self.insert_resets()
-
-    def _initialize_file(self, area_file):
-        with open(area_file, 'r') as f:
-            self.lines = [line.strip() for line in f.readlines()]
+            try:
+                self.insert_area()
+                self.insert_rooms()
+                self.insert_objects()
+                self.insert_mobiles()
+                self.insert_shops()
+                self.insert_specials()
+                self.insert_resets()
+                if self.journal and not self.failed_inserts:
+                    self.journal.complete()
+            finally:
+                # Acks still buffered after failed inserts or an exception must reach the journal too,
+                # or a resume re-posts entities the services already hold.
+                if self.journal:
+                    self.journal.flush()
 
     def _populate_self(self):
         pattern = r"{\s*(?P<level_range>[\d\s-]+)\s*}\s*(?P<author>\S+)\s+(?P<area_name>.*?)~"
-        for line in self.lines:
-            match = re.search(pattern, line)
+        for line in self.index.header_text().splitlines():
+            match = re.search(pattern, line.strip())
             if match:
                 self.suggested_level_range = match.group("level_range")
                 self.author = match.group("author")
                 self.name = match.group("area_name")
 
-    def _split_sections(self):
+    @cached_property
+    def lines(self):
         """
-        Splits the area data into individual sections: ROOMS, MOBILES, OBJECTS, SHOPS, RESETS, SPECIALS.
-        Each section is represented as a list of lines.
+        Every stripped line of the area file, for callers that need the raw text.
         """
-        sections = {
-            'ROOMS': [],
-            'MOBILES': [],
-            'OBJECTS': [],
-            'SHOPS': [],
-            'RESETS': [],
-            'SPECIALS': []
-        }
-        current_section = None
-        for line in self.lines:
-            if line.startswith('#AREAS'):
-                current_section = None
-            elif line.startswith('#MOBILES'):
-                current_section = 'MOBILES'
-            elif line.startswith('#OBJECTS'):
-                current_section = 'OBJECTS'
-            elif line.startswith('#ROOMS'):
-                current_section = 'ROOMS'
-            elif line.startswith('#RESETS'):
-                current_section = 'RESETS'
-            elif line.startswith('#SHOPS'):
-                current_section = 'SHOPS'
-            elif line.startswith('#SPECIALS'):
-                current_section = 'SPECIALS'
-            elif line == '#0':
-                current_section = None
-
-            if current_section in sections:
-                sections[current_section].append(line)
-        if current_section == "RESETS":
-            del sections[current_section][0]
-        return sections
-
-    def _initialize_sections(self):
-        """
-        Extracts each section of the area by splitting it into individual sections;
-        pre-generates MongoIDs for each VNUM, and parses each section independently.
-        """
-        sections = self._split_sections()
-        room_lines = self._split_rooms(sections['ROOMS'])
-        mobile_lines = self._split_entities(sections['MOBILES'], 'MOBILES')
-        object_lines = self._split_entities(sections['OBJECTS'], 'OBJECTS')
-        shop_lines = self._split_entities(sections['SHOPS'], 'SHOPS')
+        return self.index.lines()
+
+    def parse_sections(self):
+        """
+        Parses every section not yet accessed.
+        """
+        for _, attribute in self.ENTITY_COLLECTIONS:
+            getattr(self, attribute)
+
+    def parse_parallel(self, pool, chunk_size=64 * 1024):
+        """
+        Parses every section not yet accessed across a process pool, splitting each at record boundaries
+        into chunks of about chunk_size bytes and merging the results back in file order. Room ids are
+        generated here before any chunk is handed out, so every worker resolves exits against the same
+        VNUM to MongoID mapping. Area files read into memory are parsed serially.
+        """
+        if self.index.in_memory:
+            self.parse_sections()
+            return
+        pending = [(entity_type, attribute) for entity_type, attribute in self.ENTITY_COLLECTIONS
+                   if attribute not in self.__dict__]
+        if 'rooms' not in self.__dict__:
+            vnum_pattern = re.compile(r'^#\d+$')
+            self.__dict__['room_id_mapping'] = {}
+            room_lines = [[line] for line in self.index.section_lines('ROOMS') if vnum_pattern.match(line)]
+            self._pre_generate_room_ids(room_lines)
+        results = {}
+        for _, attribute in pending:
+            section = attribute.upper()
+            results[attribute] = [
+                pool.apply_async(parse_section_chunk, (self.index.area_file, section, start, end, self.id,
+                                                       self.room_id_mapping if section == 'ROOMS' else None,
+                                                       ordinal == 0, self.index.cache_dir))
+                for ordinal, (start, end) in enumerate(self.index.chunks(section, chunk_size))
+            ]
+        for entity_type, attribute in pending:
+            entities = [entity for result in results[attribute] for entity in result.get()]
+            if entity_type == 'room':
+                for room in entities:
+                    if room is not None:
+                        room.area = self
+                    else:
+                        self.logger.warning("Room VNUM not found in room_id_mapping.")
+            else:
+                self._assign_entity_ids(entity_type, entities)
+            self.__dict__[attribute] = entities
+
+    @cached_property
+    def references(self):
+        """
+        Attaches the MongoIDs of the mobiles, items and rooms the area's shops, specials and resets refer to,
+        and holds the references left unresolved, usually to other areas.
+        """
+        join = ReferenceJoin()
+        join.resolve([self])
+        if join.unresolved:
+            self.logger.warning(f"{self.key}: {len(join.unresolved)} references not resolved within the area.")
+        return join.unresolved
+
+    @cached_property
+    def vnums(self):
+        """
+        The sorted VNUMs of the area's rooms, mobiles and objects, keyed by entity type.
+        Read from the record lines found by the section index, so no section is parsed.
+        """
+        vnums = {}
+        for entity_type, section in self.VNUM_SECTIONS.items():
+            section_vnums = self.index.vnums(section)
+            if section_vnums:
+                vnums[entity_type] = sorted(section_vnums)
+        return vnums
+
+    @cached_property
+    def room_id_mapping(self):
+        """
+        Maps each room VNUM to its MongoID; filled in while the ROOMS section is parsed.
+        """
+        self.rooms
+        return self.__dict__['room_id_mapping']
 
+    @cached_property
+    def rooms(self):
+        """
+        Parses the ROOMS section the first time it is read, pre-generating a MongoID for each VNUM
+        so exits can be resolved while the rooms are created.
+        """
+        room_lines = self._split_rooms(self.index.section_lines('ROOMS'))
+        self.__dict__['room_id_mapping'] = {}
         self._pre_generate_room_ids(room_lines)
-        self.rooms = [self._create_room(room_data) for room_data in room_lines]  # if self._is_valid_room(room_data)]
-        self.mobiles = [self._create_mobile(mobile_data) for mobile_data in mobile_lines]
-        self.objects = [self._create_object(object_data) for object_data in object_lines]
-        self.shops = [self._create_shop(shop_data) for shop_data in shop_lines]
-        self.resets = [self._create_reset(line) for line in sections['RESETS'][1:]]
-        self.specials = [self._create_special(line) for line in sections['SPECIALS'][1:]]
+        return [self._create_room(room_data) for room_data in room_lines]  # if self._is_valid_room(room_data)]
+
+    @cached_property
+    def mobiles(self):
+        """
+        Parses the MOBILES section the first time it is read.
+        """
+        mobile_lines = self._split_entities(self.index.section_lines('MOBILES'), 'MOBILES')
+        return self._assign_entity_ids('mobile', [self._create_mobile(mobile_data) for mobile_data in mobile_lines])
+
+    @cached_property
+    def objects(self):
+        """
+        Parses the OBJECTS section the first time it is read.
+        """
+        object_lines = self._split_entities(self.index.section_lines('OBJECTS'), 'OBJECTS')
+        return self._assign_entity_ids('item', [self._create_object(object_data) for object_data in object_lines])
+
+    @cached_property
+    def shops(self):
+        """
+        Parses the SHOPS section the first time it is read.
+        """
+        shop_lines = self._split_entities(self.index.section_lines('SHOPS'), 'SHOPS')
+        return self._assign_entity_ids('shop', [self._create_shop(shop_data) for shop_data in shop_lines])
+
+    @cached_property
+    def resets(self):
+        """
+        Parses the RESETS section the first time it is read.
+        """
+        reset_lines = self.index.section_lines('RESETS')[1:]
+        return self._assign_entity_ids('reset', [self._create_reset(line) for line in reset_lines])
+
+    @cached_property
+    def specials(self):
+        """
+        Parses the SPECIALS section the first time it is read.
+        """
+        special_lines = self.index.section_lines('SPECIALS')[1:]
+        return self._assign_entity_ids('special', [self._create_special(line) for line in special_lines])
 
     def _pre_generate_room_ids(self, room_sections):
         """
@@ -116,7 +256,51 @@ class Area:
         for room_data in room_sections:
             vnum = self._extract_vnum(room_data)
             if vnum is not None:
-                self.room_id_mapping[vnum] = generate_mongo_id()
+                self.room_id_mapping[vnum] = self._assign_id('room', str(vnum))
+
+    def _assign_id(self, entity_type, key):
+        """
+        Returns the MongoID a journaled earlier run or the known ids gave the entity,
+        or generates a new one. Ids not yet in the journal are journaled.
+        """
+        entity_id = self.journal.assigned_id(entity_type, key) if self.journal else None
+        if entity_id is not None:
+            return entity_id
+        entity_id = self.known_ids.get(entity_type, {}).get(key) or generate_mongo_id()
+        if self.journal:
+            self.journal.assign(entity_type, key, entity_id)
+        return entity_id
+
+    def _assign_entity_ids(self, entity_type, entities):
+        """
+        Replaces the ids generated by the entity constructors with journaled or known ones where they exist.
+        Rooms already received theirs while pre-generating the room id mapping.
+        """
+        if self.journal is not None or self.known_ids:
+            for key, entity in self._keyed(entity_type, entities):
+                entity.id = self._assign_id(entity_type, key)
+        return entities
+
+    def keyed_entities(self, entity_type=None):
+        """
+        Yields (entity type, key, entity) for the area and everything parsed from it, in insert order,
+        keyed as EntityKeys keys them so the keys stay stable between runs over the same file.
+        """
+        if entity_type in (None, 'area'):
+            yield 'area', self.key, self
+        for collection_type, attribute in self.ENTITY_COLLECTIONS:
+            if entity_type not in (None, collection_type):
+                continue
+            for key, entity in self._keyed(collection_type, getattr(self, attribute)):
+                yield collection_type, key, entity
+
+    @staticmethod
+    def _keyed(entity_type, entities):
+        keys = EntityKeys()
+        for entity in entities:
+            key = keys.of(entity_type, entity)
+            if entity is not None:
+                yield key, entity
 
     @staticmethod
     def _split_entities(lines, entity_type):
@@ -226,11 +410,10 @@ class Area:
         """
         Generate the payload for the area and post it to the API service.
         """
-        payload = self.to_dict()
-        payload['totalRooms'] = len(self.rooms)
-        response = post(payload, api_endpoints['area'] + "areas")
+        if self.journal and self.journal.is_acknowledged('area', self.key):
+            return None
+        response = self._post('area', self.key, self.id, self.payload('area', self))
         if not response:
-            self.logger.error("Failed posting to Area API endpoint: {response}")
             return None
         return json.loads(response.content)
 
@@ -238,55 +421,80 @@ class Area:
         """
         Posts Room objects to the API endpoint.
         """
-        for room in self.rooms:
-            response = post(room.to_dict(), api_endpoints['room'] + "room")
-            if not response:
-                self.logger.error("Failed posting to Room API endpoint: {response}")
+        self._insert_entities('room')
 
     def insert_mobiles(self):
         """
         Posts Mobile objects to the API endpoint.
         """
-        for mobile in self.mobiles:
-            response = post(mobile.to_dict(), api_endpoints['mobile'] + "mobile")
-            if not response:
-                self.logger.error("Failed posting to Mobile API endpoint: {response}")
+        self._insert_entities('mobile')
 
     def insert_objects(self):
         """
         Posts Item objects to the API endpoint.
         """
-        for item in self.objects:
-            response = post(item.to_dict(), api_endpoints['item'] + "item")
-            if not response:
-                self.logger.error("Failed to post to Item API endpoint: " + str(response))
+        self._insert_entities('item')
 
     def insert_shops(self):
         """
         Posts Shop objects to the API endpoint.
         """
-        for shop in self.shops:
-            response = post(shop.to_dict(), api_endpoints['shop'] + "shop")
-            if not response:
-                self.logger.error("Failed to post to Shop API endpoint: " + str(response))
+        self._insert_entities('shop')
 
     def insert_resets(self):
         """
         Posts Reset objects to the API endpoint.
         """
-        for reset in self.resets:
-            response = post(reset.to_dict(), api_endpoints['reset'] + "reset")
-            if not response:
-                self.logger.error("Failed to post to Shop API endpoint: " + str(response))
+        self._insert_entities('reset')
 
     def insert_specials(self):
         """
         Posts Special objects to the API endpoint.
         """
-        for special in self.specials:
-            response = post(special.to_dict(), api_endpoints['special'] + "special")
-            if not response:
-                self.logger.error("Failed to post to Special API endpoint: " + str(response))
+        self._insert_entities('special')
+
+    def _insert_entities(self, entity_type):
+        """
+        Posts every entity of the given type, skipping those a journaled earlier run already inserted.
+        """
+        for _, key, entity in self.keyed_entities(entity_type):
+            if self.journal and self.journal.is_acknowledged(entity_type, key):
+                continue
+            self._post(entity_type, key, entity.id, self.payload(entity_type, entity))
+
+    def _post(self, entity_type, key, entity_id, payload):
+        """
+        Posts a single payload and journals the insert once the API service acknowledges it.
+        In upsert mode, entities the services already hold are updated with a PUT instead.
+        Given a lease, raises LeaseLost rather than post once another worker reclaimed the file.
+        """
+        if self.lease is not None:
+            self.lease.check()
+        if self.existing_ids is not None and self.existing_ids.contains(self.key, entity_type, key, entity_id):
+            response = put(payload, f"{entity_url(entity_type)}/{entity_id}")
+        else:
+            response = post(payload, entity_url(entity_type))
+            if response and self.existing_ids is not None:
+                self.existing_ids.record(self.key, entity_type, key, entity_id)
+        if not response:
+            self.logger.error(f"Failed posting to {entity_type} API endpoint: {response}")
+            self.failed_inserts += 1
+            return None
+        if self.journal:
+            self.journal.acknowledge(entity_type, key, entity_id)
+        return response
+
+    def payload(self, entity_type, entity):
+        """
+        Returns the payload sent to the API service for one of the entities yielded by keyed_entities.
+        """
+        if entity_type == 'area':
+            payload = self.to_dict()
+            payload['totalRooms'] = len(self.rooms)
+            return payload
+        if entity_type in ReferenceJoin.REFERRING_TYPES:
+            self.references
+        return entity.to_dict()
 
     def to_dict(self):
         """
@@ -0,0 +1,96 @@
+import gzip
+import os
+import tarfile
+
+
+class AreaSource:
+    """
+    The content of an area file that is not a plain file on disk: a gzip-compressed .are.gz file
+    or a member of a tar archive, held in memory instead of being extracted.
+    """
+
+    ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz')
+
+    def __init__(self, name, data, origin=None):
+        self.name = name
+        self.data = data
+        self.origin = origin or name
+
+    @staticmethod
+    def is_area_file(name):
+        return name.endswith('.are') or name.endswith('.are.gz')
+
+    @classmethod
+    def is_archive(cls, name):
+        return name.endswith(cls.ARCHIVE_SUFFIXES)
+
+    @classmethod
+    def area_files(cls, path):
+        """
+        Lists the plain and gzip-compressed area files in a directory.
+        """
+        if not os.path.isdir(path):
+            return []
+        return [os.path.join(path, file) for file in os.listdir(path) if cls.is_area_file(file)]
+
+    @classmethod
+    def archives(cls, path):
+        """
+        Lists the tar archives in a directory, or the path itself if it is an archive.
+        """
+        if not os.path.isdir(path):
+            return [path] if cls.is_archive(path) else []
+        return [os.path.join(path, file) for file in os.listdir(path) if cls.is_archive(file)]
+
+    @classmethod
+    def scan(cls, path):
+        """
+        Yields every area file under a directory or archive: paths for files on disk, then sources for archive members.
+        """
+        yield from cls.area_files(path)
+        for archive in cls.archives(path):
+            yield from cls.from_archive(archive)
+
+    @staticmethod
+    def area_name(area_file):
+        """
+        Returns the name an area file is keyed by: its base name, without a .gz suffix,
+        so journals and snapshots carry over when a file is compressed.
+        """
+        if isinstance(area_file, AreaSource):
+            return area_file.name
+        name = os.path.basename(area_file)
+        return name[:-len('.gz')] if name.endswith('.gz') else name
+
+    @classmethod
+    def open(cls, area_file):
+        """
+        Decompresses a .are.gz file into a source. Plain area files and sources are returned as they are.
+        """
+        if isinstance(area_file, AreaSource) or not area_file.endswith('.gz'):
+            return area_file
+        with gzip.open(area_file, 'rb') as f:
+            return cls(cls.area_name(area_file), f.read(), area_file)
+
+    @classmethod
+    def from_archive(cls, archive):
+        """
+        Yields a source for every area file in a tar archive, reading the archive as a stream
+        so members are decompressed one at a time and never written to disk.
+        """
+        with tarfile.open(archive, 'r|*') as tar:
+            for member in tar:
+                if not member.isfile() or not cls.is_area_file(member.name):
+                    continue
+                data = tar.extractfile(member).read()
+                if member.name.endswith('.gz'):
+                    data = gzip.decompress(data)
+                yield cls(cls.area_name(member.name), data, f"{archive}:{member.name}")
+
+    @classmethod
+    def archive_names(cls, archive):
+        """
+        Returns the names of the area files in a tar archive without reading their content.
+        """
+        with tarfile.open(archive, 'r|*') as tar:
+            return [cls.area_name(member.name) for member in tar if member.isfile() and cls.is_area_file(member.name)]
@@ -0,0 +1,202 @@
+import gzip
+import io
+import re
+
+from MigrateRiversOfMud.entity.AreaSource import AreaSource
+from MigrateRiversOfMud.entity.EntityKeys import EntityKeys
+from MigrateRiversOfMud.entity.Item import Item
+from MigrateRiversOfMud.entity.Mobile import Mobile
+from MigrateRiversOfMud.entity.ReferenceJoin import ReferenceJoin
+from MigrateRiversOfMud.entity.Resets import Reset
+from MigrateRiversOfMud.entity.Room import Room
+from MigrateRiversOfMud.entity.Shop import Shop
+from MigrateRiversOfMud.entity.Special import Special
+from MigrateRiversOfMud.http import generate_mongo_id
+from MigrateRiversOfMud.logging import setup_logger
+
+
+class AreaStream:
+    """
+    Streaming counterpart of Area that parses an area file one record at a time.
+
+    A first pass reads only the area header and the room VNUMs, so exits can be resolved to MongoIDs;
+    the second pass yields every entity as soon as its record is complete. Records are split and keyed
+    exactly as Area splits and keys them, so both produce the same payloads, but the memory held is one
+    record plus the room id mapping instead of the whole file and every parsed entity. Shops, specials
+    and resets are joined against the mobiles and items streamed before them, which in ROM's section
+    order is all of them.
+    """
+
+    SECTIONS = {
+        '#MOBILES': 'MOBILES',
+        '#OBJECTS': 'OBJECTS',
+        '#ROOMS': 'ROOMS',
+        '#RESETS': 'RESETS',
+        '#SHOPS': 'SHOPS',
+        '#SPECIALS': 'SPECIALS',
+    }
+    ENTITY_TYPES = {
+        'ROOMS': 'room',
+        'OBJECTS': 'item',
+        'MOBILES': 'mobile',
+        'SHOPS': 'shop',
+        'SPECIALS': 'special',
+        'RESETS': 'reset',
+    }
+    VNUM_PATTERN = re.compile(r'^#(\d+)$')
+    HEADER_PATTERN = re.compile(r"{\s*(?P<level_range>[\d\s-]+)\s*}\s*(?P<author>\S+)\s+(?P<area_name>.*?)~")
+
+    def __init__(self, area_file, log_dir='logs', known_ids=None):
+        self.area_file = area_file
+        self.key = AreaSource.area_name(area_file)
+        self.log_dir = log_dir
+        self.known_ids = known_ids or {}
+        self.author = None
+        self.name = None
+        self.suggested_level_range = None
+        self.total_rooms = 0
+        self.room_id_mapping = {}
+        self.references = ReferenceJoin()
+        self.references.ids['room'] = self.room_id_mapping
+        self.logger = setup_logger("AreaStream", log_dir)
+        self.id = self._assign_id('area', self.key)
+        self._scan()
+
+    def _assign_id(self, entity_type, key):
+        return self.known_ids.get(entity_type, {}).get(key) or generate_mongo_id()
+
+    def _open(self):
+        if isinstance(self.area_file, AreaSource):
+            return io.TextIOWrapper(io.BytesIO(self.area_file.data))
+        if self.area_file.endswith('.gz'):
+            return gzip.open(self.area_file, 'rt')
+        return open(self.area_file, 'r')
+
+    def _lines(self):
+        with self._open() as f:
+            for line in f:
+                yield line.strip()
+
+    def _sections(self):
+        """
+        Yields (section, line) for every line of the file, tracking sections the way SectionIndex splits them.
+        """
+        section = None
+        for line in self._lines():
+            if not line.startswith('#'):
+                pass
+            elif line.startswith('#AREAS') or line == '#0':
+                section = None
+            else:
+                for header, name in self.SECTIONS.items():
+                    if line.startswith(header):
+                        section = name
+                        break
+            yield section, line
+
+    def _scan(self):
+        """
+        Reads the area header and pre-generates a MongoID for every room VNUM.
+        """
+        for section, line in self._sections():
+            if section is None:
+                match = self.HEADER_PATTERN.search(line)
+                if match:
+                    self.suggested_level_range = match.group("level_range")
+                    self.author = match.group("author")
+                    self.name = match.group("area_name")
+            elif section == 'ROOMS':
+                match = self.VNUM_PATTERN.match(line)
+                if match:
+                    vnum = int(match.group(1))
+                    self.room_id_mapping[vnum] = self._assign_id('room', str(vnum))
+                    self.total_rooms += 1
+
+    def _records(self):
+        """
+        Yields (section, record lines) one record at a time, splitting as Area._split_rooms,
+        Area._split_entities and the single-line reset and special sections do.
+        """
+        current_section, record = None, []
+        for section, line in self._sections():
+            if section != current_section:
+                if record:
+                    yield current_section, record
+                current_section, record = section, []
+                if section is not None:
+                    continue
+            if section == 'ROOMS':
+                if self.VNUM_PATTERN.match(line):
+                    if record:
+                        yield section, record
+                    record = [line]
+                elif record:
+                    record.append(line)
+                    if line == 'S':
+                        yield section, record
+                        record = []
+            elif section in ('MOBILES', 'OBJECTS', 'SHOPS'):
+                if self.VNUM_PATTERN.match(line) and record:
+                    yield section, record
+                    record = []
+                record.append(line)
+            elif section in ('RESETS', 'SPECIALS'):
+                yield section, line
+        if record:
+            yield current_section, record
+
+    def _create(self, section, record):
+        if section == 'ROOMS':
+            match = self.VNUM_PATTERN.match(record[0])
+            vnum = int(match.group(1)) if match else None
+            if vnum not in self.room_id_mapping:
+                self.logger.warning(f"VNUM {vnum} not found in room_id_mapping.")
+                return None
+            return Room(self, record, self.room_id_mapping[vnum], log_dir=self.log_dir)
+        if section == 'MOBILES':
+            return Mobile(self.id, record, log_dir=self.log_dir)
+        if section == 'OBJECTS':
+            return Item(self.id, record, log_dir=self.log_dir)
+        if section == 'SHOPS':
+            return Shop(self.id, record, log_dir=self.log_dir)
+        if section == 'RESETS':
+            return Reset(self.id, record, log_dir=self.log_dir)
+        return Special(self.id, record, log_dir=self.log_dir)
+
+    def payloads(self):
+        """
+        Yields (entity type, key, id, payload) for the area and then each entity in file order,
+        keyed as Area.keyed_entities keys them.
+        """
+        payload = self.to_dict()
+        payload['totalRooms'] = self.total_rooms
+        yield 'area', self.key, self.id, payload
+        keys = EntityKeys()
+        for section, record in self._records():
+            entity_type = self.ENTITY_TYPES[section]
+            entity = self._create(section, record)
+            key = keys.of(entity_type, entity)
+            if entity is None:
+                continue
+            if entity_type != 'room':
+                entity.id = self._assign_id(entity_type, key)
+            if entity_type in ('mobile', 'item'):
+                self.references.add(entity_type, entity.vnum, entity.id)
+            elif entity_type in ReferenceJoin.REFERRING_TYPES:
+                self.references.attach(self.key, entity_type, key, entity)
+            yield entity_type, key, entity.id, entity.to_dict()
+
+    def to_dict(self):
+        """
+        Return a payload for creating a new area document in MongoDB.
+        """
+        return {
+            'id': self.id,
+            'name': self.name,
+            'author': self.author,
+            'totalRooms': 0,
+            'rooms': [],
+            'suggestedLevelRange': self.suggested_level_range,
+            'repopStrategy': "",
+            'repopInterval': 0
+        }
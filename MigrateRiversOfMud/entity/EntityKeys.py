@@ -0,0 +1,46 @@
+class EntityKeys:
+    """
+    Keys the entities of one area in file order, the way journals, snapshots and delta runs identify them
+    between runs. An entity is keyed by its VNUM (the mobile's for specials) and a reset by its command and
+    arguments, so inserting a record leaves the keys of the others unchanged. The second and later resets
+    with the same content, or that failed to parse, are told apart by their occurrence. Anything else
+    without a key of its own falls back to its position within the section.
+    """
+
+    ATTRIBUTES = {
+        'special': 'mob_vnum',
+        'reset': 'content_key',
+    }
+    COUNTED_TYPES = ('reset',)
+
+    def __init__(self):
+        self._ordinals = {}
+        self._occurrences = {}
+
+    @classmethod
+    def attribute(cls, entity_type):
+        return cls.ATTRIBUTES.get(entity_type, 'vnum')
+
+    def key(self, entity_type, value):
+        """
+        Returns the key of the next entity of a type, given its VNUM or content key, or None if it has neither.
+        """
+        ordinal = self._ordinals.get(entity_type, 0)
+        self._ordinals[entity_type] = ordinal + 1
+        if value is None and entity_type in self.COUNTED_TYPES:
+            value = 'unparsed'
+        if value is None:
+            return f"#{ordinal}"
+        key = str(value)
+        if entity_type in self.COUNTED_TYPES:
+            occurrence = self._occurrences[(entity_type, key)] = self._occurrences.get((entity_type, key), 0) + 1
+            if occurrence > 1:
+                key = f"{key} #{occurrence}"
+        return key
+
+    def of(self, entity_type, entity):
+        """
+        Returns the key of the next entity of a type. Entities that failed to parse are passed
+        as None, so they still take up their position.
+        """
+        return self.key(entity_type, None if entity is None else getattr(entity, self.attribute(entity_type), None))
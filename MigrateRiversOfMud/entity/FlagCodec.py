@@ -0,0 +1,59 @@
+import string
+
+
+class FlagCodec:
+    """
+    Decodes and encodes ROM letter flags, as read by fread_flag: A-Z are bits 0-25 and a-z continue
+    from bit 26, so aa-ee in merc.h are written a-e. A field may also be a plain number, and parts
+    joined by | are added together.
+
+    The letter bits and the characters to drop are precomputed into tables, and decoded strings are
+    memoized, since a world repeats the same few flag strings across thousands of entities.
+    """
+
+    LETTERS = string.ascii_uppercase + string.ascii_lowercase
+    LETTER_BITS = {letter: 1 << bit for bit, letter in enumerate(LETTERS)}
+    IGNORED = str.maketrans('', '', "-,' ")
+    _decoded = {}
+
+    @classmethod
+    def decode(cls, flags):
+        """
+        Returns the integer value of a flag field, raising ValueError on characters that are not flags.
+        """
+        if isinstance(flags, int):
+            return flags
+        value = cls._decoded.get(flags)
+        if value is None:
+            value = 0
+            for part in flags.strip().split('|'):
+                if part.lstrip('-').isdigit():
+                    value += int(part)
+                    continue
+                for letter in set(part.translate(cls.IGNORED)):
+                    if letter not in cls.LETTER_BITS:
+                        raise ValueError(f"Unknown flag character: {letter}")
+                    value |= cls.LETTER_BITS[letter]
+            cls._decoded[flags] = value
+        return value
+
+    @classmethod
+    def decode_all(cls, column):
+        """
+        Decodes a column of flag fields, decoding each distinct string once.
+        """
+        decoded = {flags: cls.decode(flags) for flags in set(column)}
+        return [decoded[flags] for flags in column]
+
+    @classmethod
+    def encode(cls, value):
+        """
+        Returns the letters of the bits set in value, or '0' if none are.
+        """
+        letters = ''.join(letter for letter, bit in cls.LETTER_BITS.items() if value & bit)
+        return letters or '0'
+
+    @classmethod
+    def encode_all(cls, column):
+        encoded = {value: cls.encode(value) for value in set(column)}
+        return [encoded[value] for value in column]
@@ -1,8 +1,62 @@
+from enum import Enum
+from MigrateRiversOfMud.entity.FlagCodec import FlagCodec
+from MigrateRiversOfMud.entity.RecordSchema import RecordSchema, Vnum, Text, Tokens, Blocks, Block
+from MigrateRiversOfMud.entity.TextTable import shared_texts
 from MigrateRiversOfMud.http import generate_mongo_id
 from MigrateRiversOfMud.logging import setup_logger
 
 
+class ItemType(Enum):
+    LIGHT = 1
+    SCROLL = 2
+    WAND = 3
+    STAFF = 4
+    WEAPON = 5
+    TREASURE = 8
+    ARMOR = 9
+    POTION = 10
+    CLOTHING = 11
+    FURNITURE = 12
+    TRASH = 13
+    CONTAINER = 15
+    DRINK_CONTAINER = 17
+    KEY = 18
+    FOOD = 19
+    MONEY = 20
+    BOAT = 22
+    NPC_CORPSE = 23
+    PC_CORPSE = 24
+    FOUNTAIN = 25
+    PILL = 26
+    PROTECT = 27
+    MAP = 28
+    PORTAL = 29
+    WARP_STONE = 30
+    ROOM_KEY = 31
+    GEM = 32
+    JEWELRY = 33
+    JUKEBOX = 34
+
+
 class Item:
+    SCHEMA = RecordSchema(
+        Vnum('vnum', str),
+        Text('name'),
+        Text('short_descr'),
+        Text('long_descr'),
+        Text('description'),
+        Tokens(('item_type', shared_texts.share), ('extra_flags', FlagCodec.decode), ('wear_flags', FlagCodec.decode),
+               defaults={'item_type': "unknown", 'extra_flags': 0, 'wear_flags': 0},
+               warning="Invalid item flags line, setting defaults.", advance_on_error=False),
+        # ROM's level, weight and cost line, affect data, extra descriptions
+        Blocks(
+            Block(r'A', 'affect_data'),
+            Block(r'E', 'extra_descr', Text('keyword'), Text('description')),
+            otherwise=Tokens(('level', shared_texts.share), ('weight', shared_texts.share),
+                             ('cost', shared_texts.share)),
+        ),
+    )
+
     def __init__(self, area_id, data, log_dir='logs'):
         """
         Initializes the Item object with the area data.
@@ -17,9 +71,9 @@ class Item:
         self.item_type = None
         self.extra_flags = None
         self.wear_flags = None
-        self.value = None
-        self.weight = None
         self.level = None
+        self.weight = None
+        self.cost = None
         self.affect_data = []
         self.extra_descr = []
         self.logger = setup_logger("Item", log_dir)
@@ -33,75 +87,7 @@ class Item:
         """
         Parses the item data from the given lines representing a single item.
         """
-        index = 1
-        self.vnum = lines[0][1:]
-
-        # Name, short description, long description, description (each terminated with ~)
-        self.name = self._parse_terminated_string(self.logger, lines, index)
-        index += 1
-        self.short_descr = self._parse_terminated_string(self.logger, lines, index)
-        index += 1
-        self.long_descr = self._parse_terminated_string(self.logger, lines, index)
-        index += 1
-        self.description = self._parse_terminated_string(self.logger, lines, index)
-        index += 1
-
-        # Item type, extra flags, wear flags
-        if index < len(lines):
-            tokens = lines[index].split()
-            if len(tokens) >= 3:
-                self.item_type = tokens[0]
-                self.extra_flags = tokens[1]
-                self.wear_flags = tokens[2]
-                index += 1
-            else:
-                self.logger.warning("Invalid item flags line, setting defaults.")
-                self.item_type = "unknown"
-                self.extra_flags = 0
-                self.wear_flags = 0
-
-        # Value, weight, level, affect data, extra descriptions
-        while index < len(lines):
-            line = lines[index].strip()
-            if line.startswith('A'):
-                affect_data = self._parse_affect_data(lines, index)
-                self.affect_data.append(affect_data)
-                index += 1
-            elif line.startswith('E'):
-                extra_descr = {}
-                index += 1
-                extra_descr['keyword'] = self._parse_terminated_string(self.logger, lines, index)
-                index += 1
-                extra_descr['description'] = self._parse_terminated_string(self.logger, lines, index)
-                index += 1
-                self.extra_descr.append(extra_descr)
-            else:
-                tokens = line.split()
-                if len(tokens) >= 3:
-                    self.value = tokens[0]
-                    self.weight = tokens[1]
-                    self.level = tokens[2]
-                index += 1
-
-    @staticmethod
-    def _parse_affect_data(lines, index):
-        """
-        Parses affect data from the given lines.
-        """
-        return lines[index].strip()
-
-    @staticmethod
-    def _parse_terminated_string(logger, lines, index):
-        """
-        Parses a string terminated with a tilde (~).
-        """
-        if index < len(lines):
-            line = lines[index].strip()
-            if line.endswith('~'):
-                return line.rstrip('~').strip()
-        # Handle case where tilde is missing, avoid throwing an error
-        logger.error(f"Warning: Unexpected end of data while parsing item string at index {index}")
-        return ""
+        self.SCHEMA.parse(self, lines)
 
     def to_dict(self):
         """
@@ -117,9 +103,9 @@ class Item:
             'itemType': self.item_type,
             'extraFlags': self.extra_flags,
             'wearFlags': self.wear_flags,
-            'value': self.value,
-            'weight': self.weight,
             'level': self.level,
+            'weight': self.weight,
+            'cost': self.cost,
             'affectData': self.affect_data,
             'extraDescr': [ed['keyword'] for ed in self.extra_descr],  # Convert extra descriptions to list of keywords
             'id': self.id
@@ -1,8 +1,28 @@
+from MigrateRiversOfMud.entity.FlagCodec import FlagCodec
+from MigrateRiversOfMud.entity.RecordSchema import RecordSchema, Vnum, Text, Tokens
+from MigrateRiversOfMud.entity.TextTable import shared_texts
 from MigrateRiversOfMud.http import generate_mongo_id
 from MigrateRiversOfMud.logging import setup_logger
 
 
 class Mobile:
+    SCHEMA = RecordSchema(
+        Vnum('vnum', str),
+        Text('name'),
+        Text('short_descr'),
+        Text('long_descr', strip_lines=True),
+        Text('description', strip_lines=True),
+        Tokens(('act_flags', FlagCodec.decode), ('affect_flags', FlagCodec.decode), ('alignment', int),
+               defaults={'act_flags': 0, 'affect_flags': 0, 'alignment': 0},
+               warning="Invalid mobile flags line, setting defaults.", advance_on_error=False),
+        # damage is usually in the form of XdY+Z
+        Tokens(('level', int), ('hitroll', int), ('damage', shared_texts.share), ('race', shared_texts.share),
+               ('sex', int), ('gold', int), ('start_pos', int), ('default_pos', int), ('flags', FlagCodec.decode),
+               defaults={'level': 0, 'hitroll': 0, 'damage': "0d0+0", 'race': "unknown", 'sex': 0, 'gold': 0,
+                         'start_pos': 0, 'default_pos': 0, 'flags': 0},
+               warning="Invalid mobile attributes line, setting defaults."),
+    )
+
     def __init__(self, area_id, data, log_dir='logs'):
         """
         Initializes the Mobile object with the area data.
@@ -37,88 +57,9 @@ class Mobile:
         """
         Parses the mobile data from the given lines representing a single mobile.
         """
-        index = 1
-        self.vnum = lines[0][1:]
-        # Name, short description, long description, description (each terminated with ~)
-        self.name = self._parse_terminated_string(lines, index)
-        index += 1
-        self.short_descr = self._parse_terminated_string(lines, index)
-        index += 1
-        self.long_descr, index = self._parse_multiline_terminated_string(lines, index)
-        self.description, index = self._parse_multiline_terminated_string(lines, index)
+        self.SCHEMA.parse(self, lines)
         self.logger.debug(f"Mobile name {self.name} and short description {self.short_descr}")
 
-        # Act flags, affect flags, alignment
-        if index < len(lines):
-            tokens = lines[index].split()
-            if len(tokens) >= 3 and tokens[0].isdigit():
-                self.act_flags = int(tokens[0])
-                self.affect_flags = int(tokens[1])
-                self.alignment = int(tokens[2])
-                index += 1
-            else:
-                self.logger.warning("Invalid mobile flags line, setting defaults.")
-                self.act_flags = 0
-                self.affect_flags = 0
-                self.alignment = 0
-
-        # Level, hitroll, damage, race, sex, gold, start_pos, default_pos, flags
-        if index < len(lines):
-            tokens = lines[index].split()
-            if len(tokens) >= 9:
-                self.level = int(tokens[0])
-                self.hitroll = int(tokens[1])
-                self.damage = tokens[2]  # Usually in the form of XdY+Z
-                self.race = tokens[3]
-                self.sex = int(tokens[4])
-                self.gold = int(tokens[5])
-                self.start_pos = int(tokens[6])
-                self.default_pos = int(tokens[7])
-                self.flags = int(tokens[8])
-            else:
-                self.logger.warning("Invalid mobile attributes line, setting defaults.")
-                self.level = 0
-                self.hitroll = 0
-                self.damage = "0d0+0"
-                self.race = "unknown"
-                self.sex = 0
-                self.gold = 0
-                self.start_pos = 0
-                self.default_pos = 0
-                self.flags = 0
-
-    @staticmethod
-    def _parse_terminated_string(lines, index):
-        """
-        Parses a string terminated with a tilde (~).
-        """
-        try:
-            if index < len(lines):
-                line = lines[index].strip()
-                if line.endswith('~'):
-                    return line.rstrip('~').strip()
-                elif "'" in line:
-                    return line.strip()  # Handle apostrophes gracefully
-            raise ValueError("Unexpected end of data while parsing mobile string")
-        except ValueError as e:
-            lines.logger.warning(f"{e}")
-            return ""
-
-    def _parse_multiline_terminated_string(self, lines, index):
-        """
-        Parses a multiline string terminated with a tilde (~).
-        """
-        description_lines = []
-        while index < len(lines):
-            line = lines[index].strip()
-            if line == '~':
-                index += 1
-                break
-            description_lines.append(line)
-            index += 1
-
-        return "\n".join(description_lines), index
-
     def to_dict(self):
         """
         Converts the Mobile object to a dictionary for payload purposes.
@@ -0,0 +1,205 @@
+import re
+
+from MigrateRiversOfMud.entity.TextTable import shared_texts
+
+
+def store_attribute(target, name, value):
+    setattr(target, name, value)
+
+
+def store_item(target, name, value):
+    target[name] = value
+
+
+def lenient_int(default):
+    """
+    Returns a converter reading a token as an int, or default if it is not one.
+    """
+    def convert(token):
+        return int(token) if token.lstrip('-').isdigit() else default
+    return convert
+
+
+def lenient_hex(token):
+    """
+    Reads a token as a hexadecimal int, or 0 if it is not one.
+    """
+    try:
+        return int(token, base=16) if token.isalnum() else 0
+    except ValueError:
+        return 0
+
+
+class Vnum:
+    """
+    The #VNUM line opening a record.
+    """
+
+    def __init__(self, name, cast=int):
+        self.name = name
+        self.cast = cast
+
+    def compile(self, store):
+        name, cast = self.name, self.cast
+
+        def step(lines, index, target, entity):
+            line = lines[index].strip() if index < len(lines) else ''
+            if not line.startswith('#'):
+                raise ValueError("Invalid record definition: Missing VNUM")
+            store(target, name, cast(line[1:]))
+            return index + 1
+        return step
+
+
+class Text:
+    """
+    A string terminated by a tilde, which may span several lines. With strip_lines every line is
+    stripped as well as the whole text. Texts are stored through the shared text table.
+    """
+
+    def __init__(self, name, strip_lines=False):
+        self.name = name
+        self.strip_lines = strip_lines
+
+    def compile(self, store):
+        name, strip_lines = self.name, self.strip_lines
+
+        def step(lines, index, target, entity):
+            collected = []
+            while index < len(lines):
+                line = lines[index].strip() if strip_lines else lines[index]
+                index += 1
+                if line.rstrip().endswith('~'):
+                    collected.append(line.rstrip().rstrip('~'))
+                    store(target, name, shared_texts.share('\n'.join(collected).strip()))
+                    return index
+                collected.append(line)
+            raise ValueError(f"Unexpected end of data while parsing {name}")
+        return step
+
+
+class Tokens:
+    """
+    One line of whitespace-separated tokens, converted by the (name, converter) pairs in fields.
+    A converter is a callable or the name of a method of the entity being parsed.
+
+    A line with fewer than min_tokens tokens, or a token a converter rejects with ValueError, logs
+    warning, stores defaults if given and moves past the line only if advance_on_error is set.
+    A missing line is an error if required and skipped otherwise.
+    """
+
+    def __init__(self, *fields, min_tokens=None, defaults=None, warning=None, advance_on_error=True, required=False):
+        self.fields = fields
+        self.min_tokens = len(fields) if min_tokens is None else min_tokens
+        self.defaults = defaults
+        self.warning = warning
+        self.advance_on_error = advance_on_error
+        self.required = required
+
+    def compile(self, store):
+        fields, min_tokens, defaults, warning = self.fields, self.min_tokens, self.defaults, self.warning
+        advance_on_error, required = self.advance_on_error, self.required
+        names = ', '.join(name for name, _ in fields)
+
+        def step(lines, index, target, entity):
+            if index >= len(lines):
+                if required:
+                    raise ValueError(f"Unexpected end of data while parsing {names}")
+                return index
+            tokens = lines[index].split()
+            try:
+                if len(tokens) < min_tokens:
+                    raise ValueError(f"expected {min_tokens} tokens")
+                values = [(getattr(entity, convert) if isinstance(convert, str) else convert)(token)
+                          for (_, convert), token in zip(fields, tokens)]
+            except ValueError:
+                if warning:
+                    entity.logger.warning(warning.format(line=lines[index]))
+                for name, value in (defaults or {}).items():
+                    store(target, name, value)
+                return index + 1 if advance_on_error else index
+            for (name, _), value in zip(fields, values):
+                store(target, name, value)
+            return index + 1
+        return step
+
+
+class Block:
+    """
+    An optional block opened by a line matching pattern. Its fields are parsed into a dict, which
+    is appended to the entity's list attribute name or, given key, stored in its dict attribute under
+    key(match). A block without fields stores its opening line instead.
+    """
+
+    def __init__(self, pattern, name, *fields, key=None, defaults=None):
+        self.pattern = re.compile(pattern)
+        self.name = name
+        self.fields = fields
+        self.key = key
+        self.defaults = defaults or {}
+
+
+class Blocks:
+    """
+    Optional blocks in any order and number, up to a line equal to until or the end of the record.
+    Lines opening no block are parsed by otherwise if given, and skipped if not.
+    """
+
+    def __init__(self, *blocks, until=None, otherwise=None):
+        self.blocks = blocks
+        self.until = until
+        self.otherwise = otherwise
+
+    def compile(self, store):
+        until = self.until
+        compiled = [(block, [field.compile(store_item) for field in block.fields]) for block in self.blocks]
+        otherwise = self.otherwise.compile(store) if self.otherwise else None
+
+        def step(lines, index, target, entity):
+            while index < len(lines):
+                line = lines[index].strip()
+                if line == until:
+                    return index + 1
+                for block, steps in compiled:
+                    match = block.pattern.match(line)
+                    if match:
+                        break
+                else:
+                    index = otherwise(lines, index, target, entity) if otherwise else index + 1
+                    continue
+                if steps:
+                    index += 1
+                    record = dict(block.defaults)
+                    for field_step in steps:
+                        index = field_step(lines, index, record, entity)
+                else:
+                    record, index = line, index + 1
+                if block.key is None:
+                    getattr(target, block.name).append(record)
+                else:
+                    getattr(target, block.name)[block.key(match)] = record
+            return index
+        return step
+
+
+class RecordSchema:
+    """
+    Declarative layout of one kind of area file record, compiled once into a parser.
+
+    The fields are Vnum, Text, Tokens and Blocks descriptions in the order the record holds them.
+    Each compiles into a step taking (lines, index, target, entity) and returning the index after
+    what it consumed, and parse runs the steps in turn, storing values as attributes of the entity.
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self.steps = [field.compile(store_attribute) for field in fields]
+
+    def parse(self, entity, lines):
+        """
+        Parses the lines of one record into the entity, raising ValueError on malformed data.
+        """
+        index = 0
+        for step in self.steps:
+            index = step(lines, index, entity, entity)
+        return index
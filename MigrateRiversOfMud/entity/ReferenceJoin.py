@@ -0,0 +1,84 @@
+class ReferenceJoin:
+    """
+    Join stage that resolves the VNUMs shops, specials and resets refer to into the MongoIDs of the
+    parsed mobiles, items and rooms, so the services need no lookup per reference. One hash map per
+    referenced entity type is built in a single pass over the areas, and every reference is then
+    resolved with one lookup, keeping the whole join linear. References no map holds are recorded
+    as (area, entity type, key, referenced type, VNUM).
+    """
+
+    REFERRING_TYPES = ('shop', 'special', 'reset')
+    RESET_REFERENCES = {
+        'M': {1: 'mobile', 3: 'room'},
+        'O': {1: 'item', 3: 'room'},
+        'P': {1: 'item', 3: 'item'},
+        'G': {1: 'item'},
+        'E': {1: 'item'},
+        'D': {1: 'room'},
+        'R': {1: 'room'},
+    }
+
+    def __init__(self):
+        self.ids = {'mobile': {}, 'item': {}, 'room': {}}
+        self.unresolved = []
+
+    def add(self, entity_type, vnum, entity_id):
+        """
+        Maps a VNUM to a MongoID. Mobiles and items keep their VNUM as parsed text, so keys are normalised to ints.
+        """
+        if vnum is not None and str(vnum).isdigit():
+            self.ids[entity_type][int(vnum)] = entity_id
+
+    def add_area(self, area):
+        """
+        Adds the MongoIDs of an area's mobiles, items and rooms to the maps.
+        """
+        for mobile in area.mobiles:
+            self.add('mobile', mobile.vnum, mobile.id)
+        for item in area.objects:
+            self.add('item', item.vnum, item.id)
+        self.ids['room'].update(area.room_id_mapping)
+
+    def _lookup(self, area_key, entity_type, key, referenced_type, vnum):
+        entity_id = self.ids[referenced_type].get(vnum)
+        if entity_id is None:
+            self.unresolved.append((area_key, entity_type, key, referenced_type, vnum))
+        return entity_id
+
+    def attach(self, area_key, entity_type, key, entity):
+        """
+        Resolves the references of a single shop, special or reset against the maps built so far.
+        """
+        if entity_type == 'shop' and entity.vnum is not None:
+            entity.keeper_id = self._lookup(area_key, entity_type, key, 'mobile', entity.vnum)
+        elif entity_type == 'special' and entity.mob_vnum is not None:
+            entity.mob_id = self._lookup(area_key, entity_type, key, 'mobile', entity.mob_vnum)
+        elif entity_type == 'reset':
+            entity.arg_ids = [None] * len(entity.args)
+            for position, referenced_type in self.RESET_REFERENCES.get(entity.reset_type, {}).items():
+                if position < len(entity.args) and isinstance(entity.args[position], int):
+                    entity.arg_ids[position] = self._lookup(area_key, entity_type, key, referenced_type,
+                                                            entity.args[position])
+
+    def resolve(self, areas):
+        """
+        Joins the shops, specials and resets of every area against the mobiles, items and rooms of all of them.
+        Returns the unresolved references.
+        """
+        areas = list(areas)
+        for area in areas:
+            self.add_area(area)
+        for area in areas:
+            for entity_type in self.REFERRING_TYPES:
+                for _, key, entity in area.keyed_entities(entity_type):
+                    self.attach(area.key, entity_type, key, entity)
+        return self.unresolved
+
+    def report(self):
+        """
+        Returns a readable summary of the unresolved references.
+        """
+        lines = [f"{area_key}: {entity_type} {key} refers to unknown {referenced_type} {vnum}."
+                 for area_key, entity_type, key, referenced_type, vnum in self.unresolved]
+        lines.append(f"{len(self.unresolved)} unresolved references.")
+        return '\n'.join(lines)
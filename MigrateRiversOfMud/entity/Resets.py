@@ -1,4 +1,5 @@
 import re
+from MigrateRiversOfMud.entity.TextTable import shared_texts
 from MigrateRiversOfMud.http import generate_mongo_id
 from MigrateRiversOfMud.logging import setup_logger
 
@@ -12,6 +13,7 @@ class Reset:
         self.id = generate_mongo_id()
         self.reset_type = None
         self.args = []
+        self.arg_ids = []
         self.comment = ""
         self.logger = setup_logger("Reset", log_dir)
 
@@ -29,11 +31,27 @@ class Reset:
             raise ValueError("Invalid reset line: Insufficient data")
 
         self.reset_type = tokens[0]
-        self.args = [int(token) if token.isdigit() else token for token in tokens[1:-1]]
-        self.comment = tokens[-1] if tokens[-1].startswith('*') else ""
+        args, comment = tokens[1:], []
+        for position, token in enumerate(args):
+            if token.startswith('*'):
+                args, comment = args[:position], args[position:]
+                break
+        self.args = [int(token) if token.lstrip('-').isdigit() else token for token in args]
+        self.comment = shared_texts.share(" ".join(comment).lstrip('*').strip())
 
         self.logger.info(f"Parsed reset: type={self.reset_type}, args={self.args}, comment={self.comment}")
 
+    @staticmethod
+    def key_of(reset_type, args):
+        """
+        Returns the key identifying a reset by its command and arguments.
+        """
+        return ' '.join([str(reset_type), *(str(arg) for arg in args)])
+
+    @property
+    def content_key(self):
+        return self.key_of(self.reset_type, self.args) if self.reset_type is not None else None
+
     def to_dict(self):
         """
         Converts the Reset object to a dictionary for payload purposes.
@@ -43,6 +61,7 @@ class Reset:
             'id': self.id,
             'resetType': self.reset_type,
             'args': self.args,
+            'argIds': self.arg_ids,
             'comment': self.comment
         }
 
@@ -0,0 +1,191 @@
+import json
+import locale
+import mmap
+import os
+import re
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from MigrateRiversOfMud.entity.AreaSource import AreaSource
+
+
+class SectionIndex:
+    """
+    Byte offsets of the sections of an area file, found with one scan of the memory-mapped file.
+
+    A section runs from its header line to the next line that switches sections: another section header,
+    '#AREAS' or '#0'. Indexes are cached in memory and, given a cache directory, on disk, keyed by the
+    file's size and modification time. Area files read into memory are indexed from their bytes and keyed by
+    their size and checksum instead.
+
+    Only the offsets are kept between reads: the file is mapped for each read and unmapped right after, so
+    long-running processes hold no file handles or locks, and a read from an index of a file that has
+    changed since raises ValueError instead of returning text from stale offsets. The in-memory cache keeps
+    the MAX_CACHED most recently used indexes.
+    """
+
+    SECTION_NAMES = ('MOBILES', 'OBJECTS', 'ROOMS', 'RESETS', 'SHOPS', 'SPECIALS')
+    MARKER_PATTERN = re.compile(rb'^[ \t]*#(AREAS|MOBILES|OBJECTS|ROOMS|RESETS|SHOPS|SPECIALS|0[ \t\r]*$)',
+                                re.MULTILINE)
+    RECORD_PATTERN = re.compile(rb'^[ \t]*#(\d+)[ \t\r]*$', re.MULTILINE)
+    LINE_PATTERN = re.compile(rb'^', re.MULTILINE)
+    LINE_SECTIONS = ('RESETS', 'SPECIALS')
+    MAX_CACHED = 256
+    _cache = OrderedDict()
+
+    def __init__(self, area_file, cache_dir=None, data=None):
+        self.area_file = area_file
+        self.cache_dir = cache_dir
+        self.encoding = locale.getpreferredencoding(False)
+        self.spans = {}
+        self.header_end = 0
+        self.in_memory = data is not None
+        self._data = data
+        if self.in_memory:
+            self._signature = [len(data), zlib.crc32(data)]
+        else:
+            stat = os.stat(area_file)
+            self._signature = [stat.st_size, stat.st_mtime_ns]
+        if not self._load_cached():
+            self._scan()
+            self._store_cached()
+
+    @classmethod
+    def for_file(cls, area_file, cache_dir=None):
+        """
+        Returns the index of an area file, reusing the one built earlier in this process if the file is unchanged.
+        Sources read into memory are indexed afresh each time.
+        """
+        if isinstance(area_file, AreaSource):
+            return cls(area_file.name, cache_dir, data=area_file.data)
+        path = os.path.abspath(area_file)
+        stat = os.stat(area_file)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        cached = cls._cache.get(key)
+        if cached is not None:
+            cls._cache.move_to_end(key)
+            return cached
+        for stale in [entry for entry in cls._cache if entry[0] == path]:
+            del cls._cache[stale]
+        cached = cls._cache[key] = cls(area_file, cache_dir)
+        while len(cls._cache) > cls.MAX_CACHED:
+            cls._cache.popitem(last=False)
+        return cached
+
+    @classmethod
+    def clear_cache(cls):
+        cls._cache.clear()
+
+    @contextmanager
+    def _buffer(self):
+        """
+        Maps the file for the duration of one read, checking it is still the file that was indexed.
+        """
+        if self.in_memory:
+            yield self._data
+            return
+        with open(self.area_file, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if [stat.st_size, stat.st_mtime_ns] != self._signature:
+                raise ValueError(f"{self.area_file} changed since its sections were indexed.")
+            if stat.st_size == 0:
+                yield b''
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
+
+    def _cache_path(self):
+        return os.path.join(self.cache_dir, os.path.basename(self.area_file) + '.sections.json')
+
+    def _load_cached(self):
+        if not self.cache_dir or not os.path.exists(self._cache_path()):
+            return False
+        with open(self._cache_path(), 'r') as f:
+            cached = json.load(f)
+        if cached.get('signature') != self._signature:
+            return False
+        self.spans = {name: [tuple(span) for span in spans] for name, spans in cached['spans'].items()}
+        self.header_end = cached['headerEnd']
+        return True
+
+    def _store_cached(self):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._cache_path(), 'w') as f:
+            json.dump({'signature': self._signature, 'spans': self.spans, 'headerEnd': self.header_end}, f)
+
+    def _scan(self):
+        """
+        Records the (start, end) byte span of every section. A section appearing more than once gets several spans.
+        """
+        current, start = None, 0
+        with self._buffer() as buffer:
+            self.header_end = size = len(buffer)
+            for match in self.MARKER_PATTERN.finditer(buffer):
+                if current is not None:
+                    self.spans.setdefault(current, []).append((start, match.start()))
+                elif not self.spans:
+                    self.header_end = min(self.header_end, match.start())
+                marker = match.group(1).decode('ascii')
+                current = marker if marker in self.SECTION_NAMES else None
+                start = match.start()
+        if current is not None:
+            self.spans.setdefault(current, []).append((start, size))
+
+    def _decode(self, start, end):
+        with self._buffer() as buffer:
+            return buffer[start:end].decode(self.encoding, errors='replace')
+
+    def chunks(self, name, chunk_size):
+        """
+        Splits a section into (start, end) byte spans of roughly chunk_size bytes, each ending where the next
+        record begins: a '#vnum' line, or any line in the single-line RESETS and SPECIALS sections.
+        """
+        pattern = self.LINE_PATTERN if name in self.LINE_SECTIONS else self.RECORD_PATTERN
+        chunks = []
+        with self._buffer() as buffer:
+            for start, end in self.spans.get(name, []):
+                position = start + chunk_size
+                while position < end:
+                    match = pattern.search(buffer, position, end)
+                    if match is None or match.start() >= end:
+                        break
+                    chunks.append((start, match.start()))
+                    start = match.start()
+                    position = start + chunk_size
+                chunks.append((start, end))
+        return chunks
+
+    def vnums(self, name):
+        """
+        Returns the VNUMs of the '#vnum' record lines of a section without decoding or parsing it.
+        """
+        with self._buffer() as buffer:
+            return [int(match.group(1)) for start, end in self.spans.get(name, [])
+                    for match in self.RECORD_PATTERN.finditer(buffer, start, end)]
+
+    def lines_between(self, start, end):
+        """
+        Returns the stripped lines between two byte offsets.
+        """
+        return [line.strip() for line in self._decode(start, end).splitlines()]
+
+    def header_text(self):
+        """
+        Returns the text before the first section, which holds the #AREA header.
+        """
+        return self._decode(0, self.header_end)
+
+    def section_lines(self, name):
+        """
+        Returns the stripped lines of a section, header line included, concatenating repeated sections.
+        """
+        return [line for start, end in self.spans.get(name, []) for line in self.lines_between(start, end)]
+
+    def lines(self):
+        """
+        Returns every stripped line of the file.
+        """
+        return self.lines_between(0, self._signature[0])
@@ -18,6 +18,7 @@ class Shop:
         self.open_hour = None
         self.close_hour = None
         self.owner_name = None
+        self.keeper_id = None
         self.logger = setup_logger("Shop", log_dir)
 
         try:
@@ -60,6 +61,7 @@ class Shop:
         return {
             'areaId': self.area_id,
             'vnum': self.vnum,
+            'keeperId': self.keeper_id,
             'tradeItems': self.trade_items,
             'profitBuy': self.profit_buy,
             'profitSell': self.profit_sell,
@@ -1,3 +1,4 @@
+from MigrateRiversOfMud.entity.TextTable import shared_texts
 from MigrateRiversOfMud.http import generate_mongo_id
 from MigrateRiversOfMud.logging import setup_logger
 
@@ -12,6 +13,7 @@ class Special:
         self.mob_vnum = None
         self.special_function = None
         self.comment = None
+        self.mob_id = None
         self.logger = setup_logger("Special", log_dir)
 
         try:
@@ -26,8 +28,8 @@ class Special:
         tokens = line.split()
         if len(tokens) >= 3:
             self.mob_vnum = int(tokens[1])
-            self.special_function = tokens[2]
-            self.comment = " ".join(tokens[3:]).lstrip('*').strip() if len(tokens) > 3 else ""
+            self.special_function = shared_texts.share(tokens[2])
+            self.comment = shared_texts.share(" ".join(tokens[3:]).lstrip('*').strip() if len(tokens) > 3 else "")
         else:
             self.logger.error("Invalid special data line format")
 
@@ -39,6 +41,7 @@ class Special:
             'areaId': self.area_id,
             'id': self.id,
             'mobVnum': self.mob_vnum,
+            'mobId': self.mob_id,
             'specialFunction': self.special_function,
             'comment': self.comment
         }
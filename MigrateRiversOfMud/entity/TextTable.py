@@ -0,0 +1,63 @@
+import contextlib
+import sys
+
+
+class TextTable:
+    """
+    Shared storage for the texts of parsed entities.
+
+    Short, low-cardinality strings such as keywords, race names and special function names are
+    interned, and longer texts such as descriptions are kept once in the table, so every entity
+    repeating a text refers to the same string object instead of holding its own copy. The table
+    counts how many texts it deduplicated and the bytes that saved. Long-lived processes parse each
+    area inside scope(), so the table only holds the texts of the areas they are working on.
+    """
+
+    INTERN_LENGTH = 32
+
+    def __init__(self, max_texts=1 << 20):
+        self.max_texts = max_texts
+        self.enabled = True
+        self.texts = {}
+        self.shared = 0
+        self.saved = 0
+
+    def share(self, text):
+        """
+        Returns the shared copy of a text, adding it to the table if it has none yet.
+        """
+        if not self.enabled or not isinstance(text, str):
+            return text
+        if len(text) <= self.INTERN_LENGTH:
+            return sys.intern(text)
+        shared = self.texts.get(text)
+        if shared is None:
+            if len(self.texts) < self.max_texts:
+                self.texts[text] = text
+            return text
+        if shared is not text:
+            self.shared += 1
+            self.saved += sys.getsizeof(text)
+        return shared
+
+    def clear(self):
+        self.texts.clear()
+        self.shared = 0
+        self.saved = 0
+
+    @contextlib.contextmanager
+    def scope(self):
+        """
+        Clears the table once the block is done with the entities parsed in it.
+        """
+        try:
+            yield self
+        finally:
+            self.clear()
+
+    def report(self):
+        return (f"{len(self.texts)} distinct long texts, {self.shared} repeats shared, "
+                f"{self.saved / 1024 / 1024:.1f} MB saved.")
+
+
+shared_texts = TextTable()
@@ -1,38 +1,313 @@
+import contextlib
 import os
 import multiprocessing
+import threading
 import time
+import zlib
 from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.AreaSource import AreaSource
+from MigrateRiversOfMud.entity.AreaStream import AreaStream
+from MigrateRiversOfMud.entity.TextTable import shared_texts
+from MigrateRiversOfMud import http
+from MigrateRiversOfMud.migration.AreaSummary import AreaSummary
+from MigrateRiversOfMud.migration.Journal import Journal
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+from MigrateRiversOfMud.migration.Delta import Delta
+from MigrateRiversOfMud.migration.ExistingIds import ExistingIds
+from MigrateRiversOfMud.migration.LeaseManager import LeaseManager
+from MigrateRiversOfMud.migration.Sinks import HttpSink, NdjsonSink, stream_to_sink
+from MigrateRiversOfMud.migration.MigrationPipeline import MigrationPipeline
 
 
 class Orchestrator:
-    def __init__(self, directory):
+    def __init__(self, directory, resume=False, journal_dir='journal', delta=False, snapshot_dir='snapshots',
+                 upsert=False, shard=None, work_dir=None, lease_ttl=60, stream=False, export_dir=None,
+                 max_pending=64, pipeline=False, uploaders=8, cache_dir='cache',
+                 large_file_size=1024 * 1024, compression=None, compression_threshold=1024):
+        """
+        A shard of (index, count) restricts the run to a deterministic subset of the area files. A work
+        directory shared between hosts instead has orchestrators claim area files through leases; the
+        journals and snapshots are kept there so a reclaimed area resumes where its dead worker stopped.
+        Streaming parses each file record by record into a bounded queue of at most max_pending payloads,
+        sent to the services or, given an export directory, written to one NDJSON file per area. Streamed
+        areas are snapshotted as they are sent, but not journaled, so streaming cannot be combined with
+        resume, upsert or a work directory.
+        The pipeline mode parses in the process pool and uploads from a separate pool of uploader threads.
+        It only posts, so it cannot be combined with resume, delta, upsert, streaming or a work directory.
+        The section offsets of each area file are cached in the cache directory between runs. Area files
+        of at least large_file_size bytes are split into chunks parsed across the whole pool rather than
+        handed to a single worker. The directory may hold .are.gz files and .tar or .tar.gz archives,
+        or be an archive itself; archive members are streamed to the pool without being extracted.
+        Given a compression of 'gzip' or 'zstd', request bodies of at least compression_threshold bytes
+        are sent compressed.
+        """
+        conflict = self.conflicting_options(resume=resume, delta=delta, upsert=upsert, work_dir=work_dir,
+                                            stream=stream, pipeline=pipeline)
+        if conflict:
+            raise ValueError(conflict)
         self.directory = directory
+        self.resume = resume
+        self.journal_dir = journal_dir
+        self.delta = delta
+        self.snapshot_dir = snapshot_dir
+        self.existing_ids = ExistingIds() if upsert else None
+        self.shard = shard
+        self.work_dir = work_dir
+        self.lease_ttl = lease_ttl
+        self.stream = stream
+        self.export_dir = export_dir
+        self.max_pending = max_pending
+        self.pipeline = pipeline
+        self.uploaders = uploaders
+        self.cache_dir = cache_dir
+        self.large_file_size = large_file_size
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        if self.work_dir:
+            self.journal_dir = os.path.join(self.work_dir, 'journal')
+            self.snapshot_dir = os.path.join(self.work_dir, 'snapshots')
+            self.cache_dir = os.path.join(self.work_dir, 'cache')
+            self.resume = True
         self.area_files = self._get_area_files()
+        self.archives = self._get_archives()
+        if self.shard:
+            self.area_files = [f for f in self.area_files if self._in_shard(f, self.shard)]
+        if self.resume:
+            pending = [f for f in self.area_files if not self._is_complete(f)]
+            print(f"Resuming: skipping {len(self.area_files) - len(pending)} completed area files.")
+            self.area_files = pending
         self.area_count = len(self.area_files)
         print(f"Distributing {self.area_count} files among {multiprocessing.cpu_count()} processors.")
 
     def _get_area_files(self):
         """
-        Retrieves a list of area files in the given directory.
+        Retrieves a list of the plain and gzip-compressed area files in the given directory.
+        """
+        return AreaSource.area_files(self.directory)
+
+    def _get_archives(self):
+        """
+        Retrieves the tar archives in the given directory, or the directory itself if it is an archive.
+        """
+        return AreaSource.archives(self.directory)
+
+    def _is_complete(self, area_file):
+        return Journal.is_complete(AreaSource.area_name(area_file), self.journal_dir)
+
+    def _wanted(self, area_file):
+        """
+        Applies the shard and resume filters to an area file found while streaming an archive.
         """
-        return [os.path.join(self.directory, file) for file in os.listdir(self.directory) if file.endswith('.are')]
+        if self.shard and not self._in_shard(area_file, self.shard):
+            return False
+        return not (self.resume and self._is_complete(area_file))
 
     @staticmethod
-    def process_area_file(area_file):
+    def conflicting_options(resume=False, delta=False, upsert=False, work_dir=None, stream=False, pipeline=False):
+        """
+        Returns why a combination of run options cannot work together, or None if it can.
+        """
+        if pipeline and (resume or delta or upsert or work_dir or stream):
+            return ("The pipeline only posts parsed entities, without journaling, diffing or looking up existing "
+                    "ones, so it cannot be combined with resume, delta, upsert, streaming or a work directory.")
+        if stream and (resume or upsert or work_dir):
+            return ("Streaming sends entities without journaling them or looking up existing ones, "
+                    "so it cannot be combined with resume, upsert or a work directory.")
+        return None
+
+    @staticmethod
+    def parse_shard(shard):
+        """
+        Parses an 'i/N' shard specification into (i, N).
+        """
+        index, count = (int(part) for part in shard.split('/'))
+        if not 0 <= index < count:
+            raise ValueError(f"Invalid shard {shard}: index must be between 0 and {count - 1}.")
+        return index, count
+
+    @staticmethod
+    def _in_shard(area_file, shard):
+        """
+        Assigns area files to shards by a hash of their name, so every host computes the same split.
         """
-        Processes a single area file by instantiating the Area class.
+        index, count = shard
+        return zlib.crc32(AreaSource.area_name(area_file).encode('utf-8')) % count == index
+
+    def _is_large(self, area_file):
+        return (self.large_file_size is not None and area_file.endswith('.are')
+                and os.path.getsize(area_file) >= self.large_file_size)
+
+    def process_area_file(self, area_file, pool=None, lease=None):
+        """
+        Processes a single area file by instantiating the Area class, journaling every acknowledged insert.
+        A fully inserted area is snapshotted so later delta runs only send what changed. In upsert mode,
+        entities already stored by the services are updated in place rather than inserted again.
+        Given a pool, the file's sections are parsed across it. Given a lease, inserts stop with LeaseLost
+        once another worker reclaimed the file. With compression on, prints how many bytes the file's request
+        bodies took on the wire. The texts shared while parsing are released once the file is done.
+        Returns an AreaSummary of the outcome.
+        """
+        if not self.compression:
+            with shared_texts.scope():
+                return self._process_area_file(area_file, pool, lease)
+        http.configure_compression(self.compression, self.compression_threshold)
+        before = dict(http.compression_stats)
+        with shared_texts.scope():
+            summary = self._process_area_file(area_file, pool, lease)
+        body_bytes, sent_bytes = (http.compression_stats[key] - before[key] for key in ('body_bytes', 'sent_bytes'))
+        print(f"{AreaSource.area_name(area_file)}: sent {body_bytes} bytes of request bodies as {sent_bytes} bytes.")
+        return summary
+
+    def _process_area_file(self, area_file, pool=None, lease=None):
+        if self.delta:
+            return self.sync_area_file(area_file, pool)
+        if self.stream:
+            return self.stream_area_file(area_file)
+        journal = Journal(AreaSource.area_name(area_file), self.journal_dir, resume=self.resume)
+        area = Area(area_file, journal=journal,
+                    existing_ids=self.existing_ids, cache_dir=self.cache_dir, pool=pool, lease=lease)
+        if not area.failed_inserts:
+            Snapshot.from_area(area, self.snapshot_dir).save()
+            return AreaSummary(f"{area.key}: migrated.")
+        return AreaSummary(f"{area.key}: {area.failed_inserts} failed inserts.", area.failed_inserts)
+
+    def sync_area_file(self, area_file, pool=None):
+        """
+        Parses an area file reusing the ids of its snapshot and sends only the entities
+        added, changed or removed since the last sync.
+        """
+        snapshot = Snapshot(AreaSource.area_name(area_file), self.snapshot_dir)
+        area = Area(area_file, insert=False, known_ids=snapshot.ids(), cache_dir=self.cache_dir, pool=pool)
+        delta = Delta(snapshot, area)
+        failures = delta.apply()
+        summary = AreaSummary(f"{area.key}: {delta}" + (f", {failures} failed requests." if failures else "."),
+                              failures)
+        print(summary)
+        return summary
+
+    def stream_area_file(self, area_file):
         """
-        Area(area_file)
+        Streams an area file entity by entity into the configured sink. Entities sent to the services are
+        recorded in the area's snapshot, whose ids they reuse.
+        """
+        if self.export_dir:
+            area = AreaStream(area_file)
+            sink = NdjsonSink(os.path.join(self.export_dir, area.key + '.ndjson'))
+        else:
+            snapshot = Snapshot(AreaSource.area_name(area_file), self.snapshot_dir)
+            area = AreaStream(area_file, known_ids=snapshot.ids())
+            sink = HttpSink(area.logger, snapshot)
+        stream_to_sink(area.payloads(), sink, self.max_pending)
+        summary = AreaSummary(f"{area.key}: streamed {sink.sent} entities, {sink.unchanged} unchanged"
+                              + (f", {sink.failed} failed." if sink.failed else "."), sink.failed)
+        print(summary)
+        return summary
+
+    def remove_deleted_areas(self):
+        """
+        Deletes every entity of snapshotted area files that no longer exist in the directory.
+        """
+        present = {AreaSource.area_name(area_file) for area_file in self._get_area_files()}
+        present.update(name for archive in self._get_archives() for name in AreaSource.archive_names(archive))
+        for area_name in Snapshot.area_files(self.snapshot_dir):
+            if area_name not in present:
+                delta = Delta(Snapshot(area_name, self.snapshot_dir))
+                failures = delta.apply()
+                print(f"{area_name} (deleted): {delta}" + (f", {failures} failed requests." if failures else "."))
 
     def run(self):
         """
         Use a process pool to process area files in parallel.
         """
         start_time = time.time()
-        with multiprocessing.Pool(multiprocessing.cpu_count()) as pool:
-            pool.map(self.process_area_file, self.area_files)
+        if self.compression:
+            http.configure_compression(self.compression, self.compression_threshold)
+        if self.archives and (self.pipeline or self.work_dir):
+            print(f"Skipping {len(self.archives)} archives: pipeline and leased runs only take area files on disk.")
+        if self.pipeline:
+            MigrationPipeline(self.area_files, uploaders=self.uploaders, snapshot_dir=self.snapshot_dir).run()
+            if self.compression:
+                print(http.compression_report())
+            print(f"Orchestrator run completed in {time.time() - start_time:.2f} seconds.")
+            return
+        with contextlib.ExitStack() as stack:
+            if self.existing_ids is not None:
+                # Pool tasks get a pickled copy of the orchestrator, so the upsert cache must live in a manager
+                # process for inserts recorded by one worker to reach the others.
+                self.existing_ids.share(stack.enter_context(multiprocessing.Manager()).dict())
+            pool = stack.enter_context(multiprocessing.Pool(multiprocessing.cpu_count()))
+            if self.work_dir:
+                self._run_leased(pool, multiprocessing.cpu_count())
+            else:
+                large_files = [f for f in self.area_files if self._is_large(f)]
+                # Small files are queued first, so the pool works through them while the large files'
+                # inserts are sent from here; their chunks are parsed as workers free up.
+                small_files = pool.map_async(self.process_area_file,
+                                             [f for f in self.area_files if f not in large_files])
+                for area_file in large_files:
+                    self.process_area_file(area_file, pool)
+                small_files.get()
+                self._run_archives(pool, multiprocessing.cpu_count())
+        if self.delta and (self.shard is None or self.shard[0] == 0):
+            self.remove_deleted_areas()
         end_time = time.time()
         print(f"Orchestrator run completed in {end_time - start_time:.2f} seconds.")
 
+    def _run_archives(self, pool, processes):
+        """
+        Streams the area files of each archive to the pool one member at a time,
+        holding at most two members per process in memory.
+        """
+        slots = threading.BoundedSemaphore(2 * processes)
+        results = []
+        for archive in self.archives:
+            for source in AreaSource.from_archive(archive):
+                if not self._wanted(source):
+                    continue
+                slots.acquire()
+                results.append(pool.apply_async(self.process_area_file, (source,),
+                                                callback=lambda _: slots.release(),
+                                                error_callback=lambda _: slots.release()))
+        for result in results:
+            result.get()
 
-
+    def _run_leased(self, pool, processes):
+        """
+        Claims area files from the shared work directory as pool processes free up, until every file
+        is done. Files leased by other hosts are waited on and reclaimed if their lease expires.
+        """
+        leases = LeaseManager(self.work_dir, ttl=self.lease_ttl)
+        leases.start()
+        in_flight = {}
+        failed = set()
+        try:
+            while True:
+                remaining = [f for f in self.area_files if f not in failed and not leases.is_done(f)]
+                if not remaining:
+                    break
+                for area_file in remaining:
+                    if len(in_flight) >= processes:
+                        break
+                    if area_file not in in_flight and leases.claim(area_file):
+                        in_flight[area_file] = pool.apply_async(self.process_area_file, (area_file,),
+                                                                {'lease': leases.lease(area_file)})
+                for area_file, result in list(in_flight.items()):
+                    if result.ready():
+                        del in_flight[area_file]
+                        try:
+                            summary = result.get()
+                        except Exception as e:
+                            print(f"Failed processing {area_file}: {e}")
+                            failed.add(area_file)
+                            leases.release(area_file)
+                            continue
+                        if summary.failures or leases.is_lost(area_file):
+                            # Left unfinished for a later run, or another worker, to pick up from its journal.
+                            print(f"Not completing {area_file}: {summary}")
+                            failed.add(area_file)
+                            leases.release(area_file)
+                        else:
+                            leases.complete(area_file)
+                time.sleep(0.1 if in_flight else 1)
+        finally:
+            leases.stop()
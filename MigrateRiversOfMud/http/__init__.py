@@ -1,7 +1,9 @@
+import gzip
 import json
 import random
+import threading
 import time
-import requests
+from urllib.parse import urlsplit
 
 api_endpoints = {
     'area': "http://dragon:8082/api/v1/",
@@ -13,10 +15,50 @@ api_endpoints = {
     'special': "http://dragon:8088/api/v1/"
 }
 
+entity_paths = {
+    'area': "areas",
+    'room': "room",
+    'mobile': "mobile",
+    'item': "item",
+    'shop': "shop",
+    'reset': "reset",
+    'special': "special"
+}
+
 headers = {
     'Content-Type': 'application/json'
 }
 
+# Request bodies of at least threshold bytes are compressed with the configured encoding. An endpoint
+# answering 415 Unsupported Media Type is remembered as declining that encoding, and is sent the next
+# candidate (gzip, then none) instead. One answering 400 Bad Request, as services that ignore
+# Content-Encoding do when they parse the compressed bytes as JSON, is sent the body uncompressed, and
+# remembered as declining the encoding if that succeeds. A service that ignores Content-Encoding yet
+# accepts the body cannot be told apart, so compression is off unless configured, and should only be
+# turned on for services known to decode it.
+compression = {
+    'encoding': None,
+    'threshold': 1024,
+    'level': 6,
+}
+
+compression_stats = {
+    'requests': 0,
+    'compressed': 0,
+    'declined': 0,
+    'body_bytes': 0,
+    'sent_bytes': 0,
+}
+
+_declined_encodings = {}
+_stats_lock = threading.Lock()
+
+
+class ReadFailed(RuntimeError):
+    """
+    Raised when the services do not answer a read, so a failed read is never taken for an empty result.
+    """
+
 
 def generate_mongo_id() -> str:
     """
@@ -29,6 +71,101 @@ def generate_mongo_id() -> str:
     return (timestamp + machine_id + process_id + counter).hex()
 
 
+def _requests():
+    """
+    Imports requests on first use, so processes that never make a request don't pay for it.
+    """
+    import requests
+    return requests
+
+
+def _zstd_compress(data, level):
+    """
+    Compresses with the standard library's zstd module where there is one (Python 3.14), and with the
+    optional zstandard package otherwise.
+    """
+    try:
+        from compression import zstd
+        return zstd.compress(data, level)
+    except ImportError:
+        import zstandard
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+_compressors = {
+    'gzip': lambda data, level: gzip.compress(data, compresslevel=level),
+    'zstd': _zstd_compress,
+}
+
+
+def configure_compression(encoding='gzip', threshold=1024, level=6):
+    """
+    Compresses request bodies of at least threshold bytes with gzip or zstd, or stops compressing given None.
+    Every service sent to must decode Content-Encoding.
+    """
+    if encoding is not None and encoding not in _compressors:
+        raise ValueError(f"Unsupported request encoding: {encoding}")
+    if encoding == 'zstd':
+        _zstd_compress(b'', level)
+    compression.update(encoding=encoding, threshold=threshold, level=level)
+
+
+def compression_report():
+    stats = compression_stats
+    saved = stats['body_bytes'] - stats['sent_bytes']
+    ratio = 100 * saved / stats['body_bytes'] if stats['body_bytes'] else 0
+    return (f"Sent {stats['body_bytes']} bytes of request bodies as {stats['sent_bytes']} bytes, "
+            f"{saved} saved ({ratio:.1f}%); {stats['compressed']} of {stats['requests']} requests compressed, "
+            f"{stats['declined']} declined.")
+
+
+def _count(body_bytes, sent_bytes, compressed=False, declined=False):
+    with _stats_lock:
+        compression_stats['requests'] += not declined
+        compression_stats['compressed'] += compressed
+        compression_stats['declined'] += declined
+        compression_stats['body_bytes'] += 0 if declined else body_bytes
+        compression_stats['sent_bytes'] += sent_bytes
+
+
+def _send(method, payload, url):
+    """
+    Sends a JSON body, compressed if it is large enough and the endpoint has not declined the encoding.
+    """
+    body = json.dumps(payload).encode('utf-8')
+    request = getattr(_requests(), method)
+    encoding = compression['encoding']
+    if encoding and len(body) >= compression['threshold']:
+        endpoint = urlsplit(url).netloc
+        declined = _declined_encodings.setdefault(endpoint, set())
+        for candidate in dict.fromkeys((encoding, 'gzip')):
+            if candidate in declined:
+                continue
+            data = _compressors[candidate](body, compression['level'])
+            resp = request(url, data=data, headers={**headers, 'Content-Encoding': candidate})
+            if resp.status_code not in (400, 415):
+                _count(len(body), len(data), compressed=True)
+                return handle_response(resp)
+            _count(len(body), len(data), declined=True)
+            if resp.status_code == 415:
+                declined.add(candidate)
+                continue
+            resp = request(url, data=body, headers=headers)
+            _count(len(body), len(body))
+            if resp.status_code in [200, 201]:
+                declined.add(candidate)
+            return handle_response(resp)
+    _count(len(body), len(body))
+    return handle_response(request(url, data=body, headers=headers))
+
+
+def entity_url(entity_type):
+    """
+    Return the collection URL the given entity type is posted to.
+    """
+    return api_endpoints[entity_type] + entity_paths[entity_type]
+
+
 def handle_response(resp):
     if resp.status_code in [200, 201]:
         return resp
@@ -40,18 +177,57 @@ def get(payload, url):
     """
     Make an HTTP GET request with the given payload to the specified URL.
     """
-    return handle_response(requests.get(url, data=json.dumps(payload), headers=headers))
+    return handle_response(_requests().get(url, data=json.dumps(payload), headers=headers))
+
+
+def rows(response):
+    """
+    Returns the documents of a GET response, whether it is a plain list or a page object.
+    """
+    content = json.loads(response.content)
+    return content.get('content', []) if isinstance(content, dict) else content
+
+
+def read(entity_type, query):
+    """
+    Returns the documents of an entity type matching the query, raising ReadFailed if the GET fails.
+    """
+    response = get(query, entity_url(entity_type))
+    if response is None:
+        raise ReadFailed(f"Reading {entity_type} documents matching {query} failed.")
+    return rows(response)
+
+
+def read_all(entity_type, query, page_size=500, read_page=read):
+    """
+    Pages through every document of an entity type matching the query with read_page, raising
+    ReadFailed if any page fails rather than returning the pages read so far.
+    """
+    documents, page = [], 0
+    while True:
+        batch = read_page(entity_type, {**query, 'page': page, 'size': page_size})
+        documents.extend(batch)
+        if len(batch) < page_size:
+            return documents
+        page += 1
 
 
 def post(payload, url):
     """
     Make an HTTP POST request with the given payload to the specified URL.
     """
-    return handle_response(requests.post(url, data=json.dumps(payload), headers=headers))
+    return _send('post', payload, url)
 
 
 def put(payload, url):
     """
     Make an HTTP PUT request with the given payload to the specified URL.
     """
-    return handle_response(requests.put(url, data=json.dumps(payload), headers=headers))
+    return _send('put', payload, url)
+
+
+def delete(payload, url):
+    """
+    Make an HTTP DELETE request with the given payload to the specified URL.
+    """
+    return _send('delete', payload, url)
@@ -6,13 +6,18 @@ def setup_logger(object_name, log_dir):
     """
     Sets up a logger for the class.
     """
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-
     logger = logging.getLogger(f'{object_name}')
     logger.setLevel(logging.DEBUG)
 
-    file_handler = logging.FileHandler(os.path.join(log_dir, object_name+'.log'))
+    # Every entity sets up its class logger, so only the first call may attach the file handler.
+    log_file = os.path.abspath(os.path.join(log_dir, object_name+'.log'))
+    if any(getattr(handler, 'baseFilename', None) == log_file for handler in logger.handlers):
+        return logger
+
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+
+    file_handler = logging.FileHandler(log_file)
     file_handler.setLevel(logging.DEBUG)
 
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -0,0 +1,13 @@
+class AreaSummary(str):
+    """
+    One-line summary of how an area file was migrated, which also carries the number of inserts or requests
+    that failed, so callers can tell a clean run from a partial one without parsing the text.
+    """
+
+    def __new__(cls, text, failures=0):
+        summary = super().__new__(cls, text)
+        summary.failures = failures
+        return summary
+
+    def __reduce__(self):
+        return AreaSummary, (str(self), self.failures)
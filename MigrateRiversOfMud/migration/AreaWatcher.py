@@ -0,0 +1,134 @@
+import hashlib
+import os
+import time
+
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.TextTable import shared_texts
+from MigrateRiversOfMud.logging import setup_logger
+from MigrateRiversOfMud.migration.Delta import Delta
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+
+
+class AreaWatcher:
+    """
+    Long-running watch over an area directory that re-migrates area files as builders edit them.
+
+    The directory is polled by modification time and size, which costs one stat per file. A changed
+    file is only re-parsed once it has stopped changing for the debounce interval and its content hash
+    differs from the last synced one; then just its delta is sent. Snapshots stay in memory between
+    edits. A file that cannot be synced, because it is half saved or a service refused it, is logged and
+    retried on a later poll rather than stopping the watch.
+    """
+
+    def __init__(self, directory, poll_interval=0.2, debounce=0.3, snapshot_dir='snapshots', log_dir='logs'):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.snapshot_dir = snapshot_dir
+        self.log_dir = log_dir
+        self.snapshots = {}
+        self.content_hashes = {}
+        self._stats = {}
+        self._pending = {}
+        self.logger = setup_logger("AreaWatcher", log_dir)
+
+    def _scan(self):
+        """
+        Returns {path: (mtime, size)} for every area file in the directory.
+        """
+        stats = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.name.endswith('.are') and entry.is_file():
+                        stat = entry.stat()
+                        stats[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                except FileNotFoundError:
+                    continue
+        return stats
+
+    @staticmethod
+    def _content_hash(area_file):
+        with open(area_file, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def poll(self):
+        """
+        Performs one scan, syncing every file whose edits have settled and removing deleted files.
+        """
+        now = time.monotonic()
+        current = self._scan()
+        for area_file, stat in current.items():
+            if self._stats.get(area_file) != stat:
+                self._stats[area_file] = stat
+                self._pending[area_file] = now
+        for area_file in set(self._stats) - set(current):
+            self._pending.pop(area_file, None)
+            try:
+                if self._remove(area_file):
+                    del self._stats[area_file]
+            except Exception as e:
+                self.logger.exception(f"Failed removing {area_file}, retrying on the next poll: {e}")
+        for area_file, changed_at in list(self._pending.items()):
+            if now - changed_at >= self.debounce:
+                del self._pending[area_file]
+                try:
+                    self._sync(area_file)
+                except Exception as e:
+                    self.logger.exception(f"Failed syncing {area_file}, retrying on the next poll: {e}")
+                    self._pending[area_file] = time.monotonic()
+
+    def _snapshot(self, area_file):
+        area_name = os.path.basename(area_file)
+        if area_name not in self.snapshots:
+            self.snapshots[area_name] = Snapshot(area_file, self.snapshot_dir)
+        return self.snapshots[area_name]
+
+    def _sync(self, area_file):
+        """
+        Re-parses an area file whose content changed and sends its delta. A failed sync is retried on the next poll.
+        """
+        start_time = time.time()
+        content_hash = self._content_hash(area_file)
+        if self.content_hashes.get(area_file) == content_hash:
+            return
+        snapshot = self._snapshot(area_file)
+        with shared_texts.scope():
+            area = Area(area_file, insert=False, log_dir=self.log_dir, known_ids=snapshot.ids())
+            delta = Delta(snapshot, area)
+            failures = delta.apply()
+        if failures:
+            self.logger.error(f"{failures} requests failed while syncing {area_file}; retrying.")
+            self._pending[area_file] = time.monotonic()
+        else:
+            self.content_hashes[area_file] = content_hash
+        if not delta.is_empty():
+            print(f"{area.key}: {delta} in {time.time() - start_time:.2f} seconds.")
+
+    def _remove(self, area_file):
+        """
+        Deletes every migrated entity of an area file that was removed from the directory. Returns whether
+        every delete succeeded; entities whose delete failed stay in the snapshot for the next attempt.
+        """
+        snapshot = self._snapshot(area_file)
+        delta = Delta(snapshot)
+        failures = delta.apply()
+        if failures:
+            self.logger.error(f"{failures} requests failed while removing {area_file}; retrying.")
+            return False
+        del self.snapshots[os.path.basename(area_file)]
+        self.content_hashes.pop(area_file, None)
+        print(f"{snapshot.area} (deleted): {delta}.")
+        return True
+
+    def run(self):
+        """
+        Syncs every area file once, then keeps polling until interrupted.
+        """
+        print(f"Watching {self.directory} for area file changes.")
+        try:
+            while True:
+                self.poll()
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
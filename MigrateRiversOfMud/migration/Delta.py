@@ -0,0 +1,77 @@
+from MigrateRiversOfMud.http import post, put, delete, entity_url
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+
+
+class Delta:
+    """
+    Entity-level difference between a freshly parsed area and the snapshot of its last sync.
+    The area must have been parsed with the snapshot's ids as known ids, so unchanged entities
+    keep their MongoIDs and hash identically.
+    """
+
+    def __init__(self, snapshot, area=None):
+        self.snapshot = snapshot
+        self.area = area
+        self.added = []
+        self.changed = []
+        self.removed = []
+        self._hashes = {}
+        self._diff()
+
+    def _diff(self):
+        """
+        Classifies every entity as added, changed or removed. Unchanged entities are left out.
+        """
+        seen = set()
+        if self.area is not None:
+            for entity_type, key, entity in self.area.keyed_entities():
+                payload = self.area.payload(entity_type, entity)
+                content_hash = Snapshot.content_hash(payload)
+                self._hashes[(entity_type, key)] = content_hash
+                seen.add((entity_type, key))
+                previous = self.snapshot.get(entity_type, key)
+                if previous is None:
+                    self.added.append((entity_type, key, entity.id, payload))
+                elif previous['hash'] != content_hash:
+                    self.changed.append((entity_type, key, entity.id, payload))
+        for entity_type, entries in self.snapshot.entities.items():
+            for key, entry in entries.items():
+                if (entity_type, key) not in seen:
+                    self.removed.append((entity_type, key, entry['id']))
+
+    def is_empty(self):
+        return not (self.added or self.changed or self.removed)
+
+    def apply(self, delete_batch_size=100):
+        """
+        Posts added entities, puts changed ones and deletes removed ones in batches, then saves the
+        snapshot. Entities whose request failed keep their previous snapshot entry, so the next sync
+        retries them. Returns the number of failed requests.
+        """
+        failures = 0
+        for entity_type, key, entity_id, payload in self.added:
+            if post(payload, entity_url(entity_type)):
+                self.snapshot.update(entity_type, key, entity_id, self._hashes[(entity_type, key)])
+            else:
+                failures += 1
+        for entity_type, key, entity_id, payload in self.changed:
+            if put(payload, f"{entity_url(entity_type)}/{entity_id}"):
+                self.snapshot.update(entity_type, key, entity_id, self._hashes[(entity_type, key)])
+            else:
+                failures += 1
+        removed_by_type = {}
+        for entity_type, key, entity_id in self.removed:
+            removed_by_type.setdefault(entity_type, []).append((key, entity_id))
+        for entity_type, entries in removed_by_type.items():
+            for start in range(0, len(entries), delete_batch_size):
+                batch = entries[start:start + delete_batch_size]
+                if delete({'ids': [entity_id for _, entity_id in batch]}, entity_url(entity_type)):
+                    for key, _ in batch:
+                        self.snapshot.discard(entity_type, key)
+                else:
+                    failures += 1
+        self.snapshot.save()
+        return failures
+
+    def __str__(self):
+        return f"{len(self.added)} added, {len(self.changed)} changed, {len(self.removed)} removed"
@@ -0,0 +1,82 @@
+from MigrateRiversOfMud.entity.EntityKeys import EntityKeys
+from MigrateRiversOfMud.entity.Resets import Reset
+from MigrateRiversOfMud.http import read_all
+
+
+class ExistingIds:
+    """
+    Run-wide cache of the MongoIDs the API services already hold, prefetched per area with paged bulk GETs.
+    Entities are keyed the way Area.keyed_entities keys them, resets by their command and arguments, so
+    the order the service returns documents in does not matter.
+
+    The cache lives in a plain dict by default. Orchestrator runs share it between the processes of their
+    pool by handing share() a multiprocessing manager dict, so inserts recorded by one worker are seen by
+    every other. Entries are kept flat, keyed (area key, entity type, key), because changes made inside the
+    values of a manager dict are not propagated; the area key alone marks an area as prefetched. A read
+    that fails raises ReadFailed, as taking it for an area with nothing stored would insert duplicates.
+    """
+
+    KEY_FIELDS = {
+        'room': 'vnum',
+        'item': 'vnum',
+        'mobile': 'vnum',
+        'shop': 'vnum',
+        'special': 'mobVnum',
+        'reset': None,
+    }
+
+    def __init__(self, page_size=500):
+        self.page_size = page_size
+        self._areas = {}
+
+    def share(self, store):
+        """
+        Moves the cache into store, a dict shared between processes.
+        """
+        store.update(self._areas)
+        self._areas = store
+
+    @classmethod
+    def _key_value(cls, entity_type, row):
+        """
+        Returns the VNUM or content key of a stored document, as EntityKeys expects it.
+        """
+        if entity_type == 'reset':
+            return Reset.key_of(row['resetType'], row.get('args', [])) if row.get('resetType') is not None else None
+        return row.get(cls.KEY_FIELDS[entity_type])
+
+    def prefetch(self, area_key, area_name):
+        """
+        Returns {entity type: {key: id}} for everything already stored for the area, fetching it on first use.
+        """
+        if area_key in self._areas:
+            entries = [(entry, entity_id) for entry, entity_id in self._areas.items()
+                       if isinstance(entry, tuple) and entry[0] == area_key]
+        else:
+            entries = []
+            areas = read_all('area', {'name': area_name}, self.page_size)
+            if areas:
+                area_id = areas[0]['id']
+                entries.append(((area_key, 'area', area_key), area_id))
+                keys = EntityKeys()
+                for entity_type in self.KEY_FIELDS:
+                    for row in read_all(entity_type, {'areaId': area_id}, self.page_size):
+                        key = keys.key(entity_type, self._key_value(entity_type, row))
+                        entries.append(((area_key, entity_type, key), row['id']))
+            self._areas.update({**dict(entries), area_key: True})
+        existing = {}
+        for (_, entity_type, key), entity_id in entries:
+            existing.setdefault(entity_type, {})[key] = entity_id
+        return existing
+
+    def record(self, area_key, entity_type, key, entity_id):
+        """
+        Remembers an entity inserted during this run so later passes update it instead of inserting again.
+        """
+        self._areas[(area_key, entity_type, key)] = entity_id
+
+    def contains(self, area_key, entity_type, key, entity_id):
+        """
+        Checks whether the services already hold the entity under the given id.
+        """
+        return self._areas.get((area_key, entity_type, key)) == entity_id
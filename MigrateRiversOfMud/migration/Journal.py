@@ -0,0 +1,111 @@
+import json
+import os
+
+
+class Journal:
+    """
+    Append-only journal of the inserts the API services acknowledged for a single area file.
+
+    Every MongoID handed out for the area is recorded (and flushed) before the first insert,
+    so entities whose acknowledgement was lost in an unflushed batch are re-posted with the
+    same id on resume instead of being duplicated.
+    """
+
+    def __init__(self, area_file, journal_dir='journal', batch_size=100, resume=True):
+        self.area = os.path.basename(area_file)
+        self.path = self.journal_path(area_file, journal_dir)
+        self.batch_size = batch_size
+        self.assigned = {}
+        self.acknowledged = set()
+        self.completed = False
+        self._pending = []
+        os.makedirs(journal_dir, exist_ok=True)
+        if resume:
+            self._load()
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def journal_path(area_file, journal_dir='journal'):
+        """
+        Returns the path of the journal kept for the given area file.
+        """
+        return os.path.join(journal_dir, os.path.basename(area_file) + '.journal')
+
+    @classmethod
+    def is_complete(cls, area_file, journal_dir='journal'):
+        """
+        Checks whether a previous run finished every insert for the given area file.
+        """
+        return cls(area_file, journal_dir).completed
+
+    def _load(self):
+        """
+        Replays an existing journal. A torn trailing record left by a crash is ignored.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                op = record.get('op')
+                if op == 'assign':
+                    self.assigned.setdefault(record['type'], {})[record['key']] = record['id']
+                elif op == 'ack':
+                    self.acknowledged.add((record['type'], record['key']))
+                elif op == 'done':
+                    self.completed = True
+
+    def assigned_id(self, entity_type, key):
+        """
+        Returns the MongoID a previous run assigned to the entity, if any.
+        """
+        return self.assigned.get(entity_type, {}).get(key)
+
+    def is_acknowledged(self, entity_type, key):
+        """
+        Checks whether the entity was already accepted by its API service.
+        """
+        return (entity_type, key) in self.acknowledged
+
+    def assign(self, entity_type, key, entity_id):
+        """
+        Records a newly generated MongoID. Assignments are written on the next flush.
+        """
+        self.assigned.setdefault(entity_type, {})[key] = entity_id
+        self._append('assign', entity_type, key, entity_id)
+
+    def acknowledge(self, entity_type, key, entity_id):
+        """
+        Records an acknowledged insert, flushing once a full batch has accumulated.
+        """
+        self.acknowledged.add((entity_type, key))
+        self._append('ack', entity_type, key, entity_id)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def complete(self):
+        """
+        Marks every insert for the area as done.
+        """
+        self.completed = True
+        self._pending.append({'op': 'done', 'area': self.area})
+        self.flush()
+
+    def _append(self, op, entity_type, key, entity_id):
+        self._pending.append({'op': op, 'type': entity_type, 'area': self.area, 'key': key, 'id': entity_id})
+
+    def flush(self):
+        """
+        Appends the pending records to the journal file and syncs them to disk.
+        """
+        if not self._pending:
+            return
+        with open(self.path, 'a') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in self._pending))
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = []
@@ -0,0 +1,217 @@
+import os
+import socket
+import threading
+import time
+import uuid
+
+from MigrateRiversOfMud.logging import setup_logger
+
+
+class LeaseLost(RuntimeError):
+    """
+    Raised by work on an area file whose lease another worker reclaimed.
+    """
+
+
+class Lease:
+    """
+    Handle on one held lease that pool tasks can carry, to check every so often that it is still theirs.
+    """
+
+    def __init__(self, path, owner, check_interval=1.0):
+        self.path = path
+        self.owner = owner
+        self.check_interval = check_interval
+        self._checked_at = None
+
+    def check(self):
+        """
+        Raises LeaseLost if the lease file was reaped or now belongs to another worker, reading it at most
+        once per check interval.
+        """
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            with open(self.path, 'r') as f:
+                held = f.read() == self.owner
+        except FileNotFoundError:
+            held = False
+        if not held:
+            raise LeaseLost(f"Lease {self.path} is no longer held by {self.owner}")
+
+
+class LeaseManager:
+    """
+    Lets orchestrators on several hosts split the area files of a shared work directory between them.
+
+    An area file is claimed by atomically creating its lease file, kept alive by a heartbeat thread that
+    touches every held lease, and finished by writing a done marker. A lease whose file was not touched
+    within the TTL belongs to a dead worker and may be reclaimed; reclaimers serialise on a second
+    exclusively created file so only one of them can replace a stale lease. A lease that disappears or
+    changes owner while held is recorded as lost, and work on it must not be marked done.
+    """
+
+    def __init__(self, work_dir, ttl=60, owner=None, log_dir='logs'):
+        self.lease_dir = os.path.join(work_dir, 'leases')
+        self.done_dir = os.path.join(work_dir, 'done')
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.held = set()
+        self.lost = set()
+        self.logger = setup_logger("LeaseManager", log_dir)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._heartbeat = None
+        os.makedirs(self.lease_dir, exist_ok=True)
+        os.makedirs(self.done_dir, exist_ok=True)
+
+    def _lease_path(self, area_file):
+        return os.path.join(self.lease_dir, os.path.basename(area_file) + '.lease')
+
+    def _done_path(self, area_file):
+        return os.path.join(self.done_dir, os.path.basename(area_file))
+
+    def _create_exclusive(self, path):
+        """
+        Atomically creates a file owned by this worker, failing if it already exists.
+        """
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as f:
+            f.write(self.owner)
+        return True
+
+    def _is_expired(self, path):
+        try:
+            return time.time() - os.path.getmtime(path) > self.ttl
+        except FileNotFoundError:
+            return True
+
+    def _owns(self, path):
+        try:
+            with open(path, 'r') as f:
+                return f.read() == self.owner
+        except FileNotFoundError:
+            return False
+
+    def is_done(self, area_file):
+        return os.path.exists(self._done_path(area_file))
+
+    def is_lost(self, area_file):
+        return self._lease_path(area_file) in self.lost
+
+    def lease(self, area_file):
+        """
+        Returns a Lease handle for an area file this worker claimed, to be checked by the task working on it.
+        """
+        return Lease(self._lease_path(area_file), self.owner, min(1.0, self.ttl / 3))
+
+    def claim(self, area_file):
+        """
+        Tries to lease an area file, reclaiming the lease of a dead worker if it expired.
+        """
+        if self.is_done(area_file):
+            return False
+        path = self._lease_path(area_file)
+        if not self._create_exclusive(path):
+            if not self._is_expired(path) or not self._reclaim(path):
+                return False
+        with self._lock:
+            self.held.add(path)
+            self.lost.discard(path)
+        return True
+
+    def _reclaim(self, path):
+        """
+        Replaces an expired lease with one of our own.
+        """
+        reclaim_path = path + '.reclaim'
+        if not self._create_exclusive(reclaim_path):
+            if self._is_expired(reclaim_path):
+                self._remove(reclaim_path)
+            return False
+        try:
+            if not self._is_expired(path):
+                return False
+            self._remove(path)
+            claimed = self._create_exclusive(path)
+            if claimed:
+                self.logger.info(f"{self.owner} reclaimed expired lease {path}")
+            return claimed
+        finally:
+            self._remove(reclaim_path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def complete(self, area_file):
+        """
+        Marks an area file as migrated and releases its lease.
+        """
+        with open(self._done_path(area_file), 'w') as f:
+            f.write(self.owner)
+        self.release(area_file)
+
+    def release(self, area_file):
+        """
+        Gives up the lease on an area file if this worker still owns it.
+        """
+        path = self._lease_path(area_file)
+        with self._lock:
+            self.held.discard(path)
+        if self._owns(path):
+            self._remove(path)
+
+    def renew(self):
+        """
+        Touches every held lease, marking as lost those reaped or reclaimed by another worker in the meantime.
+        """
+        with self._lock:
+            for path in list(self.held):
+                try:
+                    owned = self._owns(path)
+                    if owned:
+                        os.utime(path)
+                except FileNotFoundError:
+                    owned = False
+                if not owned:
+                    self.logger.warning(f"{self.owner} lost lease {path}")
+                    self.held.discard(path)
+                    self.lost.add(path)
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(self.ttl / 3):
+            try:
+                self.renew()
+            except OSError as e:
+                self.logger.error(f"Failed renewing leases: {e}")
+
+    def start(self):
+        """
+        Starts renewing held leases in the background.
+        """
+        self._stopped.clear()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._heartbeat.start()
+
+    def stop(self):
+        """
+        Stops the heartbeat and releases every lease still held.
+        """
+        self._stopped.set()
+        if self._heartbeat:
+            self._heartbeat.join()
+        with self._lock:
+            held = list(self.held)
+            self.held.clear()
+        for path in held:
+            if self._owns(path):
+                self._remove(path)
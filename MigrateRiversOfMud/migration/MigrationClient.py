@@ -0,0 +1,27 @@
+import json
+import socket
+
+from MigrateRiversOfMud.migration.MigrationDaemon import DEFAULT_PORT
+
+
+class MigrationClient:
+    """
+    Thin client that submits jobs to a running MigrationDaemon and streams back its progress events.
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+
+    def submit(self, command, **options):
+        """
+        Sends a job and yields each event the daemon reports until the job is done.
+        """
+        with socket.create_connection((self.host, self.port)) as connection:
+            connection.sendall((json.dumps({'command': command, **options}) + '\n').encode('utf-8'))
+            with connection.makefile('r', encoding='utf-8') as events:
+                for line in events:
+                    event = json.loads(line)
+                    yield event
+                    if event['event'] == 'done':
+                        return
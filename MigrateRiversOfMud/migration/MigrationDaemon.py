@@ -0,0 +1,163 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import socketserver
+import threading
+import time
+
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.TextTable import shared_texts
+from MigrateRiversOfMud.logging import setup_logger
+
+DEFAULT_PORT = 8799
+
+
+def _warm_worker():
+    """
+    Pool initializer that pays the package import cost once per worker instead of once per job.
+    """
+    import MigrateRiversOfMud.entity  # noqa: F401
+
+
+def validate_area_file(area_file):
+    """
+    Parses an area file without inserting it and summarises what was found.
+    """
+    with shared_texts.scope():
+        area = Area(area_file, insert=False)
+        rooms = [room for room in area.rooms if room is not None]
+        external_exits = sum(1 for room in rooms for exit_data in room.exits.values()
+                             if exit_data['to_room_vnum'] not in area.room_id_mapping)
+        return (f"{area.key}: {len(rooms)} rooms, {len(area.mobiles)} mobiles, {len(area.objects)} objects, "
+                f"{len(area.resets)} resets, {len(area.rooms) - len(rooms)} unparsed rooms, "
+                f"{external_exits} exits leaving the area.")
+
+
+def render_area_file(area_file):
+    """
+    Builds the presentation of a single area file.
+    """
+    from MigrateRiversOfMud import build_presentation
+    with shared_texts.scope():
+        build_presentation([area_file])
+    return f"{os.path.basename(area_file)}: rendered."
+
+
+class MigrationDaemon:
+    """
+    Long-lived server that keeps a warm worker pool for the migrate, validate and render jobs builders
+    submit all day. Jobs arrive as one JSON line over a local socket and progress is streamed back as
+    one JSON event per line. Content hashes of the files each job last handled are cached, so re-running
+    a job only touches the area files that changed since.
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, processes=None, log_dir='logs'):
+        self.host = host
+        self.port = port
+        self.processes = processes or multiprocessing.cpu_count()
+        self.pool = None
+        self.server = None
+        self.content_hashes = {}
+        self.results = {}
+        self.logger = setup_logger("MigrationDaemon", log_dir)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _content_hash(area_file):
+        with open(area_file, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    @staticmethod
+    def _area_files(path):
+        if os.path.isdir(path):
+            return [os.path.join(path, file) for file in os.listdir(path) if file.endswith('.are')]
+        return [path]
+
+    def _changed_files(self, command, area_files, force):
+        """
+        Returns the files whose content changed since the command last processed them, with their hashes.
+        """
+        changed = {}
+        for area_file in area_files:
+            content_hash = self._content_hash(area_file)
+            with self._lock:
+                if force or self.content_hashes.get((command, area_file)) != content_hash:
+                    changed[area_file] = content_hash
+        return changed
+
+    def _job(self, request):
+        """
+        Resolves a request to the pool function that processes one area file.
+        """
+        command = request.get('command')
+        if command == 'migrate':
+            from MigrateRiversOfMud.entity import Orchestrator
+            orchestrator = Orchestrator(request['path'], resume=request.get('resume', False),
+                                        delta=request.get('delta', True), upsert=request.get('upsert', False))
+            return orchestrator.area_files, orchestrator.process_area_file
+        if command == 'validate':
+            return self._area_files(request['path']), validate_area_file
+        if command == 'render':
+            return self._area_files(request['path']), render_area_file
+        raise ValueError(f"Unknown command: {command}")
+
+    def handle(self, request, send):
+        """
+        Runs a job on the warm pool, calling send with each progress event.
+        """
+        start_time = time.time()
+        command = request.get('command')
+        if command == 'shutdown':
+            send({'event': 'done', 'seconds': 0})
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        area_files, function = self._job(request)
+        changed = self._changed_files(command, area_files, request.get('force', False))
+        for area_file in area_files:
+            if area_file not in changed:
+                cached = self.results.get((command, area_file))
+                if command == 'migrate':
+                    cached = f"{os.path.basename(area_file)}: unchanged."
+                send({'event': 'progress', 'file': area_file, 'result': cached, 'cached': True})
+        results = {area_file: self.pool.apply_async(function, (area_file,)) for area_file in changed}
+        for area_file, result in results.items():
+            try:
+                summary = result.get()
+            except Exception as e:
+                self.logger.error(f"{command} failed for {area_file}: {e}")
+                send({'event': 'error', 'file': area_file, 'message': str(e)})
+                continue
+            # Files that only partly migrated are left uncached, so the next submit retries them.
+            if not getattr(summary, 'failures', 0):
+                with self._lock:
+                    self.content_hashes[(command, area_file)] = changed[area_file]
+                    self.results[(command, area_file)] = summary
+            send({'event': 'progress', 'file': area_file, 'result': summary, 'cached': False})
+        send({'event': 'done', 'seconds': round(time.time() - start_time, 3)})
+
+    def serve(self):
+        """
+        Starts the worker pool and serves jobs until a shutdown request arrives.
+        """
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                def send(event):
+                    self.wfile.write((json.dumps(event) + '\n').encode('utf-8'))
+                    self.wfile.flush()
+                try:
+                    daemon.handle(json.loads(self.rfile.readline()), send)
+                except Exception as e:
+                    daemon.logger.error(f"Job failed: {e}")
+                    send({'event': 'error', 'message': str(e)})
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        with multiprocessing.Pool(self.processes, initializer=_warm_worker) as self.pool:
+            with Server((self.host, self.port), Handler) as self.server:
+                print(f"Migration daemon listening on {self.host}:{self.port} with {self.processes} workers.")
+                self.server.serve_forever()
@@ -0,0 +1,157 @@
+import multiprocessing
+import queue
+import threading
+import time
+
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.TextTable import shared_texts
+from MigrateRiversOfMud.http import post, entity_url
+from MigrateRiversOfMud.logging import setup_logger
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+
+
+def build_payload_batches(area_file, batch_size, snapshot_dir):
+    """
+    Pool task that parses an area file into batches of (entity type, key, id, payload) tuples,
+    together with the snapshot to save once every batch has been uploaded.
+    """
+    with shared_texts.scope():
+        area = Area(area_file, insert=False)
+        payloads = [(entity_type, key, entity.id, area.payload(entity_type, entity))
+                    for entity_type, key, entity in area.keyed_entities()]
+        batches = [payloads[start:start + batch_size] for start in range(0, len(payloads), batch_size)]
+        return area.key, batches, Snapshot.from_area(area, snapshot_dir)
+
+
+class MigrationPipeline:
+    """
+    Two-stage migration that keeps both the CPU and the network busy. A process pool parses area files
+    into payload batches while a pool of uploader threads posts them. The stages are joined by a bounded
+    batch queue, and at most max_parsed files may be parsed but not yet uploaded, so parsing stalls
+    rather than piling up results when the services fall behind. The depth of each stage is reported
+    every report_interval seconds and available from stats().
+    """
+
+    def __init__(self, area_files, processes=None, uploaders=8, batch_size=50, max_batches=64, max_parsed=None,
+                 snapshot_dir='snapshots', report_interval=5, log_dir='logs'):
+        self.area_files = area_files
+        self.processes = processes or multiprocessing.cpu_count()
+        self.uploaders = uploaders
+        self.batch_size = batch_size
+        self.max_parsed = max_parsed or 2 * self.processes
+        self.snapshot_dir = snapshot_dir
+        self.report_interval = report_interval
+        self.logger = setup_logger("MigrationPipeline", log_dir)
+        self.batches = queue.Queue(maxsize=max_batches)
+        self._slots = threading.BoundedSemaphore(self.max_parsed)
+        self._lock = threading.Lock()
+        self._files = {}
+        self._parsing = 0
+        self._finished = threading.Event()
+        self._remaining_files = len(area_files)
+        self.uploaded = 0
+        self.failed = 0
+
+    def stats(self):
+        """
+        Returns the current depth of each stage.
+        """
+        with self._lock:
+            return {
+                'parsing': self._parsing,
+                'parsed': len(self._files),
+                'queuedBatches': self.batches.qsize(),
+                'uploaded': self.uploaded,
+                'failed': self.failed,
+            }
+
+    def _on_parsed(self, result):
+        """
+        Runs on the pool's result thread and blocks while the batch queue is full.
+        """
+        area_key, batches, snapshot = result
+        with self._lock:
+            self._parsing -= 1
+            self._files[area_key] = {'pending': len(batches), 'failed': 0, 'snapshot': snapshot}
+        if not batches:
+            self._finish_file(area_key)
+        for batch in batches:
+            self.batches.put((area_key, batch))
+
+    def _on_parse_error(self, error):
+        self.logger.error(f"Failed parsing area file: {error}")
+        with self._lock:
+            self._parsing -= 1
+        self._file_done()
+
+    def _file_done(self):
+        self._slots.release()
+        with self._lock:
+            self._remaining_files -= 1
+            if self._remaining_files == 0:
+                self._finished.set()
+
+    def _finish_file(self, area_key):
+        """
+        Saves the snapshot of a fully uploaded area file and frees its parse slot.
+        """
+        with self._lock:
+            state = self._files.pop(area_key)
+        if state['failed']:
+            print(f"{area_key}: {state['failed']} failed inserts.")
+        else:
+            state['snapshot'].save()
+        self._file_done()
+
+    def _upload(self):
+        while True:
+            item = self.batches.get()
+            if item is None:
+                return
+            area_key, batch = item
+            failed = 0
+            for entity_type, key, entity_id, payload in batch:
+                if not post(payload, entity_url(entity_type)):
+                    self.logger.error(f"Failed posting {entity_type} {key} of {area_key} to API endpoint.")
+                    failed += 1
+            with self._lock:
+                self.uploaded += len(batch) - failed
+                self.failed += failed
+                state = self._files[area_key]
+                state['failed'] += failed
+                state['pending'] -= 1
+                done = state['pending'] == 0
+            if done:
+                self._finish_file(area_key)
+
+    def _report(self):
+        while not self._finished.wait(self.report_interval):
+            stats = self.stats()
+            print(f"Pipeline: {stats['parsing']} parsing, {stats['parsed']} awaiting upload, "
+                  f"{stats['queuedBatches']} batches queued, {stats['uploaded']} uploaded, {stats['failed']} failed.")
+
+    def run(self):
+        """
+        Runs both stages until every area file has been parsed and uploaded.
+        """
+        start_time = time.time()
+        if not self.area_files:
+            return
+        uploaders = [threading.Thread(target=self._upload, daemon=True) for _ in range(self.uploaders)]
+        for uploader in uploaders:
+            uploader.start()
+        threading.Thread(target=self._report, daemon=True).start()
+        with multiprocessing.Pool(self.processes) as pool:
+            for area_file in self.area_files:
+                self._slots.acquire()
+                with self._lock:
+                    self._parsing += 1
+                pool.apply_async(build_payload_batches, (area_file, self.batch_size, self.snapshot_dir),
+                                 callback=self._on_parsed, error_callback=self._on_parse_error)
+            self._finished.wait()
+        for _ in uploaders:
+            self.batches.put(None)
+        for uploader in uploaders:
+            uploader.join()
+        print(f"Pipeline uploaded {self.uploaded} entities ({self.failed} failed) "
+              f"in {time.time() - start_time:.2f} seconds.")
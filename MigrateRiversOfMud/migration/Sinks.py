@@ -0,0 +1,103 @@
+import json
+import os
+import queue
+import threading
+
+from MigrateRiversOfMud.http import post, put, entity_url
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+
+
+class HttpSink:
+    """
+    Posts each streamed payload to its API service.
+
+    Given the snapshot of the area, every acknowledged entity is recorded in it and the snapshot is saved on
+    close, so delta runs and verification pick up after a streamed migration. Entities the snapshot already
+    holds are put instead of posted, or skipped if their content is unchanged, so streaming an area again,
+    or after an interrupted run, sends no duplicates. The payloads must carry the snapshot's ids.
+    """
+
+    def __init__(self, logger=None, snapshot=None):
+        self.logger = logger
+        self.snapshot = snapshot
+        self.sent = 0
+        self.failed = 0
+        self.unchanged = 0
+
+    def write(self, entity_type, key, entity_id, payload):
+        previous = self.snapshot.get(entity_type, key) if self.snapshot else None
+        content_hash = Snapshot.content_hash(payload) if self.snapshot else None
+        if previous and previous['hash'] == content_hash:
+            self.unchanged += 1
+            return
+        if previous:
+            response = put(payload, f"{entity_url(entity_type)}/{entity_id}")
+        else:
+            response = post(payload, entity_url(entity_type))
+        if response:
+            self.sent += 1
+            if self.snapshot:
+                self.snapshot.update(entity_type, key, entity_id, content_hash)
+        else:
+            self.failed += 1
+            if self.logger:
+                self.logger.error(f"Failed sending {entity_type} {key} to API endpoint.")
+
+    def close(self):
+        if self.snapshot:
+            self.snapshot.save()
+
+
+class NdjsonSink:
+    """
+    Appends each streamed payload as one JSON line to an export file.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.sent = 0
+        self.failed = 0
+        self.unchanged = 0
+        self._file = open(path, 'w')
+
+    def write(self, entity_type, key, entity_id, payload):
+        self._file.write(json.dumps({'type': entity_type, 'key': key, 'id': entity_id, 'payload': payload}) + '\n')
+        self.sent += 1
+
+    def close(self):
+        self._file.close()
+
+
+def stream_to_sink(payloads, sink, max_pending=64):
+    """
+    Feeds (entity type, key, id, payload) tuples from a producer such as AreaStream.payloads into a sink
+    running on its own thread. The bounded queue between them caps how many payloads are held at once;
+    the producer blocks while the sink is behind.
+    """
+    pending = queue.Queue(maxsize=max_pending)
+    finished = object()
+    errors = []
+
+    def consume():
+        while True:
+            item = pending.get()
+            if item is finished:
+                return
+            try:
+                sink.write(*item)
+            except Exception as e:
+                errors.append(e)
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+    try:
+        for item in payloads:
+            pending.put(item)
+    finally:
+        pending.put(finished)
+        consumer.join()
+        sink.close()
+    if errors:
+        raise errors[0]
+    return sink
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+
+
+class Snapshot:
+    """
+    MongoID and content hash of every entity migrated from one area file, as of its last successful sync.
+    """
+
+    def __init__(self, area_file, snapshot_dir='snapshots'):
+        self.area = os.path.basename(area_file)
+        self.snapshot_dir = snapshot_dir
+        self.path = os.path.join(snapshot_dir, self.area + '.json')
+        self.entities = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.entities = json.load(f)
+
+    @staticmethod
+    def content_hash(payload):
+        """
+        Returns a stable hash of an entity payload.
+        """
+        return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def area_files(snapshot_dir='snapshots'):
+        """
+        Returns the names of every area file that has a snapshot.
+        """
+        if not os.path.isdir(snapshot_dir):
+            return []
+        return [file[:-len('.json')] for file in os.listdir(snapshot_dir) if file.endswith('.json')]
+
+    @classmethod
+    def from_area(cls, area, snapshot_dir='snapshots'):
+        """
+        Creates a snapshot describing every entity of an already migrated area.
+        """
+        snapshot = cls(area.key, snapshot_dir)
+        snapshot.entities = {}
+        for entity_type, key, entity in area.keyed_entities():
+            snapshot.update(entity_type, key, entity.id, cls.content_hash(area.payload(entity_type, entity)))
+        return snapshot
+
+    def ids(self):
+        """
+        Returns the entity ids in the {entity type: {key: id}} form Area accepts as known ids.
+        """
+        return {entity_type: {key: entry['id'] for key, entry in entries.items()}
+                for entity_type, entries in self.entities.items()}
+
+    def get(self, entity_type, key):
+        return self.entities.get(entity_type, {}).get(key)
+
+    def update(self, entity_type, key, entity_id, content_hash):
+        self.entities.setdefault(entity_type, {})[key] = {'id': entity_id, 'hash': content_hash}
+
+    def discard(self, entity_type, key):
+        self.entities.get(entity_type, {}).pop(key, None)
+
+    def save(self):
+        """
+        Atomically replaces the snapshot file, or removes it once no entities remain.
+        """
+        if not any(self.entities.values()):
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.entities, f)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,168 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.AreaSource import AreaSource
+from MigrateRiversOfMud.http import ReadFailed, read, read_all
+from MigrateRiversOfMud.logging import setup_logger
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+
+
+class Verifier:
+    """
+    Reads migrated entities back from the API services and compares them field by field with payloads
+    freshly built from the area files. Areas are parsed with the ids of their snapshots, so the fresh
+    payloads carry the ids the services stored them under.
+
+    Without a sample every entity is read back with paged GETs of each entity type of an area, which
+    also finds entities the services hold but the area file no longer defines. Given a sample, a
+    fraction below 1 or a number of entities per area, a random selection is read back with bulk GETs
+    by id instead. The GETs of all areas run concurrently on a pool of worker threads. Entities whose
+    read failed are reported as unread rather than missing, and left out of the comparison.
+    """
+
+    def __init__(self, snapshot_dir='snapshots', sample=None, page_size=500, workers=16, seed=None,
+                 cache_dir=None, log_dir='logs'):
+        self.snapshot_dir = snapshot_dir
+        self.sample = sample
+        self.page_size = page_size
+        self.workers = workers
+        self.random = random.Random(seed)
+        self.cache_dir = cache_dir
+        self.logger = setup_logger("Verifier", log_dir)
+        self.mismatches = []
+        self.checked = 0
+        self.requests = 0
+        self.seconds = 0
+        self._lock = threading.Lock()
+
+    def _read(self, entity_type, query):
+        with self._lock:
+            self.requests += 1
+        return read(entity_type, query)
+
+    def _fetch_paged(self, entity_type, query):
+        return read_all(entity_type, query, self.page_size, self._read)
+
+    def _fetch_ids(self, entity_type, ids):
+        return self._read(entity_type, {'ids': ids})
+
+    def _expected(self, area_file):
+        """
+        Returns the parsed area and {(entity type, id): (key, payload)} for an area file, or None if it
+        has no snapshot to take ids from.
+        """
+        snapshot = Snapshot(AreaSource.area_name(area_file), self.snapshot_dir)
+        if not snapshot.entities:
+            return None
+        area = Area(area_file, insert=False, known_ids=snapshot.ids(), cache_dir=self.cache_dir)
+        expected = {}
+        for entity_type, key, entity in area.keyed_entities():
+            payload = json.loads(json.dumps(area.payload(entity_type, entity), default=str))
+            expected[(entity_type, payload['id'])] = (key, payload)
+        return area, expected
+
+    def _selection(self, expected):
+        if not self.sample:
+            return expected
+        count = round(self.sample * len(expected)) if self.sample < 1 else int(self.sample)
+        chosen = self.random.sample(sorted(expected), min(count, len(expected)))
+        return {entry: expected[entry] for entry in chosen}
+
+    def _requests_for(self, area, selection):
+        """
+        Returns the reads covering the selected entities, as (entity type, ids of the selected entities
+        it covers, fetch, arguments) tuples.
+        """
+        entity_types = sorted({entity_type for entity_type, _ in selection})
+        reads = []
+        for entity_type in entity_types:
+            ids = [entity_id for selected_type, entity_id in selection if selected_type == entity_type]
+            if not self.sample:
+                query = {'name': area.name} if entity_type == 'area' else {'areaId': area.id}
+                reads.append((entity_type, ids, self._fetch_paged, (query,)))
+                continue
+            for start in range(0, len(ids), self.page_size):
+                chunk = ids[start:start + self.page_size]
+                reads.append((entity_type, chunk, self._fetch_ids, (chunk,)))
+        return reads
+
+    def _compare(self, area_key, selection, stored, unread):
+        """
+        Records every selected entity the services lack or hold with different fields, and in full
+        mode every stored entity no longer in the area file. Entities that could not be read are skipped.
+        """
+        for (entity_type, entity_id), (key, payload) in selection.items():
+            if (entity_type, entity_id) in unread:
+                continue
+            self.checked += 1
+            document = stored.get((entity_type, entity_id))
+            if document is None:
+                self.mismatches.append((area_key, entity_type, key, None, 'missing', None))
+                continue
+            for field, value in payload.items():
+                if document.get(field) != value:
+                    self.mismatches.append((area_key, entity_type, key, field, value, document.get(field)))
+        if not self.sample:
+            for (entity_type, entity_id), document in stored.items():
+                if (entity_type, entity_id) not in selection and entity_type != 'area':
+                    self.mismatches.append((area_key, entity_type, entity_id, None, None, 'unexpected'))
+
+    def run(self, area_files):
+        """
+        Verifies every area file and returns the mismatches found, as (area, entity type, key, field,
+        expected, stored) tuples.
+        """
+        start_time = time.time()
+        with ThreadPoolExecutor(self.workers) as executor:
+            pending = []
+            for area_file in area_files:
+                parsed = self._expected(area_file)
+                if parsed is None:
+                    self.mismatches.append((AreaSource.area_name(area_file), 'area', None, None, 'not migrated', None))
+                    continue
+                area, expected = parsed
+                selection = self._selection(expected)
+                reads = [(entity_type, ids, executor.submit(fetch, entity_type, *arguments))
+                         for entity_type, ids, fetch, arguments in self._requests_for(area, selection)]
+                pending.append((area.key, selection, reads))
+            for area_key, selection, reads in pending:
+                stored, unread = {}, set()
+                for entity_type, ids, future in reads:
+                    try:
+                        documents = future.result()
+                    except ReadFailed:
+                        unread.update((entity_type, entity_id) for entity_id in ids)
+                        self.mismatches.append((area_key, entity_type, None, None, 'read failed', len(ids)))
+                        continue
+                    for document in documents:
+                        if isinstance(document, dict) and 'id' in document:
+                            stored[(entity_type, document['id'])] = document
+                self._compare(area_key, selection, stored, unread)
+        self.seconds = time.time() - start_time
+        for mismatch in self.mismatches:
+            self.logger.warning(f"Verification mismatch: {mismatch}")
+        return self.mismatches
+
+    def report(self):
+        lines = []
+        for area_key, entity_type, key, field, expected, stored in self.mismatches:
+            if expected == 'not migrated':
+                lines.append(f"{area_key}: no snapshot, so it was never migrated.")
+            elif expected == 'read failed':
+                lines.append(f"{area_key}: reading {stored} {entity_type} entities back failed, so they were not "
+                             f"verified.")
+            elif expected == 'missing':
+                lines.append(f"{area_key}: {entity_type} {key} is missing.")
+            elif stored == 'unexpected':
+                lines.append(f"{area_key}: {entity_type} {key} is stored but not in the area file.")
+            else:
+                lines.append(f"{area_key}: {entity_type} {key} {field} is {stored!r}, expected {expected!r}.")
+        rate = self.checked / self.seconds if self.seconds else 0
+        lines.append(f"Verified {self.checked} entities with {self.requests} requests in "
+                     f"{self.seconds:.2f} seconds ({rate:.0f} per second), "
+                     f"{len(self.mismatches)} mismatches.")
+        return '\n'.join(lines)
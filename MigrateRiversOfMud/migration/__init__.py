@@ -0,0 +1,12 @@
+from MigrateRiversOfMud.migration.AreaSummary import AreaSummary
+from MigrateRiversOfMud.migration.Journal import Journal
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+from MigrateRiversOfMud.migration.Delta import Delta
+from MigrateRiversOfMud.migration.ExistingIds import ExistingIds
+from MigrateRiversOfMud.migration.AreaWatcher import AreaWatcher
+from MigrateRiversOfMud.migration.LeaseManager import LeaseManager
+from MigrateRiversOfMud.migration.MigrationDaemon import MigrationDaemon
+from MigrateRiversOfMud.migration.MigrationClient import MigrationClient
+from MigrateRiversOfMud.migration.Sinks import HttpSink, NdjsonSink, stream_to_sink
+from MigrateRiversOfMud.migration.MigrationPipeline import MigrationPipeline
+from MigrateRiversOfMud.migration.Verifier import Verifier
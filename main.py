@@ -1,16 +1,109 @@
+import argparse
 import os
-from MigrateRiversOfMud import migrate_rom, build_presentation
+from MigrateRiversOfMud import migrate_rom, watch_rom, build_presentation, serve_daemon, submit_job, check_vnums, \
+    check_references, search_world, simulate_resets, route_rooms, check_exits, \
+    report_balance, benchmark_memory, verify_rom
 
 area_directory = "C:\\Users\\scott\\CLionProjects\\rom24-quickmud\\area"
 presentation = True
 
 
+def parse_args():
+    from MigrateRiversOfMud.entity import Orchestrator
+    parser = argparse.ArgumentParser(description="Migrate ROM area files into the game services.")
+    parser.add_argument('area_directory', nargs='?', default=area_directory)
+    parser.add_argument('--presentation', action=argparse.BooleanOptionalAction, default=presentation,
+                        help="render the area maps instead of migrating")
+    parser.add_argument('--resume', action='store_true', help="skip work journaled by an interrupted run")
+    parser.add_argument('--delta', action='store_true', help="only send entities changed since the last run")
+    parser.add_argument('--upsert', action='store_true', help="update entities the services already hold")
+    parser.add_argument('--watch', action='store_true', help="keep re-migrating area files as they change")
+    parser.add_argument('--shard', type=Orchestrator.parse_shard, help="only migrate shard i of N, given as i/N")
+    parser.add_argument('--work-dir',
+                        help="work directory shared by orchestrators claiming area files by lease; read by --verify")
+    parser.add_argument('--stream', action='store_true', help="parse and send entities one at a time")
+    parser.add_argument('--export-dir', help="stream entities into NDJSON files in this directory instead")
+    parser.add_argument('--max-pending', type=int, default=64, metavar='N',
+                        help="with --stream, hold at most this many parsed entities waiting to be sent")
+    parser.add_argument('--pipeline', action='store_true', help="parse and upload in separate pipelined stages")
+    parser.add_argument('--compress', choices=['gzip', 'zstd'],
+                        help="compress request bodies sent to the services, which must all decode Content-Encoding")
+    parser.add_argument('--compress-threshold', type=int, default=1024, metavar='BYTES',
+                        help="only compress request bodies of at least this many bytes")
+    parser.add_argument('--check-vnums', action='store_true', help="report overlapping and unclaimed VNUM ranges")
+    parser.add_argument('--check-references', action='store_true',
+                        help="report shop, special and reset VNUMs no area defines")
+    parser.add_argument('--search', metavar='QUERY',
+                        help='search room, mobile and item text; supports "phrases" and prefix* terms')
+    parser.add_argument('--simulate-resets', action='store_true', help="repop the world and summarise its population")
+    parser.add_argument('--check-exits', action='store_true',
+                        help="report disconnected rooms and one-way, mismatched and dangling exits")
+    parser.add_argument('--start-room', type=int, help="with --check-exits, also report rooms unreachable from here")
+    parser.add_argument('--balance', action='store_true',
+                        help="summarise mobile levels and damage, gold per area and shop prices")
+    parser.add_argument('--benchmark-memory', action='store_true',
+                        help="measure the memory parsed entities take with and without shared texts")
+    parser.add_argument('--route', nargs=2, type=int, metavar=('FROM', 'TO'),
+                        help="print the shortest walk between two room VNUMs")
+    parser.add_argument('--verify', action='store_true',
+                        help="read migrated entities back from the services and report mismatches")
+    parser.add_argument('--sample', type=float, metavar='N',
+                        help="with --verify, only check a fraction (below 1) or a number of entities per area")
+    parser.add_argument('--daemon', action='store_true', help="serve jobs from a warm worker pool")
+    parser.add_argument('--submit', choices=['migrate', 'validate', 'render', 'shutdown'],
+                        help="submit a job to a running daemon")
+    parser.add_argument('--port', type=int, help="daemon port")
+    args = parser.parse_args()
+    if any([args.resume, args.delta, args.upsert, args.watch, args.shard, args.work_dir, args.stream,
+            args.export_dir, args.pipeline, args.check_vnums, args.check_references, args.search,
+            args.simulate_resets, args.check_exits, args.balance, args.benchmark_memory,
+            args.route, args.verify, args.daemon, args.submit]):
+        args.presentation = False
+    conflict = Orchestrator.conflicting_options(resume=args.resume, delta=args.delta, upsert=args.upsert,
+                                                work_dir=args.work_dir, stream=args.stream or bool(args.export_dir),
+                                                pipeline=args.pipeline)
+    if conflict:
+        parser.error(conflict)
+    return args
+
+
 def main():
-    if presentation:
-        area_files = [os.path.join(area_directory, file) for file in os.listdir(area_directory) if file.endswith('.are')]
+    args = parse_args()
+    if args.presentation:
+        area_files = [os.path.join(args.area_directory, file) for file in os.listdir(args.area_directory)
+                      if file.endswith('.are')]
         build_presentation(area_files)
+    elif args.check_vnums:
+        check_vnums(args.area_directory)
+    elif args.check_references:
+        check_references(args.area_directory)
+    elif args.search:
+        search_world(args.area_directory, args.search)
+    elif args.simulate_resets:
+        simulate_resets(args.area_directory)
+    elif args.check_exits:
+        check_exits(args.area_directory, args.start_room)
+    elif args.balance:
+        report_balance(args.area_directory)
+    elif args.benchmark_memory:
+        benchmark_memory(args.area_directory)
+    elif args.route:
+        route_rooms(args.area_directory, *args.route)
+    elif args.verify:
+        verify_rom(args.area_directory, args.sample, args.work_dir)
+    elif args.daemon:
+        serve_daemon(args.port)
+    elif args.submit:
+        submit_job(args.submit, os.path.abspath(args.area_directory), port=args.port,
+                   **({'resume': args.resume, 'delta': not args.upsert, 'upsert': args.upsert}
+                      if args.submit == 'migrate' else {}))
+    elif args.watch:
+        watch_rom(args.area_directory)
     else:
-        migrate_rom("C:\\Users\\scott\\CLionProjects\\rom24-quickmud\\area")
+        migrate_rom(args.area_directory, resume=args.resume, delta=args.delta, upsert=args.upsert,
+                    shard=args.shard, work_dir=args.work_dir, stream=args.stream or bool(args.export_dir),
+                    export_dir=args.export_dir, pipeline=args.pipeline, compression=args.compress,
+                    compression_threshold=args.compress_threshold, max_pending=args.max_pending)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,122 @@
+import gzip
+import json
+import os
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+import pytest
+
+from MigrateRiversOfMud import http
+from MigrateRiversOfMud.analysis import RoomGraph
+
+AREA_DIR = os.path.join(os.path.dirname(__file__), 'areas')
+
+
+def room_graph(exits):
+    """
+    Builds a single-area RoomGraph from {vnum: {direction: target vnum}}.
+    """
+    rooms = [SimpleNamespace(vnum=vnum, exits={direction: {'to_room_vnum': target}
+                                               for direction, target in room_exits.items()})
+             for vnum, room_exits in exits.items()]
+    return RoomGraph([SimpleNamespace(key='test.are', rooms=rooms)])
+
+
+def payloads(area):
+    """
+    Returns the (entity type, key, payload) of everything an area sends, with the payloads as they go over the wire.
+    """
+    return [(entity_type, key, json.loads(json.dumps(area.payload(entity_type, entity), default=str)))
+            for entity_type, key, entity in area.keyed_entities()]
+
+
+class Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode('utf-8')
+        self.text = self.content.decode('utf-8')
+
+
+class FakeService:
+    """
+    Stands in for the requests module and every API service behind it, keeping the posted documents
+    of each collection in memory. Collections named in failing answer 500, and encodings missing from
+    accepted_encodings are declined with decline_status: 415, or 400 for a service that ignores
+    Content-Encoding and fails to parse the compressed body.
+    """
+
+    def __init__(self):
+        self.collections = {}
+        self.failing = set()
+        self.accepted_encodings = {'gzip', 'zstd'}
+        self.decline_status = 415
+        self.log = []
+
+    def documents(self, entity_type):
+        return self.collections.get(http.entity_paths[entity_type], {})
+
+    def _request(self, method, url, data, headers):
+        parts = urlsplit(url).path.strip('/').split('/')
+        encoding = (headers or {}).get('Content-Encoding')
+        if encoding and encoding not in self.accepted_encodings:
+            self.log.append((method, url, self.decline_status))
+            return Response(self.decline_status, {})
+        if encoding == 'gzip':
+            data = gzip.decompress(data)
+        body = json.loads(data) if data else {}
+        self.log.append((method, url, body))
+        collection = parts[2]
+        if collection in self.failing:
+            return Response(500, {'error': 'failing'})
+        documents = self.collections.setdefault(collection, {})
+        if method == 'post':
+            documents[body['id']] = body
+            return Response(201, body)
+        if method == 'put':
+            documents[parts[-1]] = body
+            return Response(200, body)
+        if method == 'delete':
+            for entity_id in body['ids']:
+                documents.pop(entity_id, None)
+            return Response(200, {})
+        if 'ids' in body:
+            rows = [documents[entity_id] for entity_id in body['ids'] if entity_id in documents]
+        else:
+            rows = [row for row in documents.values()
+                    if all(row.get(field) == value for field, value in body.items() if field not in ('page', 'size'))]
+        if 'size' in body:
+            rows = rows[body.get('page', 0) * body['size']:(body.get('page', 0) + 1) * body['size']]
+        return Response(200, rows)
+
+    def get(self, url, data=None, headers=None):
+        return self._request('get', url, data, headers)
+
+    def post(self, url, data=None, headers=None):
+        return self._request('post', url, data, headers)
+
+    def put(self, url, data=None, headers=None):
+        return self._request('put', url, data, headers)
+
+    def delete(self, url, data=None, headers=None):
+        return self._request('delete', url, data, headers)
+
+
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    """
+    Runs every test in its own directory, so logs, journals and snapshots never collide.
+    """
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def service(monkeypatch):
+    fake = FakeService()
+    monkeypatch.setattr(http, '_requests', lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def area_file():
+    return os.path.join(AREA_DIR, 'haven.are')
@@ -0,0 +1,85 @@
+import gzip
+import io
+import os
+import tarfile
+
+import pytest
+
+from MigrateRiversOfMud.entity import Orchestrator
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.AreaSource import AreaSource
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+from tests.conftest import AREA_DIR, payloads
+
+
+def read(name):
+    with open(os.path.join(AREA_DIR, name), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def packed_dir(tmp_path):
+    """
+    A directory holding haven.are gzip-compressed, and midgaard.are in a .tar.gz that also holds
+    a file that is not an area.
+    """
+    directory = tmp_path / 'packed'
+    directory.mkdir()
+    with gzip.open(directory / 'haven.are.gz', 'wb') as f:
+        f.write(read('haven.are'))
+    with tarfile.open(directory / 'world.tar.gz', 'w:gz') as tar:
+        tar.add(os.path.join(AREA_DIR, 'midgaard.are'), arcname='areas/midgaard.are')
+        readme = tarfile.TarInfo('areas/README')
+        tar.addfile(readme, io.BytesIO(b''))
+    return directory
+
+
+def same_ids_as(area_file, source):
+    """
+    Parses an area file and its packed source with the same ids, so their payloads can be compared.
+    """
+    plain = Area(area_file, insert=False)
+    known_ids = {}
+    for entity_type, key, entity in plain.keyed_entities():
+        known_ids.setdefault(entity_type, {})[key] = entity.id
+    return plain, Area(source, insert=False, known_ids=known_ids)
+
+
+def test_scan_finds_compressed_files_and_archive_members(packed_dir):
+    sources = list(AreaSource.scan(str(packed_dir)))
+    assert sources[0] == str(packed_dir / 'haven.are.gz')
+    assert [(source.name, source.origin) for source in sources[1:]] == [
+        ('midgaard.are', f"{packed_dir / 'world.tar.gz'}:areas/midgaard.are")]
+    assert AreaSource.archive_names(str(packed_dir / 'world.tar.gz')) == ['midgaard.are']
+
+
+def test_gzip_compressed_files_parse_like_plain_files(packed_dir):
+    plain, packed = same_ids_as(os.path.join(AREA_DIR, 'haven.are'), str(packed_dir / 'haven.are.gz'))
+    assert packed.key == 'haven.are'
+    assert payloads(packed) == payloads(plain)
+
+
+def test_archive_members_parse_like_plain_files(packed_dir, tmp_path):
+    archive = tmp_path / 'nested.tar'
+    with tarfile.open(archive, 'w') as tar:
+        tar.add(packed_dir / 'haven.are.gz', arcname='haven.are.gz')
+        tar.add(os.path.join(AREA_DIR, 'midgaard.are'), arcname='midgaard.are')
+    for source in AreaSource.from_archive(str(archive)):
+        plain, packed = same_ids_as(os.path.join(AREA_DIR, source.name), source)
+        assert packed.key == source.name
+        assert payloads(packed) == payloads(plain)
+
+
+def test_packed_areas_are_migrated_like_plain_files(packed_dir, service):
+    Orchestrator(str(packed_dir)).run()
+    # Archive members are migrated in the pool, so their inserts are checked through the snapshots.
+    assert sorted(Snapshot.area_files()) == ['haven.are', 'midgaard.are']
+    for name in ('haven.are', 'midgaard.are'):
+        snapshot = Snapshot(name)
+        plain = Area(os.path.join(AREA_DIR, name), insert=False, known_ids=snapshot.ids())
+        assert Snapshot.from_area(plain).entities == snapshot.entities
+
+
+def test_an_archive_can_be_the_area_directory(packed_dir, service):
+    Orchestrator(str(packed_dir / 'world.tar.gz')).run()
+    assert Snapshot.area_files() == ['midgaard.are']
@@ -0,0 +1,43 @@
+import os
+import shutil
+
+from MigrateRiversOfMud.migration.AreaWatcher import AreaWatcher
+
+
+def watcher_over(area_file, tmp_path):
+    directory = tmp_path / 'area'
+    directory.mkdir()
+    shutil.copy(area_file, directory)
+    return AreaWatcher(str(directory), debounce=0), str(directory / 'haven.are')
+
+
+def unreachable(url, data=None, headers=None):
+    raise ConnectionError("service unreachable")
+
+
+def test_a_failing_sync_is_retried_on_the_next_poll(service, area_file, tmp_path, monkeypatch):
+    watcher, watched = watcher_over(area_file, tmp_path)
+    with monkeypatch.context() as patch:
+        patch.setattr(service, 'post', unreachable)
+        watcher.poll()
+    assert watched in watcher._pending
+    assert not service.documents('room')
+
+    watcher.poll()
+    assert watched not in watcher._pending
+    assert len(service.documents('room')) == 3
+
+
+def test_a_failing_removal_is_retried_on_the_next_poll(service, area_file, tmp_path, monkeypatch):
+    watcher, watched = watcher_over(area_file, tmp_path)
+    watcher.poll()
+    os.remove(watched)
+    with monkeypatch.context() as patch:
+        patch.setattr(service, 'delete', unreachable)
+        watcher.poll()
+    assert watched in watcher._stats
+    assert service.documents('room')
+
+    watcher.poll()
+    assert watched not in watcher._stats
+    assert not service.documents('room')
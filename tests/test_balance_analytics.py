@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+from MigrateRiversOfMud.analysis import BalanceAnalytics
+from MigrateRiversOfMud.entity.Item import Item, ItemType
+from MigrateRiversOfMud.entity.Shop import Shop
+
+BARREL = """#3000
+barrel beer~
+a barrel of beer~
+A beer barrel has been left here.~
+~
+drink 0 A
+300 300 'beer' 0 0
+5 160 80 P
+""".splitlines()
+
+SWORD = """#3001
+sword long~
+a long sword~
+A long sword lies here.~
+~
+weapon 0 AN
+sword 2 8 'slash' 0
+20 120 600 P
+""".splitlines()
+
+
+def world():
+    items = [Item('area', BARREL), Item('area', SWORD)]
+    shop = Shop('area', "3000  17  5  0  0  0  150  50  0 23  * the barkeep")
+    return BalanceAnalytics([SimpleNamespace(key='midgaard.are', mobiles=[], objects=items, shops=[shop])])
+
+
+def test_items_are_leveled_and_priced_from_the_rom_columns():
+    analytics = world()
+    assert list(analytics.items['level']) == [5, 20]
+    assert list(analytics.items['weight']) == [160, 120]
+    assert list(analytics.items['cost']) == [80, 600]
+    assert list(analytics.items['item_type']) == [ItemType.DRINK_CONTAINER.value, ItemType.WEAPON.value]
+
+
+def test_shops_sell_at_their_markup_over_cost():
+    prices = world().shop_prices()
+    assert list(prices['items']) == [2]
+    assert list(prices['min_price']) == [120]
+    assert list(prices['max_price']) == [900]
+    assert list(prices['mean_price']) == [510.0]
+    assert list(prices['mean_margin']) == [340.0]
+
+
+def test_drink_is_not_an_alias_of_another_item_type():
+    assert 'DRINK' not in ItemType.__members__
+    assert len(ItemType.__members__) == len(ItemType)
+
+
+def test_item_payloads_name_the_rom_columns():
+    payload = Item('area', SWORD).to_dict()
+    assert (payload['level'], payload['weight'], payload['cost']) == ('20', '120', '600')
+    assert 'value' not in payload
@@ -0,0 +1,68 @@
+import gzip
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from MigrateRiversOfMud import http
+
+ROOM = {'id': 'a' * 24, 'name': 'The Temple Of Haven', 'description': 'You are in the temple. ' * 100}
+BODY = json.dumps(ROOM).encode('utf-8')
+
+
+@pytest.fixture(autouse=True)
+def compression(monkeypatch):
+    """
+    Compresses with gzip from a clean slate, restoring the module-wide settings and counters afterwards.
+    """
+    monkeypatch.setattr(http, 'compression', dict(http.compression))
+    monkeypatch.setattr(http, 'compression_stats', dict.fromkeys(http.compression_stats, 0))
+    monkeypatch.setattr(http, '_declined_encodings', {})
+    http.configure_compression('gzip', threshold=1024)
+
+
+def sent(service):
+    return [status for _, _, status in service.log]
+
+
+def test_large_bodies_are_sent_compressed(service):
+    assert http.post(ROOM, http.entity_url('room'))
+    assert service.documents('room') == {ROOM['id']: ROOM}
+    assert http.compression_stats == {'requests': 1, 'compressed': 1, 'declined': 0, 'body_bytes': len(BODY),
+                                      'sent_bytes': len(gzip.compress(BODY, compresslevel=6))}
+
+
+def test_small_bodies_are_sent_as_they_are(service):
+    small = {'id': 'b' * 24, 'name': 'A closet'}
+    assert http.post(small, http.entity_url('room'))
+    size = len(json.dumps(small).encode('utf-8'))
+    assert http.compression_stats == {'requests': 1, 'compressed': 0, 'declined': 0, 'body_bytes': size,
+                                      'sent_bytes': size}
+
+
+def test_a_415_falls_back_to_plain_bodies_and_is_remembered(service):
+    service.accepted_encodings = set()
+    assert http.post(ROOM, http.entity_url('room'))
+    assert http.post(dict(ROOM, id='c' * 24), http.entity_url('room'))
+    assert sent(service)[0] == 415 and 415 not in sent(service)[1:]
+    assert len(service.documents('room')) == 2
+    assert http.compression_stats == {'requests': 2, 'compressed': 0, 'declined': 1, 'body_bytes': 2 * len(BODY),
+                                      'sent_bytes': len(gzip.compress(BODY, compresslevel=6)) + 2 * len(BODY)}
+
+
+def test_a_400_to_a_compressed_body_falls_back_to_plain_bodies(service):
+    service.accepted_encodings = set()
+    service.decline_status = 400
+    assert http.post(ROOM, http.entity_url('room'))
+    assert http.post(dict(ROOM, id='c' * 24), http.entity_url('room'))
+    assert sent(service)[0] == 400 and 400 not in sent(service)[1:]
+    assert len(service.documents('room')) == 2
+    assert http.compression_stats['declined'] == 1
+
+
+def test_a_body_failing_uncompressed_too_does_not_disable_compression(service):
+    service.failing.add('room')
+    service.accepted_encodings = set()
+    service.decline_status = 400
+    assert http.post(ROOM, http.entity_url('room')) is None
+    assert not http._declined_encodings[urlsplit(http.entity_url('room')).netloc]
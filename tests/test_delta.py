@@ -0,0 +1,62 @@
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.migration.Delta import Delta
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+
+
+def edited(area_file, tmp_path, old, new):
+    """
+    Copies an area file into tmp_path with one piece of text replaced.
+    """
+    with open(area_file) as f:
+        text = f.read()
+    assert old in text
+    path = tmp_path / 'haven.are'
+    path.write_text(text.replace(old, new, 1))
+    return str(path)
+
+
+def sync(area_file):
+    snapshot = Snapshot('haven.are')
+    area = Area(area_file, insert=False, known_ids=snapshot.ids())
+    delta = Delta(snapshot, area)
+    return delta, delta.apply()
+
+
+def test_first_sync_adds_everything_and_the_next_is_empty(service, area_file):
+    delta, failures = sync(area_file)
+    assert failures == 0
+    assert len(delta.added) == len(list(Area(area_file, insert=False).keyed_entities()))
+
+    delta, _ = sync(area_file)
+    assert delta.is_empty()
+
+
+def test_changed_and_removed_entities(service, area_file, tmp_path):
+    sync(area_file)
+    mobile_ids = set(service.documents('mobile'))
+    changed = edited(area_file, tmp_path, 'The Altar~', 'The Golden Altar~')
+    delta, failures = sync(changed)
+    assert failures == 0
+    assert [(entity_type, key) for entity_type, key, _, _ in delta.changed] == [('room', '4002')]
+    assert not delta.added and not delta.removed
+
+    removed = edited(area_file, tmp_path, '#4001\nbaker~', '#4009\nbaker~')
+    delta, _ = sync(removed)
+    assert ('mobile', '4001') in [(entity_type, key) for entity_type, key, _ in delta.removed]
+    assert len(set(service.documents('mobile')) & mobile_ids) == 1
+
+
+def test_inserting_a_reset_leaves_the_others_unchanged(service, area_file, tmp_path):
+    sync(area_file)
+    inserted = edited(area_file, tmp_path, 'E 1 4001 1 16 * sword\n', 'E 1 4001 1 16 * sword\nG 1 4001 1\n')
+    delta, _ = sync(inserted)
+    assert [(entity_type, key) for entity_type, key, _, _ in delta.added] == [('reset', 'G 1 4001 1')]
+    assert not delta.changed and not delta.removed
+
+
+def test_identical_resets_are_keyed_by_occurrence(area_file, tmp_path):
+    duplicated = edited(area_file, tmp_path, 'G 1 4000 1\n', 'G 1 4000 1\nG 1 4000 1\n')
+    keys = [key for _, key, _ in Area(duplicated, insert=False).keyed_entities('reset')]
+    assert 'G 1 4000 1' in keys and 'G 1 4000 1 #2' in keys
+    assert len(keys) == len(set(keys))
+
@@ -0,0 +1,47 @@
+import multiprocessing
+
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.migration.ExistingIds import ExistingIds
+
+
+def counts(service):
+    return {collection: len(documents) for collection, documents in service.collections.items()}
+
+
+def test_upsert_updates_what_the_services_already_hold(service, area_file):
+    Area(area_file, existing_ids=ExistingIds())
+    stored = counts(service)
+    service.log.clear()
+
+    area = Area(area_file, existing_ids=ExistingIds())
+    assert area.failed_inserts == 0
+    assert {method for method, _, _ in service.log} == {'get', 'put'}
+    assert counts(service) == stored
+
+
+def test_resets_are_matched_by_content_whatever_order_the_service_returns(service, area_file):
+    Area(area_file, existing_ids=ExistingIds())
+    resets = service.documents('reset')
+    reset_ids = set(resets)
+    stored_ids = {(row['resetType'], tuple(row['args'])): row['id'] for row in resets.values() if row['resetType']}
+    reordered = dict(reversed(list(resets.items())))
+    resets.clear()
+    resets.update(reordered)
+
+    area = Area(area_file, existing_ids=ExistingIds())
+    assert {(reset.reset_type, tuple(reset.args)): reset.id for reset in area.resets if reset.reset_type} == stored_ids
+    assert set(service.documents('reset')) == reset_ids
+
+
+def record(existing_ids):
+    existing_ids.record('haven.are', 'room', '4001', 'a' * 24)
+
+
+def test_shared_cache_sees_records_made_in_other_processes():
+    with multiprocessing.Manager() as manager:
+        existing_ids = ExistingIds()
+        existing_ids.share(manager.dict())
+        worker = multiprocessing.Process(target=record, args=(existing_ids,))
+        worker.start()
+        worker.join()
+        assert existing_ids.contains('haven.are', 'room', '4001', 'a' * 24)
@@ -0,0 +1,21 @@
+from MigrateRiversOfMud.analysis import ExitIntegrity, Router
+from tests.conftest import room_graph
+
+NORTH, SOUTH = 0, 2
+
+
+def test_exits_in_unknown_directions_are_reported_not_graphed():
+    graph = room_graph({
+        1: {NORTH: 2, 7: 2, 9: 3},
+        2: {SOUTH: 1},
+        3: {},
+    })
+    assert graph.invalid == [(1, 7, 2), (1, 9, 3)]
+    assert list(graph.neighbours(graph.rows[1])) == [graph.rows[2]]
+    assert Router(graph).directions(1, 2) == ['north']
+    assert Router(graph).shortest_path(1, 3) is None
+
+    report = ExitIntegrity(graph).report(start_vnum=1)
+    assert "test.are room 1 has an exit in unknown direction 7 to room 2" in report
+    assert "test.are room 1 has an exit in unknown direction 9 to room 3" in report
+    assert report.endswith("0 dangling exits, 2 invalid exits.")
@@ -0,0 +1,48 @@
+import pytest
+
+from MigrateRiversOfMud.entity.FlagCodec import FlagCodec
+
+
+@pytest.mark.parametrize('flags, value', [
+    ('0', 0),
+    ('A', 1),
+    ('AG', 65),
+    ('AN', 8193),
+    ('Z', 1 << 25),
+    ('a', 1 << 26),
+    ('e', 1 << 30),
+    ('Aa', 1 | 1 << 26),
+    ('GA', 65),
+    ('AA', 1),
+    ('A|B', 3),
+    ('8|C', 12),
+    ('1024', 1024),
+    ('-1', -1),
+    (' A-G ', 65),
+    (65, 65),
+])
+def test_decode(flags, value):
+    assert FlagCodec.decode(flags) == value
+
+
+@pytest.mark.parametrize('flags', ['A?', 'AG!', 'A|#'])
+def test_unknown_characters_are_rejected(flags):
+    with pytest.raises(ValueError):
+        FlagCodec.decode(flags)
+
+
+@pytest.mark.parametrize('letters', ['0', 'A', 'AG', 'AN', 'Z', 'a', 'abcde', 'ACZae'])
+def test_encode_round_trips(letters):
+    assert FlagCodec.encode(FlagCodec.decode(letters)) == letters
+
+
+def test_every_bit_round_trips():
+    for bit in range(len(FlagCodec.LETTERS)):
+        assert FlagCodec.decode(FlagCodec.encode(1 << bit)) == 1 << bit
+
+
+def test_columns_decode_and_encode_in_order():
+    column = ['AG', '0', 'a|B', 'AG', '12']
+    values = FlagCodec.decode_all(column)
+    assert values == [65, 0, 2 | 1 << 26, 65, 12]
+    assert FlagCodec.encode_all(values) == ['AG', '0', 'Ba', 'AG', 'CD']
@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Loading any of these for the migration path alone would cost more than the migration's own imports.
+HEAVY_MODULES = ('numpy', 'matplotlib', 'requests')
+LOADED = """
+import json, sys
+import {module}
+print(json.dumps([name for name in {heavy!r} if name in sys.modules]))
+"""
+
+
+def cold_import(module):
+    """
+    Imports a module in a fresh interpreter and returns the heavy modules it pulled in.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', LOADED.format(module=module, heavy=HEAVY_MODULES)],
+                            cwd=root, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize('module', ['MigrateRiversOfMud', 'MigrateRiversOfMud.entity'])
+def test_the_migration_path_imports_no_heavy_stacks(module):
+    assert cold_import(module) == []
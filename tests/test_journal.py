@@ -0,0 +1,60 @@
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.migration.Journal import Journal
+
+
+def test_journal_replays_assignments_acks_and_completion():
+    journal = Journal('haven.are')
+    journal.assign('room', '4001', 'a' * 24)
+    journal.acknowledge('room', '4001', 'a' * 24)
+    journal.complete()
+
+    replayed = Journal('haven.are')
+    assert replayed.assigned_id('room', '4001') == 'a' * 24
+    assert replayed.is_acknowledged('room', '4001')
+    assert replayed.completed
+
+
+def test_journal_ignores_a_torn_trailing_record():
+    journal = Journal('haven.are')
+    journal.acknowledge('room', '4001', 'a' * 24)
+    journal.flush()
+    with open(journal.path, 'a') as f:
+        f.write('{"op": "ack", "type": "ro')
+
+    replayed = Journal('haven.are')
+    assert replayed.is_acknowledged('room', '4001')
+    assert not replayed.completed
+
+
+def test_journal_starts_over_without_resume():
+    journal = Journal('haven.are')
+    journal.acknowledge('room', '4001', 'a' * 24)
+    journal.flush()
+
+    assert not Journal('haven.are', resume=False).acknowledged
+
+
+def test_failed_inserts_still_flush_acknowledged_inserts(service, area_file):
+    service.failing.add('mobile')
+    area = Area(area_file, journal=Journal('haven.are'))
+    assert area.failed_inserts == 2
+
+    replayed = Journal('haven.are')
+    assert not replayed.completed
+    assert replayed.is_acknowledged('room', '4001')
+    assert not replayed.is_acknowledged('mobile', '4000')
+
+
+def test_resume_only_posts_what_was_not_acknowledged(service, area_file):
+    service.failing.add('mobile')
+    first = Area(area_file, journal=Journal('haven.are'))
+    service.failing.clear()
+    service.log.clear()
+
+    second = Area(area_file, journal=Journal('haven.are'))
+    posted = [url for method, url, _ in service.log if method == 'post']
+    assert posted and all(url.endswith('/mobile') for url in posted)
+    assert second.failed_inserts == 0
+    assert Journal('haven.are').completed
+    assert {room.id for room in second.rooms} == {room.id for room in first.rooms}
+
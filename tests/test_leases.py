@@ -0,0 +1,45 @@
+import os
+import shutil
+
+import pytest
+
+from MigrateRiversOfMud.entity import Orchestrator
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.migration.Journal import Journal
+from MigrateRiversOfMud.migration.LeaseManager import LeaseLost, LeaseManager
+
+
+def test_a_reaped_lease_is_marked_lost_without_stopping_the_heartbeat(tmp_path):
+    leases = LeaseManager(str(tmp_path / 'work'))
+    assert leases.claim('haven.are')
+    os.remove(leases._lease_path('haven.are'))
+
+    leases.renew()
+    assert leases.is_lost('haven.are')
+    assert not leases.held
+
+
+def test_inserts_stop_once_the_lease_is_lost(service, area_file, tmp_path):
+    leases = LeaseManager(str(tmp_path / 'work'))
+    leases.claim('haven.are')
+    lease = leases.lease('haven.are')
+    lease.check_interval = 0
+    with open(lease.path, 'w') as f:
+        f.write('another-worker')
+
+    with pytest.raises(LeaseLost):
+        Area(area_file, journal=Journal('haven.are'), lease=lease)
+    assert not service.log
+
+
+@pytest.mark.parametrize('failing, done', [(set(), True), ({'mobile'}, False)])
+def test_leased_runs_only_complete_areas_without_failures(service, area_file, tmp_path, failing, done):
+    directory = tmp_path / 'area'
+    directory.mkdir()
+    shutil.copy(area_file, directory)
+    service.failing.update(failing)
+
+    Orchestrator(str(directory), work_dir=str(tmp_path / 'work')).run()
+    leases = LeaseManager(str(tmp_path / 'work'))
+    assert leases.is_done('haven.are') == done
+    assert not os.listdir(leases.lease_dir)
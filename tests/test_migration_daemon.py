@@ -0,0 +1,37 @@
+import shutil
+
+from MigrateRiversOfMud.migration.MigrationDaemon import MigrationDaemon
+
+
+class InlineResult:
+    def __init__(self, function, args):
+        self.value = function(*args)
+
+    def get(self):
+        return self.value
+
+
+class InlinePool:
+    def apply_async(self, function, args):
+        return InlineResult(function, args)
+
+
+def submit(daemon, path):
+    events = []
+    daemon.handle({'command': 'migrate', 'path': path}, events.append)
+    return [event for event in events if event['event'] == 'progress']
+
+
+def test_partly_migrated_files_are_retried_on_the_next_submit(service, area_file, tmp_path):
+    directory = tmp_path / 'area'
+    directory.mkdir()
+    shutil.copy(area_file, directory)
+    daemon = MigrationDaemon()
+    daemon.pool = InlinePool()
+
+    service.failing.add('mobile')
+    assert [event['cached'] for event in submit(daemon, str(directory))] == [False]
+    service.failing.clear()
+    assert [event['cached'] for event in submit(daemon, str(directory))] == [False]
+    assert [event['cached'] for event in submit(daemon, str(directory))] == [True]
+    assert len(service.documents('mobile')) == 2
@@ -0,0 +1,38 @@
+import glob
+import multiprocessing
+import os
+from collections import Counter
+
+import pytest
+
+from MigrateRiversOfMud import http
+from MigrateRiversOfMud.entity import Orchestrator
+from MigrateRiversOfMud.entity.Area import Area
+from tests.conftest import AREA_DIR, payloads
+
+AREA_FILES = sorted(glob.glob(os.path.join(AREA_DIR, '*.are')))
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with multiprocessing.Pool(2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize('area_file', AREA_FILES, ids=os.path.basename)
+def test_chunked_parse_equals_serial_parse(area_file, pool):
+    serial = Area(area_file, insert=False)
+    known_ids = {}
+    for entity_type, key, entity in serial.keyed_entities():
+        known_ids.setdefault(entity_type, {})[key] = entity.id
+
+    chunked = Area(area_file, insert=False, known_ids=known_ids, pool=pool, chunk_size=64)
+    assert len(chunked.index.chunks('ROOMS', 64)) > 1
+    assert payloads(chunked) == payloads(serial)
+
+
+def test_large_files_are_migrated_in_chunks(service):
+    Orchestrator(AREA_DIR, large_file_size=1).run()
+    expected = Counter(http.entity_paths[entity_type] for area_file in AREA_FILES
+                       for entity_type, _, _ in Area(area_file, insert=False).keyed_entities())
+    assert {collection: len(documents) for collection, documents in service.collections.items()} == expected
@@ -0,0 +1,106 @@
+import glob
+import math
+import os
+import threading
+import time
+
+import pytest
+
+from MigrateRiversOfMud.entity import Orchestrator
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.migration.MigrationPipeline import MigrationPipeline
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+from tests.conftest import AREA_DIR
+
+AREA_FILES = sorted(glob.glob(os.path.join(AREA_DIR, '*.are')))
+
+
+def entity_count(area_file):
+    return sum(1 for _ in Area(area_file, insert=False).keyed_entities())
+
+
+def run_within(pipeline, timeout=30):
+    """
+    Runs the pipeline in a thread, so a stage that never frees its slot fails the test instead of hanging it.
+    """
+    runner = threading.Thread(target=pipeline.run, daemon=True)
+    runner.start()
+    runner.join(timeout)
+    assert not runner.is_alive(), pipeline.stats()
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize('options', [{'resume': True}, {'delta': True}, {'upsert': True}, {'work_dir': 'work'},
+                                     {'stream': True}])
+def test_the_pipeline_rejects_options_it_cannot_honour(options):
+    with pytest.raises(ValueError):
+        Orchestrator(AREA_DIR, pipeline=True, **options)
+
+
+def test_the_pipeline_uploads_every_entity_and_snapshots_each_file(service):
+    pipeline = MigrationPipeline(AREA_FILES, processes=2, uploaders=3, batch_size=4, report_interval=0.01)
+    run_within(pipeline)
+    total = sum(entity_count(area_file) for area_file in AREA_FILES)
+    assert pipeline.stats() == {'parsing': 0, 'parsed': 0, 'queuedBatches': 0, 'uploaded': total, 'failed': 0}
+    assert sum(len(documents) for documents in service.collections.values()) == total
+    assert sorted(Snapshot.area_files()) == ['haven.are', 'midgaard.are']
+    for name in ('haven.are', 'midgaard.are'):
+        for entity_type, entries in Snapshot(name).entities.items():
+            assert all(entry['id'] in service.documents(entity_type) for entry in entries.values())
+
+
+def test_files_with_failed_uploads_are_not_snapshotted(service):
+    service.failing.add('room')
+    rooms = sum(len(Area(area_file, insert=False).rooms) for area_file in AREA_FILES)
+    pipeline = MigrationPipeline(AREA_FILES, processes=2, uploaders=2, batch_size=4)
+    run_within(pipeline)
+    stats = pipeline.stats()
+    assert stats['failed'] == rooms and stats['parsed'] == 0
+    assert stats['uploaded'] == sum(entity_count(area_file) for area_file in AREA_FILES) - rooms
+    assert Snapshot.area_files() == []
+
+
+def test_a_file_failing_to_parse_frees_its_slot(service, tmp_path):
+    # With a single parse slot, the next file is only submitted once the failed one gave its slot back.
+    pipeline = MigrationPipeline([str(tmp_path / 'missing.are'), AREA_FILES[0]], processes=1, uploaders=1,
+                                 max_parsed=1)
+    run_within(pipeline)
+    assert pipeline.stats()['parsing'] == 0
+    assert pipeline.stats()['uploaded'] == entity_count(AREA_FILES[0])
+    assert Snapshot.area_files() == ['haven.are']
+
+
+def test_stats_report_the_depth_of_each_stage(service):
+    gate = threading.Event()
+    send = service.post
+
+    def held_post(url, data=None, headers=None):
+        gate.wait()
+        return send(url, data, headers)
+
+    service.post = held_post
+    batch_size = 4
+    # Counted before the pool forks, as a parse on another thread could hold a lock the workers inherit.
+    counts = [entity_count(area_file) for area_file in AREA_FILES]
+    pipeline = MigrationPipeline(AREA_FILES, processes=1, uploaders=1, batch_size=batch_size, max_parsed=1)
+    runner = threading.Thread(target=pipeline.run, daemon=True)
+    runner.start()
+    try:
+        # The uploader holds the first batch of the first file, whose other batches stay queued,
+        # and the second file waits for the parse slot the first one holds.
+        batches = math.ceil(counts[0] / batch_size)
+        expected = {'parsing': 0, 'parsed': 1, 'queuedBatches': batches - 1, 'uploaded': 0, 'failed': 0}
+        wait_for(lambda: pipeline.stats() == expected)
+        time.sleep(0.1)
+        assert pipeline.stats() == expected
+    finally:
+        gate.set()
+    runner.join(30)
+    assert not runner.is_alive()
+    assert pipeline.stats()['uploaded'] == sum(counts)
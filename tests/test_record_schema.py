@@ -0,0 +1,99 @@
+"""
+The fields the index-walking Room, Mobile and Item parsers produced for the same records, which the
+schema-driven parsers must keep producing. Multi-line item texts are one intended difference; the
+other is the item level, weight and cost line, which the old parsers read into value, weight and level.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from MigrateRiversOfMud.entity.Item import Item
+from MigrateRiversOfMud.entity.Mobile import Mobile
+from MigrateRiversOfMud.entity.Room import Room
+
+NO_EXIT = {'description': '', 'keyword': '', 'exit_flags': 0, 'key': -1, 'to_room_vnum': -1}
+
+ROOMS = [
+    ("#3001\nThe Temple Of Midgaard~\nYou are in the southern end of the temple hall.\nIt is very big.\n~\n"
+     "0 CDS 0\nD0\nYou see the temple.\n~\n~\n0 -1 3002\nD2\n~\n~\n1 3000 3003\nE\naltar~\nA big altar.\n~\nS",
+     {'vnum': 3001, 'name': 'The Temple Of Midgaard',
+      'description': 'You are in the southern end of the temple hall.\nIt is very big.',
+      'tele_delay': 0, 'room_flags': 262156, 'sector_type': 0,
+      'extra_descr': [{'keyword': 'altar', 'description': 'A big altar.'}],
+      'exits': {0: dict(NO_EXIT, description='You see the temple.', to_room_vnum=3002),
+                2: dict(NO_EXIT, exit_flags=1, key=3000, to_room_vnum=3003)}}),
+    ("#3003\nMarket Square~\nMarket.\n~\n0 0 city\nD0\n~\n~\n0 -1 3001\nS",
+     {'vnum': 3003, 'name': 'Market Square', 'description': 'Market.', 'tele_delay': 0, 'room_flags': 0,
+      'sector_type': 1, 'extra_descr': [], 'exits': {0: dict(NO_EXIT, to_room_vnum=3001)}}),
+    ("#11\nHall~\nA hall.\nSecond line.\n~\n0 AB 3\nD4\n~\n~\n0 -1 10\nE\nsign plaque~\nThe sign reads.\n~\nS",
+     {'vnum': 11, 'name': 'Hall', 'description': 'A hall.\nSecond line.', 'tele_delay': 0, 'room_flags': 3,
+      'sector_type': 3, 'extra_descr': [{'keyword': 'sign plaque', 'description': 'The sign reads.'}],
+      'exits': {4: dict(NO_EXIT, to_room_vnum=10)}}),
+    ("#10\nBroken~\nBad flags.\n~\nx y\nD1\nA door.\n~\ndoor~\n1 5 11\nD3\n~\n~\nbad\nS",
+     {'vnum': 10, 'name': 'Broken', 'description': 'Bad flags.', 'tele_delay': 0, 'room_flags': 0,
+      'sector_type': 0, 'extra_descr': [],
+      'exits': {1: {'description': 'A door.', 'keyword': 'door', 'exit_flags': 1, 'key': 5, 'to_room_vnum': 11},
+                3: NO_EXIT}}),
+]
+
+MOBILES = [
+    ("#3000\nwizard~\nthe wizard~\nA wizard walks around behind the counter, talking to himself.\n~\n"
+     "The wizard looks old and senile.\n~\n67 0 900\n23 0 2d8+20 human 1 500 8 8 0",
+     {'vnum': '3000', 'name': 'wizard', 'short_descr': 'the wizard',
+      'long_descr': 'A wizard walks around behind the counter, talking to himself.',
+      'description': 'The wizard looks old and senile.', 'act_flags': 67, 'affect_flags': 0, 'alignment': 900,
+      'level': 23, 'hitroll': 0, 'damage': '2d8+20', 'race': 'human', 'sex': 1, 'gold': 500,
+      'start_pos': 8, 'default_pos': 8, 'flags': 0}),
+    ("#20\nguard~\nthe guard~\nA guard stands here.\n~\nHe looks tough.\n~\nAB C -500 S\n"
+     "12 2 3d4+5 elf 2 75 8 8 0",
+     {'vnum': '20', 'name': 'guard', 'short_descr': 'the guard', 'long_descr': 'A guard stands here.',
+      'description': 'He looks tough.', 'act_flags': 3, 'affect_flags': 4, 'alignment': -500, 'level': 12,
+      'hitroll': 2, 'damage': '3d4+5', 'race': 'elf', 'sex': 2, 'gold': 75, 'start_pos': 8, 'default_pos': 8,
+      'flags': 0}),
+    ("#21\nghost~\nthe ghost~\nA ghost.\n~\n~\nbogus",
+     {'vnum': '21', 'name': 'ghost', 'short_descr': 'the ghost', 'long_descr': 'A ghost.', 'description': '',
+      'act_flags': 0, 'affect_flags': 0, 'alignment': 0, 'level': 0, 'hitroll': 0, 'damage': '0d0+0',
+      'race': 'unknown', 'sex': 0, 'gold': 0, 'start_pos': 0, 'default_pos': 0, 'flags': 0}),
+]
+
+ITEMS = [
+    ("#3000\nbarrel beer~\na barrel of beer~\nA beer barrel has been left here.~\n~\ndrink_container 0 A\n"
+     "10 10 1\nE\nbarrel~\nA big barrel.~",
+     {'vnum': '3000', 'name': 'barrel beer', 'short_descr': 'a barrel of beer',
+      'long_descr': 'A beer barrel has been left here.', 'description': '', 'item_type': 'drink_container',
+      'extra_flags': 0, 'wear_flags': 1, 'level': '10', 'weight': '10', 'cost': '1', 'affect_data': [],
+      'extra_descr': [{'keyword': 'barrel', 'description': 'A big barrel.'}]}),
+    ("#3001\nsword long~\na long sword~\nA long sword lies here.~\n~\nweapon AG AN\n20 12 5\nA\n18 2",
+     {'vnum': '3001', 'name': 'sword long', 'short_descr': 'a long sword', 'long_descr': 'A long sword lies here.',
+      'description': '', 'item_type': 'weapon', 'extra_flags': 65, 'wear_flags': 8193, 'level': '20',
+      'weight': '12', 'cost': '5', 'affect_data': ['A'], 'extra_descr': []}),
+    ("#31\nrock~\na rock~\nA rock.~\n~\nzzz\n",
+     {'vnum': '31', 'name': 'rock', 'short_descr': 'a rock', 'long_descr': 'A rock.', 'description': '',
+      'item_type': 'unknown', 'extra_flags': 0, 'wear_flags': 0, 'level': None, 'weight': None, 'cost': None,
+      'affect_data': [], 'extra_descr': []}),
+    # The old parser read only the first line of a tilde string here and lost the type line
+    ("#30\nbook~\na book~\nA book\nlies here.~\n~\ntreasure 0 0\n1 2 3\n",
+     {'vnum': '30', 'name': 'book', 'short_descr': 'a book', 'long_descr': 'A book\nlies here.', 'description': '',
+      'item_type': 'treasure', 'extra_flags': 0, 'wear_flags': 0, 'level': '1', 'weight': '2', 'cost': '3',
+      'affect_data': [], 'extra_descr': []}),
+]
+
+
+def fields(entity, expected):
+    return {field: getattr(entity, field) for field in expected}
+
+
+@pytest.mark.parametrize('record, expected', ROOMS)
+def test_rooms_parse_as_before(record, expected):
+    room = Room(SimpleNamespace(room_id_mapping={}), record.split('\n'), None)
+    assert fields(room, expected) == expected
+
+
+@pytest.mark.parametrize('record, expected', MOBILES)
+def test_mobiles_parse_as_before(record, expected):
+    assert fields(Mobile('area', record.split('\n')), expected) == expected
+
+
+@pytest.mark.parametrize('record, expected', ITEMS)
+def test_items_parse_as_before(record, expected):
+    assert fields(Item('area', record.split('\n')), expected) == expected
@@ -0,0 +1,64 @@
+import pytest
+
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.ReferenceJoin import ReferenceJoin
+from MigrateRiversOfMud.entity.Resets import Reset
+
+
+@pytest.fixture
+def haven(area_file):
+    return Area(area_file, insert=False)
+
+
+@pytest.fixture
+def join(haven):
+    join = ReferenceJoin()
+    join.add_area(haven)
+    return join
+
+
+def ids_of(haven):
+    mobiles = {int(mobile.vnum): mobile.id for mobile in haven.mobiles}
+    items = {int(item.vnum): item.id for item in haven.objects}
+    return {'mobile': mobiles, 'item': items, 'room': haven.room_id_mapping}
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('M 0 4000 1 4001 1', [None, ('mobile', 4000), None, ('room', 4001), None]),
+    ('O 0 4001 1 4002', [None, ('item', 4001), None, ('room', 4002)]),
+    ('P 0 4001 1 4000 1', [None, ('item', 4001), None, ('item', 4000), None]),
+    ('G 1 4000 1', [None, ('item', 4000), None]),
+    ('E 1 4001 1 16', [None, ('item', 4001), None, None]),
+    ('D 0 4001 2 1', [None, ('room', 4001), None, None]),
+    ('R 0 4003 4', [None, ('room', 4003), None]),
+])
+def test_reset_arg_ids_line_up_with_the_referencing_arguments(haven, join, line, expected):
+    reset = Reset(haven.id, line)
+    join.attach(haven.key, 'reset', reset.content_key, reset)
+    ids = ids_of(haven)
+    assert reset.to_dict()['argIds'] == [ids[reference[0]][reference[1]] if reference else None
+                                         for reference in expected]
+    assert join.unresolved == []
+
+
+def test_references_to_unknown_vnums_are_recorded(haven, join):
+    reset = Reset(haven.id, 'P 0 3001 1 4000 1')
+    join.attach(haven.key, 'reset', reset.content_key, reset)
+    assert reset.arg_ids == [None, None, None, ids_of(haven)['item'][4000], None]
+    assert join.unresolved == [(haven.key, 'reset', reset.content_key, 'item', 3001)]
+    assert join.report().endswith("1 unresolved references.")
+
+
+def test_area_payloads_carry_the_resolved_ids(haven):
+    ids = ids_of(haven)
+    assert haven.references == []
+    resets = [reset for reset in haven.resets if reset.reset_type is not None]
+    assert [haven.payload('reset', reset)['argIds'] for reset in resets] == [
+        [None, ids['mobile'][4000], None, ids['room'][4001], None],
+        [None, ids['item'][4001], None, None],
+        [None, ids['item'][4000], None],
+        [None, ids['item'][4000], None, ids['room'][4002]],
+        [None, ids['room'][4001], None, None],
+    ]
+    assert haven.payload('shop', haven.shops[0])['keeperId'] == ids['mobile'][4000]
+    assert haven.payload('special', haven.specials[0])['mobId'] == ids['mobile'][4000]
@@ -0,0 +1,67 @@
+import glob
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from MigrateRiversOfMud.analysis import ResetSimulator
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.Resets import Reset
+from tests.conftest import AREA_DIR
+
+
+@pytest.mark.parametrize('line, reset_type, args, comment', [
+    ('M 0 4000 1 4001 1 * wizard', 'M', [0, 4000, 1, 4001, 1], 'wizard'),
+    ('E 1 4001 1 16 * sword', 'E', [1, 4001, 1, 16], 'sword'),
+    ('G 1 4000 1', 'G', [1, 4000, 1], ''),
+    ('D 0 4001 2 1', 'D', [0, 4001, 2, 1], ''),
+    ('O 0 4000 -1 4002 *a barrel of beer', 'O', [0, 4000, -1, 4002], 'a barrel of beer'),
+])
+def test_reset_args_keep_the_trailing_argument_and_the_whole_comment(line, reset_type, args, comment):
+    reset = Reset('area', line)
+    assert (reset.reset_type, reset.args, reset.comment) == (reset_type, args, comment)
+    assert reset.to_dict()['args'] == args and reset.to_dict()['comment'] == comment
+
+
+def test_a_reset_without_arguments_is_left_unparsed():
+    reset = Reset('area', 'S')
+    assert reset.reset_type is None and reset.content_key is None
+
+
+@pytest.fixture
+def world():
+    areas = [Area(area_file, insert=False) for area_file in sorted(glob.glob(os.path.join(AREA_DIR, '*.are')))]
+    return areas, ResetSimulator(areas).run()
+
+
+def test_simulated_mobiles_and_items_are_placed(world):
+    _, simulator = world
+    assert simulator.mob_counts() == {3001: 1, 4001: 1}
+    assert simulator.mobs_in(4001) == [4000]
+    wizard = simulator.mob_room.tolist().index(simulator.room_rows[4001])
+    assert sorted(simulator.objects_of(wizard)) == [(4000, 'carried', -1), (4001, 'equipped', 16)]
+    in_rooms = [(simulator.room_vnums[holder], simulator.obj_vnums[simulator.obj_proto[instance]])
+                for instance, (location, holder) in enumerate(zip(simulator.obj_location, simulator.obj_holder))
+                if location == ResetSimulator.IN_ROOM]
+    assert sorted(in_rooms) == [(3002, 3000), (4002, 4000)]
+    assert simulator.skipped == 0
+
+
+def test_simulated_doors_are_set(world):
+    _, simulator = world
+    assert simulator.door_state(4001, 2) == 1
+    assert simulator.door_state(4001, 0) == -1
+
+
+def test_a_second_run_respects_the_limits(world):
+    _, simulator = world
+    simulator.run()
+    assert simulator.mob_counts() == {3001: 1, 4001: 1}
+    assert simulator.summary().startswith("2 mobiles in 2 rooms, ")
+
+
+def test_give_does_not_follow_a_mobile_loaded_by_another_area(world):
+    areas, _ = world
+    giving = SimpleNamespace(rooms=[], mobiles=[], objects=[], resets=[Reset('area', 'G 1 4000 1')])
+    simulator = ResetSimulator([*areas, giving]).run()
+    assert sum(1 for location in simulator.obj_location if location == ResetSimulator.CARRIED) == 2
@@ -0,0 +1,115 @@
+import random
+from collections import deque
+
+import pytest
+
+from MigrateRiversOfMud.analysis import Router
+from tests.conftest import room_graph
+
+NORTH, EAST, SOUTH, WEST = 0, 1, 2, 3
+
+
+def corridor(length):
+    exits = {vnum: {} for vnum in range(1, length + 1)}
+    for vnum in range(1, length):
+        exits[vnum][EAST] = vnum + 1
+        exits[vnum + 1][WEST] = vnum
+    return room_graph(exits)
+
+
+def branching():
+    """
+    A hub with three arms of different lengths, one of them one-way, and a room only reachable from an arm.
+    """
+    return room_graph({
+        1: {NORTH: 2, EAST: 5, SOUTH: 8},
+        2: {NORTH: 3, SOUTH: 1},
+        3: {NORTH: 4, SOUTH: 2},
+        4: {SOUTH: 3, EAST: 11},
+        5: {EAST: 6, WEST: 1},
+        6: {WEST: 5},
+        8: {SOUTH: 9},
+        9: {SOUTH: 10},
+        10: {},
+        11: {},
+    })
+
+
+def grid(size, seed=7):
+    """
+    A square grid with a random quarter of its exits removed, so some walks must detour.
+    """
+    rng = random.Random(seed)
+    exits = {}
+    for y in range(size):
+        for x in range(size):
+            vnum = y * size + x + 1
+            exits[vnum] = {direction: target for direction, target, inside in (
+                (NORTH, vnum - size, y > 0), (SOUTH, vnum + size, y < size - 1),
+                (EAST, vnum + 1, x < size - 1), (WEST, vnum - 1, x > 0)) if inside and rng.random() > 0.25}
+    return room_graph(exits)
+
+
+def bfs_distances(graph, from_vnum):
+    start = graph.rows[from_vnum]
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        row = queue.popleft()
+        for target in graph.neighbours(row):
+            if target not in distances:
+                distances[target] = distances[row] + 1
+                queue.append(target)
+    return {graph.vnums[row]: distance for row, distance in distances.items()}
+
+
+def assert_nearest(graph, from_vnum, k, predicate=None):
+    expected = sorted((distance, vnum) for vnum, distance in bfs_distances(graph, from_vnum).items()
+                      if vnum != from_vnum and (predicate is None or predicate(vnum)))[:k]
+    found = Router(graph).nearest(from_vnum, k, predicate)
+    assert sorted(distance for _, distance in found) == [distance for distance, _ in expected]
+    true_distances = bfs_distances(graph, from_vnum)
+    assert all(true_distances[vnum] == distance for vnum, distance in found)
+
+
+@pytest.mark.parametrize('k', [1, 2, 3, 4, 10])
+def test_nearest_on_a_corridor(k):
+    graph = corridor(5)
+    assert_nearest(graph, 1, k)
+    assert_nearest(graph, 3, k)
+
+
+def test_nearest_walks_the_whole_corridor():
+    assert Router(corridor(5)).nearest(1, 3) == [(2, 1), (3, 2), (4, 3)]
+
+
+@pytest.mark.parametrize('from_vnum', [1, 4, 6, 8, 11])
+@pytest.mark.parametrize('k', [1, 3, 5, 20])
+def test_nearest_on_a_branching_graph(from_vnum, k):
+    graph = branching()
+    assert_nearest(graph, from_vnum, k)
+    assert_nearest(graph, from_vnum, k, predicate=lambda vnum: vnum % 2 == 0)
+
+
+@pytest.mark.parametrize('landmarks', [0, 6])
+def test_shortest_paths_match_bfs(landmarks):
+    graph = grid(30)
+    router = Router(graph, landmarks=landmarks)
+    rng = random.Random(landmarks)
+    for _ in range(100):
+        from_vnum, to_vnum = rng.choice(graph.vnums), rng.choice(graph.vnums)
+        distance = bfs_distances(graph, from_vnum).get(to_vnum)
+        path = router.shortest_path(from_vnum, to_vnum)
+        if distance is None:
+            assert path is None
+            continue
+        assert len(path) - 1 == distance
+        assert path[0] == from_vnum and path[-1] == to_vnum
+        for previous, step in zip(path, path[1:]):
+            assert graph.rows[step] in graph.neighbours(graph.rows[previous])
+        assert len(router.directions(from_vnum, to_vnum)) == distance
+
+
+def test_unknown_rooms_are_rejected():
+    with pytest.raises(ValueError):
+        Router(corridor(3)).shortest_path(1, 99)
@@ -0,0 +1,46 @@
+import os
+import shutil
+
+import pytest
+
+from MigrateRiversOfMud.entity.SectionIndex import SectionIndex
+
+
+def copy(area_file, tmp_path, name='haven.are'):
+    path = tmp_path / name
+    shutil.copy(area_file, path)
+    return str(path)
+
+
+def test_an_edited_file_is_indexed_afresh(area_file, tmp_path):
+    path = copy(area_file, tmp_path)
+    before = SectionIndex.for_file(path)
+    assert 'The Altar~' in before.section_lines('ROOMS')
+
+    with open(path) as f:
+        text = f.read()
+    with open(path, 'w') as f:
+        f.write(text.replace('The Altar~', 'The Golden Altar of Haven~'))
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1))
+
+    after = SectionIndex.for_file(path)
+    assert after is not before
+    assert 'The Golden Altar of Haven~' in after.section_lines('ROOMS')
+    with pytest.raises(ValueError):
+        before.section_lines('ROOMS')
+
+
+def test_the_cache_is_bounded(area_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(SectionIndex, 'MAX_CACHED', 2)
+    SectionIndex.clear_cache()
+    for name in ('a.are', 'b.are', 'c.are'):
+        SectionIndex.for_file(copy(area_file, tmp_path, name))
+    assert len(SectionIndex._cache) == 2
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason="needs /proc to count open files")
+def test_indexes_hold_no_open_files(area_file, tmp_path):
+    opened = len(os.listdir('/proc/self/fd'))
+    indexes = [SectionIndex.for_file(copy(area_file, tmp_path, f"{number}.are")) for number in range(20)]
+    assert all(index.section_lines('ROOMS') for index in indexes)
+    assert len(os.listdir('/proc/self/fd')) <= opened
@@ -0,0 +1,61 @@
+import pytest
+
+from MigrateRiversOfMud.entity import Orchestrator
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.migration.Delta import Delta
+from MigrateRiversOfMud.migration.Snapshot import Snapshot
+from MigrateRiversOfMud.migration.Sinks import stream_to_sink
+from tests.conftest import AREA_DIR
+
+
+def counts(service):
+    return {collection: len(documents) for collection, documents in service.collections.items()}
+
+
+def test_streaming_again_sends_nothing_unchanged(service, area_file):
+    orchestrator = Orchestrator(AREA_DIR, stream=True)
+    first = orchestrator.process_area_file(area_file)
+    stored = counts(service)
+    service.log.clear()
+
+    second = orchestrator.process_area_file(area_file)
+    assert first.failures == second.failures == 0
+    assert not service.log
+    assert counts(service) == stored
+
+
+def test_a_delta_run_after_streaming_finds_nothing_to_send(service, area_file):
+    Orchestrator(AREA_DIR, stream=True).process_area_file(area_file)
+    snapshot = Snapshot('haven.are')
+    delta = Delta(snapshot, Area(area_file, insert=False, known_ids=snapshot.ids()))
+    assert delta.is_empty()
+
+
+@pytest.mark.parametrize('options', [{'resume': True}, {'upsert': True}, {'work_dir': 'work'}])
+def test_streaming_rejects_options_it_cannot_honour(options):
+    with pytest.raises(ValueError):
+        Orchestrator(AREA_DIR, stream=True, **options)
+
+
+class SlowSink:
+    def __init__(self, produced):
+        self.produced = produced
+        self.lag = 0
+
+    def write(self, *item):
+        self.lag = max(self.lag, len(self.produced) - item[0])
+
+    def close(self):
+        pass
+
+
+def test_stream_to_sink_holds_at_most_max_pending_payloads():
+    produced = []
+
+    def payloads():
+        for index in range(500):
+            produced.append(index)
+            yield index, None, None, None
+
+    sink = stream_to_sink(payloads(), SlowSink(produced), max_pending=8)
+    assert sink.lag <= 8 + 2
@@ -0,0 +1,86 @@
+import glob
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from MigrateRiversOfMud.analysis import TextIndex
+from tests.conftest import AREA_DIR
+
+
+def room(name, description='', extra_descr=()):
+    return SimpleNamespace(name=name, description=description, extra_descr=list(extra_descr))
+
+
+@pytest.fixture
+def index():
+    index = TextIndex()
+    rooms = {
+        'lair': room('Dragon Lair', 'A red dragon sleeps on a dragon hoard.'),
+        'cave': room('A Cave', 'Bones of a dragon lie among rocks, moss, puddles, bats, stalactites and old torches.'),
+        'gate': room('The Dragonsgate', 'A gate carved with a red sun.'),
+        'market': room('Market', 'Stalls sell bread.',
+                       [{'keyword': 'stall', 'description': 'A stall selling red dragon fruit.'}]),
+    }
+    for key, entity in rooms.items():
+        index.add('room', 'test.are', key, entity)
+    return index
+
+
+def keys(results):
+    return [document[2] for _, document in results]
+
+
+def test_keywords_are_ranked_by_bm25(index):
+    results = index.keyword('dragon')
+    assert keys(results) == ['lair', 'market', 'cave']
+    assert [score for score, _ in results] == sorted((score for score, _ in results), reverse=True)
+    assert sorted(keys(index.keyword('BREAD', 'bones'))) == ['cave', 'market']
+    assert index.keyword('unicorn') == []
+
+
+def test_rarer_terms_weigh_more(index):
+    # "red" is in three rooms and "hoard" only in the lair, so the lair wins a query for both over
+    # rooms holding just the common word.
+    results = index.keyword('red', 'hoard')
+    assert keys(results)[0] == 'lair'
+    scores = dict((document[2], score) for score, document in results)
+    assert scores['lair'] > scores['gate']
+
+
+def test_prefixes_match_every_term_starting_with_them(index):
+    assert sorted(keys(index.prefix('drag'))) == ['cave', 'gate', 'lair', 'market']
+    assert keys(index.prefix('DRAGONS')) == ['gate']
+    assert index.prefix('zz') == []
+
+
+def test_phrases_need_their_words_in_order(index):
+    assert sorted(keys(index.phrase('red dragon'))) == ['lair', 'market']
+    assert index.phrase('dragon red') == []
+    assert keys(index.phrase('dragon lair')) == ['lair']
+
+
+def test_phrases_do_not_span_fields(index):
+    # The lair's name ends with "lair" and its description starts with "a".
+    assert index.phrase('lair a') == []
+
+
+def test_extra_descriptions_are_indexed(index):
+    assert keys(index.keyword('fruit')) == ['market']
+
+
+def test_search_requires_every_part(index):
+    assert keys(index.search('"red dragon" hoard')) == ['lair']
+    assert sorted(keys(index.search('drag* red'))) == ['gate', 'lair', 'market']
+    assert keys(index.search('drag* stalls')) == ['market']
+    assert index.search('"red dragon" bones') == []
+
+
+def test_the_index_is_persisted_for_the_same_files(tmp_path):
+    area_files = sorted(glob.glob(os.path.join(AREA_DIR, '*.are')))
+    built = TextIndex.for_area_files(area_files, cache_dir=str(tmp_path))
+    assert sorted(document[1] for _, document in built.keyword('altar') if document[0] == 'room') == \
+        ['haven.are', 'haven.are', 'midgaard.are', 'midgaard.are']
+    loaded = TextIndex.for_area_files(area_files, cache_dir=str(tmp_path))
+    assert loaded is not built
+    assert loaded.documents == built.documents and loaded.search('big altar') == built.search('big altar')
@@ -0,0 +1,39 @@
+from MigrateRiversOfMud.entity import Orchestrator
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.TextTable import TextTable, shared_texts
+from MigrateRiversOfMud.migration.AreaWatcher import AreaWatcher
+from tests.conftest import AREA_DIR
+
+DESCRIPTION = "A description long enough to be kept in the table rather than interned."
+
+
+def test_repeated_long_texts_share_one_copy():
+    table = TextTable()
+    first = table.share(''.join(DESCRIPTION))
+    second = table.share(''.join(DESCRIPTION))
+    assert first is second
+    assert table.shared == 1
+
+
+def test_scope_releases_the_texts_parsed_in_it():
+    table = TextTable()
+    with table.scope():
+        table.share(DESCRIPTION)
+        assert table.texts
+    assert not table.texts
+
+
+def test_migrating_an_area_releases_its_texts(service, area_file):
+    Area(area_file, insert=False)
+    assert shared_texts.texts
+    shared_texts.clear()
+
+    Orchestrator(AREA_DIR).process_area_file(area_file)
+    assert service.documents('room')
+    assert not shared_texts.texts
+
+
+def test_watching_an_area_releases_its_texts(service):
+    AreaWatcher(AREA_DIR, debounce=0).poll()
+    assert service.documents('room')
+    assert not shared_texts.texts
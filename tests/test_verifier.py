@@ -0,0 +1,84 @@
+import json
+import shutil
+
+import pytest
+
+from MigrateRiversOfMud import verify_rom
+from MigrateRiversOfMud.entity import Orchestrator
+from MigrateRiversOfMud.http import ReadFailed
+from MigrateRiversOfMud.migration.ExistingIds import ExistingIds
+from MigrateRiversOfMud.migration.Verifier import Verifier
+from tests.conftest import AREA_DIR, Response
+
+
+@pytest.fixture
+def migrated(service, area_file):
+    assert Orchestrator(AREA_DIR).process_area_file(area_file).failures == 0
+    return area_file
+
+
+def failing_page(service, page):
+    """
+    Makes every GET of the given page fail, as a service that errors halfway through a listing would.
+    """
+    answer = service.get
+
+    def get(url, data=None, headers=None):
+        if json.loads(data).get('page') == page:
+            return Response(500, {'error': 'failing'})
+        return answer(url, data, headers)
+    return get
+
+
+@pytest.mark.parametrize('sample', [None, 2])
+def test_a_clean_migration_verifies_without_mismatches(migrated, sample):
+    verifier = Verifier(sample=sample)
+    assert verifier.run([migrated]) == []
+    assert verifier.checked == (2 if sample else 20)
+
+
+def test_changed_and_removed_entities_are_reported(service, migrated):
+    rooms = service.documents('room')
+    changed, removed = sorted(rooms)[:2]
+    rooms[changed]['name'] = 'Somewhere else'
+    del rooms[removed]
+
+    mismatches = Verifier().run([migrated])
+    assert {(entity_type, field, stored) for _, entity_type, _, field, _, stored in mismatches} == {
+        ('room', 'name', 'Somewhere else'), ('room', None, None)}
+    assert [expected for *_, expected, _ in mismatches if expected == 'missing'] == ['missing']
+
+
+def test_failed_reads_are_reported_instead_of_missing_entities(service, migrated):
+    service.failing.add('room')
+    verifier = Verifier()
+    mismatches = verifier.run([migrated])
+    assert mismatches == [('haven.are', 'room', None, None, 'read failed', 3)]
+    assert verifier.checked == 17
+    assert "reading 3 room entities back failed" in verifier.report()
+
+
+def test_a_failed_later_page_is_not_taken_for_the_end_of_the_listing(service, migrated, monkeypatch):
+    monkeypatch.setattr(service, 'get', failing_page(service, 1))
+    mismatches = Verifier(page_size=2).run([migrated])
+    assert ('haven.are', 'room', None, None, 'read failed', 3) in mismatches
+    assert not [mismatch for mismatch in mismatches if mismatch[4] == 'missing']
+
+
+def test_upsert_prefetch_raises_on_a_failed_read(service, migrated, monkeypatch):
+    monkeypatch.setattr(service, 'get', failing_page(service, 1))
+    with pytest.raises(ReadFailed):
+        ExistingIds(page_size=2).prefetch('haven.are', 'Haven')
+
+
+def test_verify_reads_the_snapshots_of_the_work_dir(service, area_file, tmp_path, capsys):
+    area_dir = tmp_path / 'area'
+    area_dir.mkdir()
+    shutil.copy(area_file, area_dir)
+    work_dir = str(tmp_path / 'shared')
+    Orchestrator(str(area_dir), work_dir=work_dir).process_area_file(str(area_dir / 'haven.are'))
+
+    verify_rom(str(area_dir), work_dir=work_dir)
+    assert capsys.readouterr().out.strip().endswith(", 0 mismatches.")
+    verify_rom(str(area_dir))
+    assert "never migrated" in capsys.readouterr().out
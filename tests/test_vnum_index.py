@@ -0,0 +1,60 @@
+import glob
+import os
+
+from MigrateRiversOfMud.analysis import VnumIndex
+from tests.conftest import AREA_DIR
+
+
+def index_of(**areas):
+    index = VnumIndex()
+    for area_key, vnums in areas.items():
+        index.add(area_key, 'room', vnums)
+    return index
+
+
+def test_areas_sharing_vnums_overlap_on_the_shared_runs():
+    index = index_of(a=range(100, 120), b=[110, 111, 112, 115, 130])
+    assert index.overlaps() == [('room', 'a', 'b', 110, 112), ('room', 'a', 'b', 115, 115)]
+    assert index.overlaps('mobile') == []
+
+
+def test_interleaved_areas_sharing_no_vnum_do_not_overlap():
+    index = index_of(odd=range(101, 120, 2), even=range(100, 120, 2), inside=[150, 160], outer=[140, 170])
+    assert index.overlaps() == []
+    assert index.lookup('room', 105) == ['odd']
+    assert index.lookup('room', 106) == ['even']
+    assert index.lookup('room', 150) == ['inside']
+    assert index.lookup('room', 155) == []
+
+
+def test_lookup_returns_every_area_using_a_vnum():
+    index = index_of(a=[100, 105, 200], b=[150, 200], c=[200, 300], d=[400])
+    assert index.lookup('room', 200) == ['a', 'b', 'c']
+    assert index.lookup('room', 100) == ['a']
+    assert index.lookup('room', 99) == []
+    assert index.lookup('room', 400) == ['d']
+    assert index.lookup('room', 401) == []
+    assert index.lookup('item', 100) == []
+
+
+def test_gaps_lie_between_area_hulls():
+    index = index_of(a=[100, 150], b=[160, 199], c=[120, 130], d=[300])
+    assert index.gaps('room') == [(151, 159), (200, 299)]
+    assert index.gaps('mobile') == []
+
+
+def test_report_lists_overlaps_and_gaps():
+    index = index_of(a=[100, 101], b=[101, 200], c=[300])
+    assert index.report().splitlines() == [
+        "room VNUMs 101-101 claimed by both a and b.",
+        "room VNUM gaps: 201-299.",
+        "3 areas indexed, 1 overlapping ranges.",
+    ]
+
+
+def test_area_files_are_indexed_from_their_vnums():
+    index = VnumIndex.from_area_files(sorted(glob.glob(os.path.join(AREA_DIR, '*.are'))))
+    assert index.vnums['room']['haven.are'] == [4001, 4002, 4003]
+    assert index.vnums['mobile']['midgaard.are'][0] == 3000
+    assert index.lookup('room', 4002) == ['haven.are']
+    assert index.overlaps() == []
@@ -0,0 +1,83 @@
+import glob
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from MigrateRiversOfMud.analysis import WorldIndex
+from MigrateRiversOfMud.entity.Area import Area
+from MigrateRiversOfMud.entity.Room import SectorType
+from tests.conftest import AREA_DIR
+
+DARK, NO_MOB, INDOORS = 1, 4, 8
+
+
+def room(vnum, sector, flags=0):
+    return SimpleNamespace(vnum=vnum, sector_type=sector, room_flags=flags)
+
+
+def item(vnum, item_type, level=0, weight=0):
+    return SimpleNamespace(vnum=str(vnum), item_type=item_type, level=level, weight=weight)
+
+
+@pytest.fixture
+def index():
+    area = SimpleNamespace(
+        mobiles=[SimpleNamespace(vnum=str(vnum), level=level, gold=gold, alignment=0)
+                 for vnum, level, gold in ((1, 5, 100), (2, 30, 0), (3, 12, 50), (4, 12, 'x'))],
+        objects=[item(10, 'weapon', 5, 12), item(11, 'armor', 10, 20), item(12, 'weapon', 25, 8), item(13, None)],
+        rooms=[room(100, 0, DARK | INDOORS), None, room(101, 1), room(102, 1, DARK), room(103, 2, DARK | NO_MOB),
+               room(104, 0, INDOORS)],
+        shops=[SimpleNamespace(vnum=1, trade_items=[5, 9]), SimpleNamespace(vnum=None, trade_items=[5]),
+               SimpleNamespace(vnum=3, trade_items=[9, 15])],
+    )
+    return WorldIndex([area])
+
+
+def vnums(entities):
+    return [int(entity.vnum) for entity in entities]
+
+
+def test_rooms_are_filtered_by_sector_and_every_flag(index):
+    assert vnums(index.rooms()) == [100, 101, 102, 103, 104]
+    assert vnums(index.rooms(sector=SectorType.CITY)) == [101, 102]
+    assert vnums(index.rooms(sector='inside')) == [100, 104]
+    assert vnums(index.rooms(sector=2)) == [103]
+    assert vnums(index.rooms(flags=DARK)) == [100, 102, 103]
+    assert vnums(index.rooms(flags=DARK | INDOORS)) == [100]
+    assert vnums(index.rooms(sector='city', flags=DARK)) == [102]
+    assert vnums(index.rooms(sector='desert')) == []
+    assert vnums(index.rooms(flags=DARK | 2)) == []
+
+
+def test_items_and_shops_match_any_of_the_given_types(index):
+    assert vnums(index.items('weapon')) == [10, 12]
+    assert vnums(index.items('WEAPON', 'armor')) == [10, 11, 12]
+    assert vnums(index.items('light')) == []
+    assert vnums(index.shops_buying(5)) == [1]
+    assert vnums(index.shops_buying(9)) == [1, 3]
+    assert vnums(index.shops_buying(15, 5)) == [1, 3]
+    assert vnums(index.shops_buying(7)) == []
+
+
+def test_ranges_skip_values_that_are_not_numbers(index):
+    assert vnums(index.range('mobile', 'level', 10, 30)) == [3, 4, 2]
+    assert vnums(index.range('mobile', 'gold', 1, 1000)) == [3, 1]
+    assert vnums(index.range('item', 'weight', 10, 20)) == [10, 11]
+    with pytest.raises(ValueError):
+        index.range('room', 'level', 0, 10)
+
+
+def test_vnums_are_looked_up_as_numbers(index):
+    assert index.get('item', '12').item_type == 'weapon'
+    assert index.get('mobile', 2).level == 30
+    assert index.get('room', 999) is None
+
+
+def test_parsed_areas_are_indexed():
+    area_files = sorted(glob.glob(os.path.join(AREA_DIR, '*.are')))
+    index = WorldIndex(Area(area_file, insert=False) for area_file in area_files)
+    assert vnums(index.rooms(sector='city')) == [4003, 3003]
+    assert vnums(index.rooms(flags=INDOORS)) == [4001, 4002, 3001, 3002]
+    assert vnums(index.items('drink_container')) == [4000, 3000]
+    assert vnums(index.shops_buying(10)) == [4000, 3000]